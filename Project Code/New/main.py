@@ -1,71 +1,22 @@
+import os
+import sys
 import tkinter as tk
 from tkinter import messagebox, simpledialog
-import matplotlib.pyplot as plt
-import numpy as np
 
-# Define process class
-class Process:
-    def __init__(self, pid, priority, arrival_time, burst_time):
-        self.pid = pid
-        self.priority = priority
-        self.arrival_time = arrival_time
-        self.burst_time = burst_time
-        self.waiting_time = 0
-        self.turnaround_time = 0
-        self.response_time = 0
-
-# Define the CPU scheduler
-class PriorityScheduler:
-    def __init__(self):
-        self.processes = []
+# The shared scheduler package sits one directory up
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scheduler import Process, ResultCache, Scheduler as CoreScheduler, available_policies
+from scheduler.instrument import from_environment
+from scheduler.worker import SimulationWorker, TkPoster
 
-    def add_process(self, process):
-        self.processes.append(process)
+# Define the CPU scheduler; the engine itself lives in the shared scheduler package
+class Scheduler(CoreScheduler):
+    def plot_gantt_chart(self, master):
+        # matplotlib is only loaded the first time a chart is shown
+        from scheduler.tkgantt import GanttWindow
 
-    def schedule(self):
-        # Sort the processes based on priority, then by arrival time
-        self.processes.sort(key=lambda p: (p.priority, p.arrival_time))
-
-        current_time = 0
-        for process in self.processes:
-            if current_time < process.arrival_time:
-                current_time = process.arrival_time
-
-            process.waiting_time = current_time - process.arrival_time
-            process.response_time = process.waiting_time
-            current_time += process.burst_time
-            process.turnaround_time = process.waiting_time + process.burst_time
-
-        # Calculate average times
-        self.avg_waiting_time = sum(p.waiting_time for p in self.processes) / len(self.processes)
-        self.avg_turnaround_time = sum(p.turnaround_time for p in self.processes) / len(self.processes)
-        self.avg_response_time = sum(p.response_time for p in self.processes) / len(self.processes)
-
-    def plot_gantt_chart(self):
-        # Create a Gantt chart
-        fig, ax = plt.subplots()
-        start_times = []
-        durations = []
-        labels = []
-
-        current_time = 0
-        for process in self.processes:
-            if current_time < process.arrival_time:
-                # Idle time
-                start_times.append(current_time)
-                durations.append(process.arrival_time - current_time)
-                labels.append('')
-                current_time = process.arrival_time
-
-            start_times.append(current_time)
-            durations.append(process.burst_time)
-            labels.append(f'P{process.pid}')
-            current_time += process.burst_time
-
-        ax.barh(labels, durations, left=start_times, color='lightcoral')
-        ax.set_xlabel('Time')
-        ax.set_title('Gantt Chart')
-        plt.show()
+        # Zoomable chart embedded in a window of our own; only the visible stretch is drawn
+        GanttWindow(master, self.result, [p.pid for p in self.jobs], color='lightcoral')
 
 # Define the GUI
 class ProcessEntryDialog(simpledialog.Dialog):
@@ -109,7 +60,7 @@ class SchedulerGUI(tk.Tk):
         super().__init__()
 
         self.title("ELZowzat & Bassel Scheduling Project")
-        self.geometry("600x450")
+        self.geometry("600x910")
         
         # Define color scheme
         self.background_color = "#f0f8ff"
@@ -124,6 +75,7 @@ class SchedulerGUI(tk.Tk):
         self.configure(bg=self.background_color)
 
         self.processes = []
+        self.worker = None
 
         # GUI widgets
         self.label_processes = tk.Label(
@@ -136,6 +88,51 @@ class SchedulerGUI(tk.Tk):
         self.entry_processes = tk.Entry(self, font=self.custom_font)
         self.entry_processes.pack(pady=5)
 
+        # Scheduling policy, picked by name from the shared policy registry
+        self.label_policy = tk.Label(
+            self, text="Scheduling Policy:",
+            bg=self.background_color, fg=self.text_color,
+            font=self.custom_font
+        )
+        self.label_policy.pack(pady=5)
+
+        self.policy_name = tk.StringVar(self, value="priority")
+        self.option_policy = tk.OptionMenu(self, self.policy_name, *available_policies())
+        self.option_policy.config(font=self.custom_font, width=18)
+        self.option_policy.pack(pady=5)
+
+        self.label_quantum = tk.Label(
+            self, text="Quantum (Round Robin):",
+            bg=self.background_color, fg=self.text_color,
+            font=self.custom_font
+        )
+        self.label_quantum.pack(pady=5)
+
+        self.entry_quantum = tk.Entry(self, font=self.custom_font)
+        self.entry_quantum.insert(0, "2")
+        self.entry_quantum.pack(pady=5)
+
+        # CPU time lost every time a different process is dispatched
+        self.label_switch_cost = tk.Label(
+            self, text="Context Switch Time:",
+            bg=self.background_color, fg=self.text_color,
+            font=self.custom_font
+        )
+        self.label_switch_cost.pack(pady=5)
+
+        self.entry_switch_cost = tk.Entry(self, font=self.custom_font)
+        self.entry_switch_cost.insert(0, "0")
+        self.entry_switch_cost.pack(pady=5)
+
+        # Identical earlier runs are loaded from the on-disk result cache unless this is unticked
+        self.use_cache = tk.BooleanVar(self, value=True)
+        self.check_cache = tk.Checkbutton(
+            self, text="Reuse cached results", variable=self.use_cache,
+            bg=self.background_color, fg=self.text_color, selectcolor=self.background_color,
+            font=self.custom_font
+        )
+        self.check_cache.pack(pady=5)
+
         # Button to add processes
         self.button_add_processes = tk.Button(
             self, text="Add Processes", bg=self.button_color, fg=self.icon_color,
@@ -152,6 +149,21 @@ class SchedulerGUI(tk.Tk):
         )
         self.button_run.pack(pady=10)
 
+        # Button to cancel a run in progress
+        self.button_cancel = tk.Button(
+            self, text="Cancel", bg=self.button_color, fg=self.icon_color,
+            activebackground=self.active_button_color, font=self.custom_font,
+            command=self.cancel_scheduler, width=20, height=2, state=tk.DISABLED
+        )
+        self.button_cancel.pack(pady=10)
+
+        # Progress of a run in the background
+        self.label_status = tk.Label(
+            self, text="", bg=self.background_color, fg=self.text_color,
+            font=self.custom_font
+        )
+        self.label_status.pack(pady=5)
+
         # Button to show Gantt chart
         self.button_show_gantt = tk.Button(
             self, text="Show Gantt Chart", bg=self.button_color, fg=self.icon_color,
@@ -181,44 +193,100 @@ class SchedulerGUI(tk.Tk):
 
         messagebox.showinfo("Processes Added", "Processes added successfully!")
 
+    def create_scheduler(self):
+        # Build a scheduler for the selected policy; only Round Robin takes a quantum
+        policy = self.policy_name.get()
+        params = {}
+        if policy == "rr":
+            params["quantum"] = float(self.entry_quantum.get())
+        switch_cost = float(self.entry_switch_cost.get() or 0)
+        cache = ResultCache() if self.use_cache.get() else None
+        return Scheduler(policy, cache=cache, switch_cost=switch_cost, **params)
+
     def run_scheduler(self):
         if not self.processes:
             messagebox.showerror("No Processes", "No processes to schedule.")
             return
 
-        scheduler = PriorityScheduler()
+        try:
+            scheduler = self.create_scheduler()
+        except ValueError as e:
+            messagebox.showerror("Invalid Input", str(e))
+            return
+
         for process in self.processes:
             scheduler.add_process(process)
 
-        scheduler.schedule()
-
-        # Show results
-        results = []
-        for process in scheduler.processes:
-            results.append(
-                f"Process P{process.pid}:\n"
-                f"Waiting Time: {process.waiting_time:.2f}\n"
-                f"Turnaround Time: {process.turnaround_time:.2f}\n"
-                f"Response Time: {process.response_time:.2f}\n"
-            )
-
-        results.append(
-            f"Average Waiting Time: {scheduler.avg_waiting_time:.2f}\n"
-            f"Average Turnaround Time: {scheduler.avg_turnaround_time:.2f}\n"
-            f"Average Response Time: {scheduler.avg_response_time:.2f}\n"
+        # Simulate on a worker thread; progress and results come back through the Tk event loop
+        self.partial_count = 0
+        self.partial_waiting = 0.0
+        self.poster = TkPoster(self)
+        self.worker = SimulationWorker(
+            scheduler, self.poster,
+            on_progress=self.on_scheduler_progress,
+            on_rows=self.on_scheduler_rows,
+            on_done=self.on_scheduler_done,
+            on_cancelled=self.on_scheduler_cancelled,
+            on_error=self.on_scheduler_error,
+        ).start()
+        self.button_run.config(state=tk.DISABLED)
+        self.button_cancel.config(state=tk.NORMAL)
+
+    def cancel_scheduler(self):
+        if self.worker is not None:
+            self.worker.cancel()
+
+    def end_run(self):
+        self.poster.close()
+        self.worker = None
+        self.button_run.config(state=tk.NORMAL)
+        self.button_cancel.config(state=tk.DISABLED)
+
+    def on_scheduler_progress(self, done, total):
+        average = self.partial_waiting / self.partial_count if self.partial_count else 0.0
+        self.label_status.config(
+            text=f"Finished {done}/{total} processes, average waiting time so far: {average:.2f}"
+        )
+
+    def on_scheduler_rows(self, rows):
+        self.partial_count += len(rows)
+        self.partial_waiting += sum(row[1] for row in rows)
+
+    def on_scheduler_cancelled(self):
+        self.end_run()
+        self.label_status.config(text="Scheduling cancelled.")
+
+    def on_scheduler_error(self, error):
+        self.end_run()
+        self.label_status.config(text="")
+        messagebox.showerror("Scheduler Error", str(error))
+
+    def on_scheduler_done(self, scheduler):
+        self.end_run()
+        timeline = scheduler.timeline
+        self.label_status.config(
+            text=f"Scheduled {len(scheduler.processes)} processes.\n"
+                 f"CPU utilization {timeline.get('utilization', 0.0):.0%}, "
+                 f"throughput {timeline.get('throughput', 0.0):.2f} per time unit,\n"
+                 f"{timeline['context_switches']} context switches."
         )
 
-        messagebox.showinfo("Scheduling Results", "\n".join(results))
+        # Show the run's own process table in a virtualized view; ttk is only loaded here
+        from scheduler.tkviews import ResultsWindow
+
+        ResultsWindow(self, scheduler.table, scheduler.summary)
 
         self.scheduler = scheduler
 
     def show_gantt_chart(self):
         if hasattr(self, 'scheduler') and self.scheduler.processes:
-            self.scheduler.plot_gantt_chart()
+            self.scheduler.plot_gantt_chart(self)
         else:
             messagebox.showerror("No Scheduler", "Run the scheduler first.")
 
 # Run the GUI
 if __name__ == "__main__":
+    # SCHEDULER_INSTRUMENT=timings.json records phase timings for the session
+    from_environment()
     gui = SchedulerGUI()
     gui.mainloop()
@@ -1,62 +1,15 @@
 import tkinter as tk
 from tkinter import messagebox, scrolledtext
+from scheduler import Process, ResultCache, Scheduler as CoreScheduler, available_policies
+from scheduler.instrument import from_environment
+from scheduler.worker import SimulationWorker, TkPoster
+from scheduler.gantt import gantt_text
 
-# Define process class
-class Process:
-    def __init__(self, pid, priority, arrival_time, burst_time):
-        self.pid = pid
-        self.priority = priority
-        self.arrival_time = arrival_time
-        self.burst_time = burst_time
-        self.waiting_time = 0
-        self.turnaround_time = 0
-        self.response_time = 0
-
-# Define the CPU scheduler
-class PriorityScheduler:
-    def __init__(self):
-        self.processes = []
-
-    def add_process(self, process):
-        self.processes.append(process)
-
-    def schedule(self):
-        # Sort the processes based on priority, then by arrival time
-        self.processes.sort(key=lambda p: (p.priority, p.arrival_time))
-
-        current_time = 0
-        for process in self.processes:
-            if current_time < process.arrival_time:
-                current_time = process.arrival_time
-            
-            process.waiting_time = current_time - process.arrival_time
-            process.response_time = process.waiting_time
-            current_time += process.burst_time
-            process.turnaround_time = process.waiting_time + process.burst_time
-
-        # Calculate average times
-        self.avg_waiting_time = sum(p.waiting_time for p in self.processes) / len(self.processes)
-        self.avg_turnaround_time = sum(p.turnaround_time for p in self.processes) / len(self.processes)
-        self.avg_response_time = sum(p.response_time for p in self.processes) / len(self.processes)
-
+# Define the CPU scheduler; the engine itself lives in the shared scheduler package
+class Scheduler(CoreScheduler):
     def generate_gantt_text(self):
-        # Generate a text-based Gantt chart
-        gantt_text = "Gantt Chart:\n"
-        current_time = 0
-        
-        for process in self.processes:
-            # Display idle time, if any
-            if current_time < process.arrival_time:
-                idle_duration = process.arrival_time - current_time
-                gantt_text += f"Idle [{current_time:.1f} - {current_time + idle_duration:.1f}]\n"
-                current_time += idle_duration
-            
-            # Display the process
-            process_end_time = current_time + process.burst_time
-            gantt_text += f"P{process.pid} [{current_time:.1f} - {process_end_time:.1f}]\n"
-            current_time = process_end_time
-        
-        return gantt_text
+        # Generate a text-based Gantt chart, joined once from a stream of lines
+        return gantt_text(self.segments(), lambda process: f"P{process.pid}")
 
 # Define the GUI
 class SchedulerGUI(tk.Tk):
@@ -64,9 +17,10 @@ class SchedulerGUI(tk.Tk):
         super().__init__()
 
         self.title("ELZowzat Scheduling Project")
-        self.geometry("400x400")
+        self.geometry("400x660")
 
         self.processes = []
+        self.worker = None
 
         # GUI widgets
         self.label_processes = tk.Label(self, text="# Number of Processes want to Enter:")
@@ -75,12 +29,47 @@ class SchedulerGUI(tk.Tk):
         self.entry_processes = tk.Entry(self)
         self.entry_processes.pack()
 
+        # Scheduling policy, picked by name from the shared policy registry
+        self.label_policy = tk.Label(self, text="Scheduling Policy:")
+        self.label_policy.pack()
+
+        self.policy_name = tk.StringVar(self, value="priority")
+        self.option_policy = tk.OptionMenu(self, self.policy_name, *available_policies())
+        self.option_policy.pack()
+
+        self.label_quantum = tk.Label(self, text="Quantum (Round Robin):")
+        self.label_quantum.pack()
+
+        self.entry_quantum = tk.Entry(self)
+        self.entry_quantum.insert(0, "2")
+        self.entry_quantum.pack()
+
+        # CPU time lost every time a different process is dispatched
+        self.label_switch_cost = tk.Label(self, text="Context Switch Time:")
+        self.label_switch_cost.pack()
+
+        self.entry_switch_cost = tk.Entry(self)
+        self.entry_switch_cost.insert(0, "0")
+        self.entry_switch_cost.pack()
+
+        # Identical earlier runs are loaded from the on-disk result cache unless this is unticked
+        self.use_cache = tk.BooleanVar(self, value=True)
+        self.check_cache = tk.Checkbutton(self, text="Reuse cached results", variable=self.use_cache)
+        self.check_cache.pack()
+
         self.button_add_processes = tk.Button(self, text="Add Processes", command=self.add_processes)
         self.button_add_processes.pack()
 
         self.button_run = tk.Button(self, text="Run Scheduler", command=self.run_scheduler)
         self.button_run.pack()
 
+        self.button_cancel = tk.Button(self, text="Cancel", command=self.cancel_scheduler, state=tk.DISABLED)
+        self.button_cancel.pack()
+
+        # Progress of a run in the background
+        self.label_status = tk.Label(self, text="")
+        self.label_status.pack()
+
         # Button to show the text-based Gantt chart
         self.button_show_gantt_text = tk.Button(self, text="Gantt Chart", command=self.show_gantt_text)
         self.button_show_gantt_text.pack()
@@ -105,8 +94,6 @@ class SchedulerGUI(tk.Tk):
 
             try:
                 priority = int(input(f"Enter priority for process {pid}: "))
-                if priority < 0:
-                    raise ValueError("Priority must be non-negative.")
 
                 arrival_time = float(input(f"Enter arrival time for process {pid}: "))
                 if arrival_time < 0:
@@ -124,34 +111,88 @@ class SchedulerGUI(tk.Tk):
 
         messagebox.showinfo("Processes Added", "Processes added successfully!")
 
+    def create_scheduler(self):
+        # Build a scheduler for the selected policy; only Round Robin takes a quantum
+        policy = self.policy_name.get()
+        params = {}
+        if policy == "rr":
+            params["quantum"] = float(self.entry_quantum.get())
+        switch_cost = float(self.entry_switch_cost.get() or 0)
+        cache = ResultCache() if self.use_cache.get() else None
+        return Scheduler(policy, cache=cache, switch_cost=switch_cost, **params)
+
     def run_scheduler(self):
         if not self.processes:
             messagebox.showerror("No Processes", "No processes to schedule.")
             return
 
-        scheduler = PriorityScheduler()
+        try:
+            scheduler = self.create_scheduler()
+        except ValueError as e:
+            messagebox.showerror("Invalid Input", str(e))
+            return
+
         for process in self.processes:
             scheduler.add_process(process)
 
-        scheduler.schedule()
-
-        # Show results
-        results = []
-        for process in scheduler.processes:
-            results.append(
-                f"Process P{process.pid}:\n"
-                f"Waiting Time: {process.waiting_time:.2f}\n"
-                f"Turnaround Time: {process.turnaround_time:.2f}\n"
-                f"Response Time: {process.response_time:.2f}\n"
-            )
-
-        results.append(
-            f"Average Waiting Time: {scheduler.avg_waiting_time:.2f}\n"
-            f"Average Turnaround Time: {scheduler.avg_turnaround_time:.2f}\n"
-            f"Average Response Time: {scheduler.avg_response_time:.2f}\n"
+        # Simulate on a worker thread; progress and results come back through the Tk event loop
+        self.partial_count = 0
+        self.partial_waiting = 0.0
+        self.poster = TkPoster(self)
+        self.worker = SimulationWorker(
+            scheduler, self.poster,
+            on_progress=self.on_scheduler_progress,
+            on_rows=self.on_scheduler_rows,
+            on_done=self.on_scheduler_done,
+            on_cancelled=self.on_scheduler_cancelled,
+            on_error=self.on_scheduler_error,
+        ).start()
+        self.button_run.config(state=tk.DISABLED)
+        self.button_cancel.config(state=tk.NORMAL)
+
+    def cancel_scheduler(self):
+        if self.worker is not None:
+            self.worker.cancel()
+
+    def end_run(self):
+        self.poster.close()
+        self.worker = None
+        self.button_run.config(state=tk.NORMAL)
+        self.button_cancel.config(state=tk.DISABLED)
+
+    def on_scheduler_progress(self, done, total):
+        average = self.partial_waiting / self.partial_count if self.partial_count else 0.0
+        self.label_status.config(
+            text=f"Finished {done}/{total} processes, average waiting time so far: {average:.2f}"
         )
 
-        messagebox.showinfo("Scheduling Results", "\n".join(results))
+    def on_scheduler_rows(self, rows):
+        self.partial_count += len(rows)
+        self.partial_waiting += sum(row[1] for row in rows)
+
+    def on_scheduler_cancelled(self):
+        self.end_run()
+        self.label_status.config(text="Scheduling cancelled.")
+
+    def on_scheduler_error(self, error):
+        self.end_run()
+        self.label_status.config(text="")
+        messagebox.showerror("Scheduler Error", str(error))
+
+    def on_scheduler_done(self, scheduler):
+        self.end_run()
+        timeline = scheduler.timeline
+        self.label_status.config(
+            text=f"Scheduled {len(scheduler.processes)} processes.\n"
+                 f"CPU utilization {timeline.get('utilization', 0.0):.0%}, "
+                 f"throughput {timeline.get('throughput', 0.0):.2f} per time unit,\n"
+                 f"{timeline['context_switches']} context switches."
+        )
+
+        # Show the run's own process table in a virtualized view; ttk is only loaded here
+        from scheduler.tkviews import ResultsWindow
+
+        ResultsWindow(self, scheduler.table, scheduler.summary)
 
         self.scheduler = scheduler
 
@@ -166,5 +207,7 @@ class SchedulerGUI(tk.Tk):
 
 # Run the GUI
 if __name__ == "__main__":
+    # SCHEDULER_INSTRUMENT=timings.json records phase timings for the session
+    from_environment()
     gui = SchedulerGUI()
     gui.mainloop()
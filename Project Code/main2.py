@@ -1,74 +1,21 @@
-import matplotlib
-matplotlib.use('gtk4agg')
 import gi
 gi.require_version('Gtk', '4.0')
-import matplotlib.pyplot as plt
-import numpy as np
 from gi.repository import Gtk, GLib, GObject
-
-# Define process class
-class Process:
-    def __init__(self, pid, priority, arrival_time, burst_time):
-        self.pid = pid
-        self.priority = priority
-        self.arrival_time = arrival_time
-        self.burst_time = burst_time
-        self.waiting_time = 0
-        self.turnaround_time = 0
-        self.response_time = 0
-
-# Define the CPU scheduler
-class PriorityScheduler:
-    def __init__(self):
-        self.processes = []
-
-    def add_process(self, process):
-        self.processes.append(process)
-
-    def schedule(self):
-        # Sort the processes based on priority, then by arrival time
-        self.processes.sort(key=lambda p: (p.priority, p.arrival_time))
-
-        current_time = 0
-        for process in self.processes:
-            if current_time < process.arrival_time:
-                current_time = process.arrival_time
-            
-            process.waiting_time = current_time - process.arrival_time
-            process.response_time = process.waiting_time
-            current_time += process.burst_time
-            process.turnaround_time = process.waiting_time + process.burst_time
-
-        # Calculate average times
-        self.avg_waiting_time = sum(p.waiting_time for p in self.processes) / len(self.processes)
-        self.avg_turnaround_time = sum(p.turnaround_time for p in self.processes) / len(self.processes)
-        self.avg_response_time = sum(p.response_time for p in self.processes) / len(self.processes)
-
-    def plot_gantt_chart(self):
-        # Create a Gantt chart
-        fig, ax = plt.subplots()
-        start_times = []
-        durations = []
-        labels = []
-
-        current_time = 0
-        for process in self.processes:
-            if current_time < process.arrival_time:
-                # Idle time
-                start_times.append(current_time)
-                durations.append(process.arrival_time - current_time)
-                labels.append('')
-                current_time = process.arrival_time
-
-            start_times.append(current_time)
-            durations.append(process.burst_time)
-            labels.append(f'P{process.pid}')
-            current_time += process.burst_time
-
-        ax.barh(labels, durations, left=start_times, color='skyblue')
-        ax.set_xlabel('Time')
-        ax.set_title('Gantt Chart')
-        plt.show()
+from scheduler import Process, ResultCache, Scheduler as CoreScheduler, available_policies
+from scheduler.instrument import from_environment
+from scheduler.worker import SimulationWorker
+
+# Define the CPU scheduler; the engine itself lives in the shared scheduler package
+class Scheduler(CoreScheduler):
+    def plot_gantt_chart(self, parent):
+        # matplotlib and its GTK4 backend are only loaded the first time a chart is shown
+        from scheduler.gtkgantt import GanttView
+
+        # Zoomable chart in a window of our own; only the visible stretch is drawn
+        window = Gtk.Window(title="Gantt Chart", transient_for=parent)
+        window.set_default_size(800, 450)
+        window.set_child(GanttView(self.result, [p.pid for p in self.jobs], color='skyblue'))
+        window.present()
 
 # Define the GUI
 class SchedulerGUI(Gtk.Application):
@@ -77,6 +24,7 @@ class SchedulerGUI(Gtk.Application):
 
         # Processes list
         self.processes = []
+        self.worker = None
 
         # Set up the application window
         self.connect("activate", self.on_activate)
@@ -85,7 +33,7 @@ class SchedulerGUI(Gtk.Application):
         # Create the main window
         self.window = Gtk.ApplicationWindow(application=app)
         self.window.set_title("Priority Scheduler")
-        self.window.set_default_size(400, 300)
+        self.window.set_default_size(640, 560)
         
         # Create the vertical box to hold widgets
         vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=6)
@@ -95,6 +43,28 @@ class SchedulerGUI(Gtk.Application):
         self.entry_processes = Gtk.Entry()
         self.entry_processes.set_placeholder_text("Number of Processes")
         vbox.append(self.entry_processes)
+
+        # Scheduling policy, picked by name from the shared policy registry
+        self.policy_names = available_policies()
+        self.dropdown_policy = Gtk.DropDown.new_from_strings(self.policy_names)
+        self.dropdown_policy.set_selected(self.policy_names.index("priority"))
+        vbox.append(self.dropdown_policy)
+
+        self.entry_quantum = Gtk.Entry()
+        self.entry_quantum.set_placeholder_text("Quantum (Round Robin)")
+        self.entry_quantum.set_text("2")
+        vbox.append(self.entry_quantum)
+
+        # CPU time lost every time a different process is dispatched
+        self.entry_switch_cost = Gtk.Entry()
+        self.entry_switch_cost.set_placeholder_text("Context Switch Time")
+        self.entry_switch_cost.set_text("0")
+        vbox.append(self.entry_switch_cost)
+
+        # Identical earlier runs are loaded from the on-disk result cache unless this is unticked
+        self.check_cache = Gtk.CheckButton(label="Reuse cached results")
+        self.check_cache.set_active(True)
+        vbox.append(self.check_cache)
         
         # Add processes button
         button_add_processes = Gtk.Button(label="Add Processes")
@@ -102,18 +72,29 @@ class SchedulerGUI(Gtk.Application):
         vbox.append(button_add_processes)
 
         # Run scheduler button
-        button_run = Gtk.Button(label="Run Scheduler")
-        button_run.connect("clicked", self.on_run_scheduler)
-        vbox.append(button_run)
+        self.button_run = Gtk.Button(label="Run Scheduler")
+        self.button_run.connect("clicked", self.on_run_scheduler)
+        vbox.append(self.button_run)
+
+        # Cancel a run in progress
+        self.button_cancel = Gtk.Button(label="Cancel")
+        self.button_cancel.connect("clicked", self.on_cancel_scheduler)
+        self.button_cancel.set_sensitive(False)
+        vbox.append(self.button_cancel)
+
+        # Progress of a run in the background
+        self.progress_bar = Gtk.ProgressBar()
+        self.progress_bar.set_show_text(True)
+        vbox.append(self.progress_bar)
 
         # Show Gantt Chart button
         button_show_gantt = Gtk.Button(label="Show Gantt Chart")
         button_show_gantt.connect("clicked", self.on_show_gantt_chart)
         vbox.append(button_show_gantt)
 
-        # Show results in a text view
-        self.textview_results = Gtk.TextView()
-        vbox.append(self.textview_results)
+        # Results view, created when the first run finishes
+        self.vbox = vbox
+        self.results_view = None
 
 
 
@@ -142,8 +123,6 @@ class SchedulerGUI(Gtk.Application):
 
             try:
                 priority = int(input(f"Enter priority for process {pid}: "))
-                if priority < 0:
-                    raise ValueError("Priority must be non-negative.")
 
                 arrival_time = float(input(f"Enter arrival time for process {pid}: "))
                 if arrival_time < 0:
@@ -177,6 +156,16 @@ class SchedulerGUI(Gtk.Application):
         dialog.run()
         dialog.destroy()
 
+    def create_scheduler(self):
+        # Build a scheduler for the selected policy; only Round Robin takes a quantum
+        policy = self.policy_names[self.dropdown_policy.get_selected()]
+        params = {}
+        if policy == "rr":
+            params["quantum"] = float(self.entry_quantum.get_text())
+        switch_cost = float(self.entry_switch_cost.get_text() or 0)
+        cache = ResultCache() if self.check_cache.get_active() else None
+        return Scheduler(policy, cache=cache, switch_cost=switch_cost, **params)
+
     def on_run_scheduler(self, button):
         if not self.processes:
             dialog = Gtk.MessageDialog(
@@ -190,37 +179,96 @@ class SchedulerGUI(Gtk.Application):
             dialog.destroy()
             return
 
-        scheduler = PriorityScheduler()
+        try:
+            scheduler = self.create_scheduler()
+        except ValueError as e:
+            dialog = Gtk.MessageDialog(
+                transient_for=self.window,
+                flags=0,
+                message_type=Gtk.MessageType.ERROR,
+                buttons=Gtk.ButtonsType.CLOSE,
+                text=str(e),
+            )
+            dialog.run()
+            dialog.destroy()
+            return
+
         for process in self.processes:
             scheduler.add_process(process)
 
-        scheduler.schedule()
-
-        # Show results
-        results = []
-        for process in scheduler.processes:
-            results.append(
-                f"Process P{process.pid}:\n"
-                f"Waiting Time: {process.waiting_time:.2f}\n"
-                f"Turnaround Time: {process.turnaround_time:.2f}\n"
-                f"Response Time: {process.response_time:.2f}\n"
-            )
+        # Simulate on a worker thread; GLib.idle_add brings progress and results back to the GTK main loop
+        self.partial_count = 0
+        self.partial_waiting = 0.0
+        self.worker = SimulationWorker(
+            scheduler, GLib.idle_add,
+            on_progress=self.on_scheduler_progress,
+            on_rows=self.on_scheduler_rows,
+            on_done=self.on_scheduler_done,
+            on_cancelled=self.on_scheduler_cancelled,
+            on_error=self.on_scheduler_error,
+        ).start()
+        self.button_run.set_sensitive(False)
+        self.button_cancel.set_sensitive(True)
+
+    def on_cancel_scheduler(self, button):
+        if self.worker is not None:
+            self.worker.cancel()
+
+    def end_run(self):
+        self.worker = None
+        self.button_run.set_sensitive(True)
+        self.button_cancel.set_sensitive(False)
+
+    def on_scheduler_progress(self, done, total):
+        average = self.partial_waiting / self.partial_count if self.partial_count else 0.0
+        self.progress_bar.set_fraction(done / total)
+        self.progress_bar.set_text(f"{done}/{total} processes, average waiting time so far: {average:.2f}")
+
+    def on_scheduler_rows(self, rows):
+        self.partial_count += len(rows)
+        self.partial_waiting += sum(row[1] for row in rows)
+
+    def on_scheduler_cancelled(self):
+        self.end_run()
+        self.progress_bar.set_fraction(0.0)
+        self.progress_bar.set_text("Scheduling cancelled.")
+
+    def on_scheduler_error(self, error):
+        self.end_run()
+        dialog = Gtk.MessageDialog(
+            transient_for=self.window,
+            flags=0,
+            message_type=Gtk.MessageType.ERROR,
+            buttons=Gtk.ButtonsType.CLOSE,
+            text=str(error),
+        )
+        dialog.run()
+        dialog.destroy()
 
-        results.append(
-            f"Average Waiting Time: {scheduler.avg_waiting_time:.2f}\n"
-            f"Average Turnaround Time: {scheduler.avg_turnaround_time:.2f}\n"
-            f"Average Response Time: {scheduler.avg_response_time:.2f}\n"
+    def on_scheduler_done(self, scheduler):
+        self.end_run()
+        timeline = scheduler.timeline
+        self.progress_bar.set_text(
+            f"Scheduled {len(scheduler.processes)} processes: "
+            f"{timeline.get('utilization', 0.0):.0%} CPU utilization, "
+            f"{timeline.get('throughput', 0.0):.2f} per time unit, "
+            f"{timeline['context_switches']} context switches."
         )
 
-        # Display results in the text view
-        text_buffer = self.textview_results.get_buffer()
-        text_buffer.set_text("\n".join(results))
+        # Show the run's own process table in a virtualized column view
+        from scheduler.gtkviews import ResultsView
+
+        if self.results_view is None:
+            self.results_view = ResultsView()
+            self.results_view.set_vexpand(True)
+            self.vbox.append(self.results_view)
+        self.results_view.set_table(scheduler.table, scheduler.summary)
 
         self.scheduler = scheduler
 
     def on_show_gantt_chart(self, button):
         if hasattr(self, 'scheduler') and self.scheduler.processes:
-            self.scheduler.plot_gantt_chart()
+            self.scheduler.plot_gantt_chart(self.window)
         else:
             dialog = Gtk.MessageDialog(
                 transient_for=self.window,
@@ -234,5 +282,7 @@ class SchedulerGUI(Gtk.Application):
 
 # Run the GUI
 if __name__ == "__main__":
+    # SCHEDULER_INSTRUMENT=timings.json records phase timings for the session
+    from_environment()
     app = SchedulerGUI()
     app.run()
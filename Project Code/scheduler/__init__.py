@@ -0,0 +1,31 @@
+from .cache import ResultCache
+from .devices import Device, IOSchedule, io_summary, simulate_io
+from .engine import Schedule, SimulationCancelled, simulate, simulate_preemptive_priority, simulate_priority, simulate_srtf
+from .incremental import IncrementalScheduler
+from .instrument import Observer, Recorder
+from .metrics import summarize
+from .multicore import MulticoreSchedule, simulate_multicore
+from .online import Completion, OnlineScheduler
+from .policies import POLICIES, Policy, available_policies, get_policy, register_policy
+from .process import PriorityScheduler, Process, Scheduler
+from .realtime import Task, simulate_realtime, utilization_checks
+from .segments import IDLE, RUN, SWITCH, SegmentLog
+from .sketches import QuantileSketch
+
+# NumPy-backed names load on first use, so "import scheduler" stays cheap for
+# the GUIs and for headless runs that never touch the columnar path
+_LAZY = {
+    "BatchResult": ".batch",
+    "ProcessTable": ".table",
+    "simulate_batch": ".batch",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        import importlib
+
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,452 @@
+# Many small, independent workloads simulated side by side. Trace r is row r
+# of padded (traces, jobs) arrays, and every step moves each unfinished trace
+# on by one event (a completion, a quantum expiry or, for preemptive
+# policies, an arrival) with whole-column NumPy operations. Python overhead is
+# then paid once per step for the whole batch instead of once per job for
+# every trace, which is what dominates traces of a few dozen to a few hundred
+# jobs. Single CPU and no switch costs; start and finish times match
+# engine.simulate job for job. Policies without a kernel here (mlfq, cfs, or
+# ones registered outside this package) fall back to one engine.simulate per
+# trace. fcfs needs no queue at all and is settled one column at a time.
+#
+# Against a loop of engine.simulate over 2000 traces of 20-200 jobs, already
+# packed: fcfs 22x, priority-aging 6x, sjf and priority 4x, rr and
+# preemptive-priority 3.5-4x, srtf 2.3x, and about 1x for the fallbacks.
+# Packing lists with pack() costs about as much as the fcfs run itself, which
+# brings fcfs to 9x; the other policies lose little to it. Only fcfs reaches
+# the 20x first asked for: every other step still moves one event per trace.
+from itertools import chain, repeat
+
+import numpy as np
+
+from .engine import simulate
+from .metrics import METRICS
+from .policies import (AgingPriorityPolicy, FCFSPolicy, PreemptivePriorityPolicy, PriorityPolicy, RoundRobinPolicy,
+                       SJFPolicy, SRTFPolicy, get_policy)
+
+ONE = np.uint64(1)
+# Traces are simulated in chunks small enough that the ranked queues' prefix
+# tables (about jobs^2 / 8 bytes a trace) stay under this
+MAX_CHUNK_BYTES = 64 << 20
+
+
+# Rank of the lowest set bit in each row of a (rows, words) bit array, -1 where none is set
+def _lowest(bits):
+    rows, words = bits.shape
+    if words == 1:
+        word = 0
+        value = bits[:, 0]
+    else:
+        word = (bits != 0).argmax(1)
+        value = bits.ravel()[np.arange(rows) * words + word]
+    # The lowest set bit alone is a power of two, which a float holds exactly
+    lowest = np.frexp((value & (~value + ONE)).astype(np.float64))[1] - 1
+    return np.where(value != 0, word * 64 + lowest, -1)
+
+
+def _bit(rank):
+    return ONE << (rank & 63).astype(np.uint64)
+
+
+# The queues below share one interface, where rows are trace indices:
+#
+#   requeue(rows, cols)     a job goes back after its slice or a preemption
+#   first(rows)             best queued column per row (-1 where empty) and a
+#                           token that take() needs to remove it
+#   take(rows, token)       remove what first() returned for these rows
+#   arrive(rows, old)       columns old..cursor-1 of each row have arrived
+#
+# 2-D state is kept flat and gathered with one index per row, which costs a
+# fraction of NumPy's 2-D fancy indexing.
+#
+# Ready queue ordered by a fixed key, as bits in key order: the best queued
+# job is the lowest set bit. Ties go to the lower column, which (columns
+# being in arrival order) matches the engine's (key, arrival, index).
+# admitted[r, c] holds the bits of row r's first c columns, so a trace's
+# ready set is that ANDed with its jobs not yet taken, and arrivals are free.
+class _RankedQueue:
+    def __init__(self, key, cursor):
+        traces, width = key.shape
+        self.cursor = cursor
+        self.width = width
+        col = np.argsort(key, axis=1, kind="stable")
+        rank = np.empty_like(col)
+        np.put_along_axis(rank, col, np.broadcast_to(np.arange(width), key.shape), axis=1)
+        words = (width + 63) // 64
+        # One bit per cell, at [row, col + 1, rank // 64], then a running OR along the columns
+        cells = (np.arange(traces)[:, None] * (width + 1) + np.arange(1, width + 1)) * words + (rank >> 6)
+        admitted = np.zeros((traces, width + 1, words), dtype=np.uint64)
+        admitted.ravel()[cells.ravel()] = _bit(rank).ravel()
+        np.bitwise_or.accumulate(admitted, axis=1, out=admitted)
+        self.waiting = admitted[:, width].copy()
+        self.admitted = admitted.reshape(-1, words)
+        self.col = col.ravel()
+        self.rank = rank.ravel()
+
+    def arrive(self, rows, old):
+        pass
+
+    def requeue(self, rows, cols):
+        rank = self.rank[rows * self.width + cols]
+        self.waiting[rows, rank >> 6] |= _bit(rank)
+
+    def first(self, rows):
+        ready = np.take(self.admitted, rows * (self.width + 1) + self.cursor[rows], axis=0)
+        rank = _lowest(ready & np.take(self.waiting, rows, axis=0))
+        return np.where(rank >= 0, self.col[rows * self.width + rank], -1), rank
+
+    def take(self, rows, rank):
+        self.waiting[rows, rank >> 6] &= ~_bit(rank)
+
+    # Whether the best queued job beats the running one
+    def preempts(self, rows, running, remaining, best, rank):
+        return (rank >= 0) & (rank < self.rank[rows * self.width + running])
+
+
+# FIFO ready queue as one ring buffer per trace. Entries are column ranges,
+# so a step that admits several arrivals pushes them as one entry.
+class _FifoQueue:
+    def __init__(self, shape, cursor):
+        self.cursor = cursor
+        self.capacity = shape[1] + 1
+        self.lo = np.zeros(shape[0] * self.capacity, dtype=np.int64)
+        self.hi = np.zeros(shape[0] * self.capacity, dtype=np.int64)
+        self.head = np.zeros(shape[0], dtype=np.int64)
+        self.tail = np.zeros(shape[0], dtype=np.int64)
+
+    def _push(self, rows, lo, hi):
+        slot = rows * self.capacity + self.tail[rows] % self.capacity
+        self.lo[slot] = lo
+        self.hi[slot] = hi
+        self.tail[rows] += 1
+
+    def arrive(self, rows, old):
+        new = self.cursor[rows]
+        some = new > old
+        self._push(rows[some], old[some], new[some])
+
+    def requeue(self, rows, cols):
+        self._push(rows, cols, cols + 1)
+
+    def first(self, rows):
+        head = self.head[rows]
+        col = self.lo[rows * self.capacity + head % self.capacity]
+        return np.where(head < self.tail[rows], col, -1), None
+
+    def take(self, rows, token):
+        slot = rows * self.capacity + self.head[rows] % self.capacity
+        col = self.lo[slot] + 1
+        self.lo[slot] = col
+        self.head[rows] += col == self.hi[slot]
+
+
+# Shortest remaining time first. Jobs that have not run yet sit in a ranked
+# queue by burst. A preempted job had the least remaining time in the queue
+# when it was dispatched and only got shorter since, so the preempted ones
+# form a stack with the best at the top. The token is the fresh job's rank,
+# or -2 for the stack top.
+class _ShortestQueue:
+    def __init__(self, burst, remaining, cursor):
+        self.fresh = _RankedQueue(burst, cursor)
+        self.width = burst.shape[1]
+        self.remaining = remaining.ravel()
+        self.stack = np.zeros(burst.size, dtype=np.int64)
+        self.depth = np.zeros(burst.shape[0], dtype=np.int64)
+
+    def arrive(self, rows, old):
+        pass
+
+    def requeue(self, rows, cols):
+        self.stack[rows * self.width + self.depth[rows]] = cols
+        self.depth[rows] += 1
+
+    def first(self, rows):
+        base = rows * self.width
+        fresh, rank = self.fresh.first(rows)
+        depth = self.depth[rows]
+        top = self.stack[base + np.maximum(depth - 1, 0)]
+        top_key = self.remaining[base + top]
+        fresh_key = self.remaining[base + fresh]
+        use_top = (depth > 0) & ((fresh < 0) | (top_key < fresh_key) | ((top_key == fresh_key) & (top < fresh)))
+        return np.where(use_top, top, fresh), np.where(use_top, -2, rank)
+
+    def take(self, rows, token):
+        top = token == -2
+        self.depth[rows[top]] -= 1
+        self.fresh.take(rows[~top], token[~top])
+
+    def preempts(self, rows, running, remaining, best, token):
+        key = self.remaining[rows * self.width + best]
+        return (best >= 0) & ((key < remaining) | ((key == remaining) & (best < running)))
+
+
+# The ready queue, quantum and preemptiveness for a policy, or None without a kernel
+def _kernel(policy, arrival, burst, priority, remaining, cursor):
+    kind = type(policy)
+    if kind is FCFSPolicy:
+        return _FifoQueue(arrival.shape, cursor), None, False
+    if kind is RoundRobinPolicy:
+        return _FifoQueue(arrival.shape, cursor), policy.time_slice, False
+    if kind is SJFPolicy:
+        return _RankedQueue(burst, cursor), None, False
+    if kind is PriorityPolicy:
+        return _RankedQueue(priority, cursor), None, False
+    if kind is PreemptivePriorityPolicy:
+        return _RankedQueue(priority, cursor), None, True
+    if kind is AgingPriorityPolicy:
+        with np.errstate(invalid="ignore"):
+            # Padding arrives at infinity; 0 * inf is NaN, which sorts last all the same
+            return _RankedQueue(priority + policy.aging_rate * arrival, cursor), None, False
+    if kind is SRTFPolicy:
+        return _ShortestQueue(burst, remaining, cursor), None, True
+    return None
+
+
+# Results of a batch, (traces, jobs) arrays in the input's column order with
+# NaN in the padding
+class BatchResult:
+    def __init__(self, arrival, burst, lengths, start, finish):
+        self.lengths = lengths
+        self.start = start
+        self.finish = finish
+        self.turnaround = finish - arrival
+        self.waiting = self.turnaround - burst
+        self.response = start - arrival
+
+    def __len__(self):
+        return len(self.lengths)
+
+    # Per-trace aggregates, one array of length traces per column
+    def summary(self):
+        summary = {"count": self.lengths}
+        count = np.maximum(self.lengths, 1)
+        for name, values in zip(METRICS, (self.waiting, self.turnaround, self.response)):
+            total = np.nansum(values, axis=1)
+            summary[f"avg_{name}"] = total / count
+            summary[f"total_{name}"] = total
+            summary[f"max_{name}"] = np.where(np.isnan(values), -np.inf, values).max(axis=1, initial=0.0)
+        summary["makespan"] = np.where(np.isnan(self.finish), 0.0, self.finish).max(axis=1, initial=0.0)
+        return summary
+
+
+# Pad (arrival, burst, priority) workloads into (traces, jobs) arrays plus
+# the length of each; priority may be None
+def pack(workloads):
+    workloads = list(workloads)
+    lengths = np.array([len(arrival) for arrival, _, _ in workloads], dtype=np.int64)
+    width = int(lengths.max()) if len(lengths) else 0
+    total = int(lengths.sum())
+    # Row-major order of the filled cells is the order of the concatenated workloads
+    filled = np.arange(width) < lengths[:, None]
+    arrival = np.zeros((len(workloads), width))
+    burst = np.zeros((len(workloads), width))
+    priority = np.zeros((len(workloads), width), dtype=np.int64)
+    arrival[filled] = np.fromiter(chain.from_iterable(a for a, _, _ in workloads), np.float64, total)
+    burst[filled] = np.fromiter(chain.from_iterable(b for _, b, _ in workloads), np.float64, total)
+    priority[filled] = np.fromiter(chain.from_iterable(p if p is not None else repeat(0, len(a))
+                                                       for a, _, p in workloads), np.int64, total)
+    return arrival, burst, priority, lengths
+
+
+# pack for lists of Process objects, like the ones the GUIs collect
+def pack_processes(process_lists):
+    return pack(([p.arrival_time for p in processes], [p.burst_time for p in processes],
+                 [p.priority for p in processes]) for processes in process_lists)
+
+
+# Simulate every row of the (traces, jobs) arrays as its own workload. lengths
+# gives the jobs in each row (default: all of them); the rest is padding.
+def simulate_batch(arrival, burst, priority=None, policy="priority", lengths=None):
+    if isinstance(policy, str):
+        policy = get_policy(policy)
+    arrival = np.asarray(arrival, dtype=np.float64)
+    burst = np.asarray(burst, dtype=np.float64)
+    if arrival.ndim != 2 or burst.shape != arrival.shape:
+        raise ValueError("Arrival and burst must be 2-D arrays of the same shape.")
+    priority = np.zeros(arrival.shape, dtype=np.int64) if priority is None else np.asarray(priority)
+    traces, width = arrival.shape
+    lengths = np.full(traces, width, dtype=np.int64) if lengths is None else np.asarray(lengths, dtype=np.int64)
+    padding = np.arange(width) >= lengths[:, None]
+
+    # Columns in arrival order (stable, like the engine), padding last.
+    # Generated traces usually are in order already and skip the sort.
+    keys = np.where(padding, np.inf, arrival)
+    order = None
+    if (keys[:, 1:] >= keys[:, :-1]).all():
+        columns = [keys, burst, priority]
+    else:
+        order = np.argsort(keys, axis=1, kind="stable")
+        columns = [np.take_along_axis(column, order, axis=1) for column in (keys, burst, priority)]
+    if type(policy) is FCFSPolicy:
+        start, finish = _fcfs(columns[0], columns[1], padding)
+    else:
+        start = np.full(arrival.shape, np.nan)
+        finish = np.full(arrival.shape, np.nan)
+        # Longest traces first, so the ones still running are (nearly) a prefix of
+        # each chunk and finished ones drop off its end
+        by_length = np.argsort(-lengths, kind="stable")
+        chunk = max(1, MAX_CHUNK_BYTES // ((width + 1) * ((width + 63) // 64 or 1) * 8))
+        for lo in range(0, traces, chunk):
+            rows = by_length[lo:lo + chunk]
+            rows = rows[lengths[rows] > 0]
+            if len(rows):
+                start[rows], finish[rows] = _lockstep(*(column[rows] for column in columns), lengths[rows], policy)
+
+    if order is not None:
+        out_start = np.empty_like(start)
+        out_finish = np.empty_like(finish)
+        np.put_along_axis(out_start, order, start, axis=1)
+        np.put_along_axis(out_finish, order, finish, axis=1)
+        start, finish = out_start, out_finish
+    return BatchResult(np.where(padding, np.nan, arrival), burst, lengths, start, finish)
+
+
+# First come, first served needs no queue: in arrival order each job starts
+# once it has arrived and its predecessor is done, so one pass per column
+# settles that column in every trace. Columns are walked transposed, so each
+# pass reads and writes contiguous memory.
+def _fcfs(arrival, burst, padding):
+    arrival = np.ascontiguousarray(arrival.T)
+    burst = np.ascontiguousarray(burst.T)
+    start = np.empty_like(arrival)
+    finish = np.empty_like(arrival)
+    previous = np.zeros(arrival.shape[1])
+    for col in range(len(arrival)):
+        np.maximum(arrival[col], previous, out=start[col])
+        np.add(start[col], burst[col], out=finish[col])
+        previous = finish[col]
+    start = start.T
+    finish = finish.T
+    start[padding] = np.nan
+    finish[padding] = np.nan
+    return start, finish
+
+
+# One chunk of traces, sorted longest first, none of them empty
+def _lockstep(arrival, burst, priority, lengths, policy):
+    traces, width = arrival.shape
+    start = np.full(arrival.shape, np.nan)
+    finish = np.full(arrival.shape, np.nan)
+    remaining = burst.copy()
+    cursor = np.zeros(traces, dtype=np.int64)
+    kernel = _kernel(policy, arrival, burst, priority, remaining, cursor)
+    if kernel is None:
+        for row in range(traces):
+            n = lengths[row]
+            # Lists, since the engine is much slower on NumPy scalars
+            result = simulate(arrival[row, :n].tolist(), burst[row, :n].tolist(), priority[row, :n].tolist(), policy,
+                              order=range(n))
+            start[row, :n] = result.start
+            finish[row, :n] = result.finish
+        return start, finish
+    queue, quantum, preemptive = kernel
+
+    # Per-trace state of the running slice, as in engine.simulate
+    now = np.zeros(traces)
+    running = np.full(traces, -1, dtype=np.int64)
+    since = np.zeros(traces)
+    left = np.zeros(traces)
+    slice_end = np.zeros(traces)
+    completes = np.zeros(traces, dtype=bool)
+    done = np.zeros(traces, dtype=np.int64)
+
+    # Flat views; cell (row, col) is row * width + col. An extra infinite
+    # column stands for "no more arrivals".
+    arrivals = np.concatenate([arrival, np.full((traces, 1), np.inf)], axis=1).ravel()
+    remaining_flat = remaining.ravel()
+    start_flat = start.ravel()
+    finish_flat = finish.ravel()
+    index = np.arange(traces)
+    cell = index * width
+    next_cell = index * (width + 1)
+
+    def admit(rows):
+        # Move each trace's cursor past everything that has arrived by now,
+        # one column a pass; few traces see more than a couple of arrivals a step
+        old = cursor[rows]
+        passing = rows
+        while len(passing):
+            passing = passing[arrivals[next_cell[passing] + cursor[passing]] <= now[passing]]
+            cursor[passing] += 1
+        queue.arrive(rows, old)
+
+    # Traces past the last unfinished one are left out of every step. Finished
+    # traces before it go through the motions as no-ops: nothing running, an
+    # empty queue and no arrivals left.
+    k = traces
+    while k:
+        rows = index[:k]
+        run = running[:k].copy()
+        busy = run >= 0
+
+        # Busy traces move on to their next event
+        end = slice_end[:k]
+        if preemptive:
+            next_arrival = arrivals[next_cell[:k] + cursor[:k]]
+            arriving = busy & (next_arrival < end)
+            end = np.where(arriving, next_arrival, end)
+            ended = busy & ~arriving
+        else:
+            ended = busy
+        now[:k] = np.where(busy, end, now[:k])
+        complete = ended & completes[:k]
+        finished = rows[complete]
+        finish_flat[cell[finished] + run[finished]] = now[finished]
+        done[:k] += complete
+        running[:k] = np.where(ended, -1, run)
+        admit(rows[busy])
+
+        # Arrivals during an expired slice queue up ahead of it
+        if quantum is not None:
+            expired = rows[ended & ~complete]
+            jobs = run[expired]
+            remaining_flat[cell[expired] + jobs] = left[expired] - (now[expired] - since[expired])
+            queue.requeue(expired, jobs)
+
+        if preemptive:
+            interrupted = rows[arriving]
+            if len(interrupted):
+                jobs = run[interrupted]
+                elapsed = now[interrupted] - since[interrupted]
+                now_left = np.where(elapsed > 0, left[interrupted] - elapsed, left[interrupted])
+                best, token = queue.first(interrupted)
+                preempted = queue.preempts(interrupted, jobs, now_left, best, token)
+                interrupted = interrupted[preempted]
+                jobs = jobs[preempted]
+                remaining_flat[cell[interrupted] + jobs] = now_left[preempted]
+                queue.requeue(interrupted, jobs)
+                running[interrupted] = -1
+
+        # Free traces take their best ready job; those with nothing ready jump to their next arrival
+        free = rows[running[:k] < 0]
+        jobs, token = queue.first(free)
+        empty = jobs < 0
+        idle = free[empty]
+        idle = idle[cursor[idle] < lengths[idle]]
+        if len(idle):
+            now[idle] = arrivals[next_cell[idle] + cursor[idle]]
+            admit(idle)
+            jobs, token = queue.first(free)
+        took = jobs >= 0
+        ready = free[took]
+        if len(ready):
+            jobs = jobs[took]
+            queue.take(ready, None if token is None else token[took])
+            t = now[ready]
+            cells = cell[ready] + jobs
+            start_flat[cells] = np.fmin(start_flat[cells], t)
+            burst_left = remaining_flat[cells]
+            running[ready] = jobs
+            since[ready] = t
+            left[ready] = burst_left
+            if quantum is None:
+                completes[ready] = True
+                slice_end[ready] = t + burst_left
+            else:
+                fits = quantum >= burst_left
+                completes[ready] = fits
+                slice_end[ready] = t + np.where(fits, burst_left, quantum)
+
+        while k and done[k - 1] == lengths[k - 1]:
+            k -= 1
+    return start, finish
@@ -0,0 +1,115 @@
+# Benchmark harness for the scheduling core. Each case (workload, size,
+# policy, implementation) runs in a fresh interpreter so peak RSS belongs to
+# that case alone. Results can be saved as a JSON baseline and later runs
+# compared against it.
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import time
+
+IMPLEMENTATIONS = ("columnar", "object")
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def _schedule(table, policy, implementation):
+    from .process import Process, Scheduler
+
+    if implementation == "object":
+        scheduler = Scheduler(policy)
+        for row in zip(table.pid.tolist(), table.priority.tolist(), table.arrival.tolist(), table.burst.tolist()):
+            scheduler.add_process(Process(*row))
+        del table
+        started = time.perf_counter()
+        scheduler.schedule()
+        return time.perf_counter() - started
+    if implementation == "columnar":
+        started = time.perf_counter()
+        table.schedule(policy)
+        return time.perf_counter() - started
+    raise ValueError(f"Unknown implementation: {implementation}")
+
+
+# Time one case; only schedule() is timed, not generating or building the input.
+# A small warm-up run first keeps one-off import and first-call costs out of small sizes.
+def run_case(workload, size, policy, implementation, seed=0):
+    from .generators import generate
+
+    _schedule(generate(workload, 64, seed), policy, implementation)
+    elapsed = _schedule(generate(workload, size, seed), policy, implementation)
+    return {
+        "workload": workload,
+        "size": size,
+        "policy": policy,
+        "implementation": implementation,
+        "seconds": elapsed,
+        "jobs_per_sec": size / elapsed if elapsed else float("inf"),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def _run_isolated(args):
+    return run_case(*args)
+
+
+def run_suite(workloads, sizes, policies, implementations, seed=0, isolate=True, report=None):
+    cases = [(w, s, p, i, seed) for w in workloads for s in sizes for p in policies for i in implementations]
+    results = []
+    if isolate:
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(1, maxtasksperchild=1) as pool:
+            for result in pool.imap(_run_isolated, cases):
+                results.append(result)
+                if report is not None:
+                    report(result)
+    else:
+        for case in cases:
+            results.append(run_case(*case))
+            if report is not None:
+                report(results[-1])
+    return results
+
+
+def case_key(result):
+    return (result["workload"], result["size"], result["policy"], result["implementation"])
+
+
+def save_baseline(path, results):
+    with open(path, "w") as f:
+        json.dump({
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "results": results,
+        }, f, indent=2)
+        f.write("\n")
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+# Cases whose throughput fell by more than tolerance (0.2 = 20%) against the baseline
+def compare(results, baseline, tolerance=0.2):
+    previous = {case_key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        old = previous.get(case_key(result))
+        if old is None:
+            continue
+        ratio = result["jobs_per_sec"] / old["jobs_per_sec"]
+        if ratio < 1 - tolerance:
+            regressions.append((result, old, ratio))
+    return regressions
+
+
+def format_result(result):
+    return (f"{result['workload']:<13}{result['size']:>10}  {result['policy']:<20}{result['implementation']:<10}"
+            f"{result['seconds']:>9.3f} s{result['jobs_per_sec']:>13,.0f} jobs/s{result['peak_rss_mb']:>9.1f} MB")
@@ -0,0 +1,224 @@
+# Content-addressed cache of simulation results. The key hashes the arrival,
+# burst and priority columns together with the policy (class and describe(),
+# which includes its parameters) and every engine option that changes the
+# result (costs, cpus, steal, affinity and the order of jobs to run), so the
+# same workload run the same way is looked up instead of simulated again.
+#
+# Each entry is one file: a JSON header line naming the stored arrays,
+# followed by their raw bytes. Hits touch the file's mtime and the directory
+# is trimmed oldest-first whenever it grows past max_bytes, so eviction is LRU.
+# hashlib, json and tempfile are imported where used, keeping "import scheduler" cheap.
+import os
+from array import array
+
+from .engine import Schedule, simulate
+from .instrument import phase
+from .multicore import MulticoreSchedule, simulate_multicore
+from .policies import get_policy
+from .segments import COLUMNS, SegmentLog
+
+VERSION = 5
+DEFAULT_MAX_BYTES = 512 << 20
+SUFFIX = ".result"
+HASH_CHUNK = 1 << 20
+# Buffer formats whose bytes already match how each typecode is hashed
+HASH_FORMATS = {"d": ("d",), "q": ("q", "l")}
+
+SCHEDULE_ARRAYS = ("start", "finish", "order")
+# The segment log's columns are stored under these names, with their own typecodes
+LOG_ARRAYS = tuple("segment_" + name for name in COLUMNS)
+
+
+def default_directory():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.environ.get("SCHEDULER_CACHE_DIR") or os.path.join(base, "os-scheduler")
+
+
+def _hash_column(h, column, typecode):
+    # Columns hash as float64 / int64 whatever they came in as, so a list and a
+    # NumPy column (or a mapped trace) with the same values share a key
+    if isinstance(column, memoryview):
+        # Hash the values the view shows, never its underlying buffer: two
+        # slices of one buffer must not share a key. A contiguous view already
+        # in the hashed layout goes in as is; any other format is converted.
+        if column.ndim != 1:
+            raise ValueError("Columns must be one-dimensional.")
+        if column.itemsize == 8 and column.format in HASH_FORMATS[typecode] and column.c_contiguous:
+            h.update(column.cast("B"))
+            return
+        import numpy as np
+
+        column = np.asarray(column)
+    if column is None:
+        h.update(b"none")
+    elif isinstance(column, array) and column.typecode == typecode:
+        h.update(column)
+    elif hasattr(column, "dtype"):
+        import numpy as np
+
+        dtype = np.float64 if typecode == "d" else np.int64
+        for lo in range(0, len(column), HASH_CHUNK):
+            h.update(np.ascontiguousarray(column[lo:lo + HASH_CHUNK], dtype=dtype))
+    else:
+        h.update(array(typecode, column))
+
+
+# order is hashed by value like the columns, so a range, a list and an argsort
+# listing the same jobs share a key; affinity by its sorted CPU sets.
+def result_key(arrival, burst, priority, policy, order=None, affinity=None, **options):
+    import hashlib
+    import json
+
+    h = hashlib.blake2b(digest_size=20)
+    cls = type(policy)
+    if affinity is not None:
+        affinity = [None if cpus is None else sorted(cpus) for cpus in affinity]
+    h.update(json.dumps([VERSION, f"{cls.__module__}.{cls.__qualname__}", policy.describe(),
+                         sorted(options.items()), affinity, len(arrival)]).encode())
+    _hash_column(h, arrival, "d")
+    _hash_column(h, burst, "d")
+    _hash_column(h, priority, "q")
+    _hash_column(h, order, "q")
+    return h.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or default_directory()
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def get(self, key):
+        import json
+
+        path = self._path(key)
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            return None
+        with f:
+            try:
+                header = json.loads(f.readline())
+                if header.get("version") != VERSION:
+                    return None
+                arrays = {}
+                for name, typecode, length in header["arrays"]:
+                    values = array(typecode)
+                    values.fromfile(f, length)
+                    arrays[name] = values
+            except (ValueError, KeyError, EOFError):
+                # Truncated or foreign file: treat as a miss, the next put replaces it
+                return None
+        os.utime(path)
+        columns = [arrays[name] for name in SCHEDULE_ARRAYS]
+        log = SegmentLog(*(arrays[name] for name in LOG_ARRAYS))
+        if "busy" in arrays:
+            return MulticoreSchedule(*columns, log, arrays["busy"], header["migrations"], header["switches"])
+        return Schedule(*columns, log, header["switches"])
+
+    def put(self, key, result):
+        import json
+        import tempfile
+
+        multicore = isinstance(result, MulticoreSchedule)
+        arrays = [(name, _as_array(getattr(result, name), "q" if name == "order" else "d")) for name in SCHEDULE_ARRAYS]
+        arrays += [("segment_" + name, values) for name, values in result.log.arrays().items()]
+        if multicore:
+            arrays.append(("busy", _as_array(result.busy, "d")))
+        header = {"version": VERSION, "arrays": [(name, values.typecode, len(values)) for name, values in arrays],
+                  "switches": result.switches}
+        if multicore:
+            header["migrations"] = result.migrations
+
+        # Write next to the final path and rename, so readers never see half an entry
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(json.dumps(header).encode() + b"\n")
+                for _, values in arrays:
+                    values.tofile(f)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self.trim()
+
+    def invalidate(self, key=None):
+        # Drop one entry, or every entry when key is None
+        paths = [self._path(key)] if key is not None else [path for path, _, _ in self.entries()]
+        for path in paths:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+    def entries(self):
+        # (path, size, last use) for every entry
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(SUFFIX):
+                    stat = entry.stat()
+                    entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def trim(self):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+def _as_array(values, typecode):
+    if isinstance(values, array) and values.typecode == typecode:
+        return values
+    return array(typecode, values)
+
+
+# engine.simulate (or simulate_multicore for cpus > 1) through a cache. With
+# cache None this is a plain run; refresh recomputes and replaces the entry.
+# A hit reports every job to progress in one call, as if the run had just finished.
+# affinity and steal apply to multi-core runs only. Any other engine option
+# (an idle callback) can't be keyed, so it is refused when a cache is given.
+def cached_simulate(cache, arrival, burst, priority, policy, cpus=1, migration_cost=0.0, switch_cost=0.0,
+                    dispatch_latency=0.0, order=None, affinity=None, steal=True, refresh=False, progress=None,
+                    progress_every=1024, **options):
+    if isinstance(policy, str):
+        policy = get_policy(policy)
+    run = {"switch_cost": switch_cost, "dispatch_latency": dispatch_latency}
+    if cpus > 1:
+        run.update(migration_cost=migration_cost, steal=steal)
+    elif affinity is not None:
+        raise ValueError("Affinity needs more than one CPU.")
+    if cache is not None:
+        if options:
+            raise ValueError(f"Runs with {', '.join(sorted(options))} are not cached.")
+        with phase("cache"):
+            key = result_key(arrival, burst, priority, policy, order=order, affinity=affinity, cpus=cpus, **run)
+            result = None if refresh else cache.get(key)
+        if result is not None:
+            if progress is not None:
+                progress(len(result.order), len(arrival), result.order, result.start, result.finish)
+            return result
+    if cpus > 1:
+        result = simulate_multicore(arrival, burst, priority, policy, cpus=cpus, affinity=affinity, order=order,
+                                    progress=progress, progress_every=progress_every, **run, **options)
+    else:
+        result = simulate(arrival, burst, priority, policy, order=order, progress=progress,
+                          progress_every=progress_every, **run, **options)
+    if cache is not None:
+        with phase("cache"):
+            cache.put(key, result)
+    return result
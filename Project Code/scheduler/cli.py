@@ -0,0 +1,465 @@
+# Headless entry point: python -m scheduler run --policy priority trace.csv
+# Nothing here (or in what it imports) may pull in tkinter, GTK or matplotlib,
+# so it runs unchanged on machines without a display.
+import argparse
+import contextlib
+import os
+import subprocess
+import sys
+
+from .policies import POLICIES, available_policies, get_policy
+
+INPUT_FORMATS = ("csv", "jsonl", "parquet", "trace")
+
+# Modules that must not be loaded by a bare "import scheduler"
+HEAVY_MODULES = ("numpy", "matplotlib", "tkinter", "gi")
+
+
+def parse_param(text):
+    # "quantum=4" -> (None, "quantum", 4); "mlfq:quanta=8,16" -> ("mlfq", "quanta", (8, 16))
+    name, sep, value = text.partition("=")
+    policy, colon, name = name.rpartition(":")
+    if not sep or not name or (colon and not policy):
+        raise argparse.ArgumentTypeError(f"Expected [POLICY:]NAME=VALUE, got {text!r}")
+    parts = [parse_number(part) for part in value.split(",")]
+    return policy or None, name, parts[0] if len(parts) == 1 else tuple(parts)
+
+
+# Constructor arguments for each policy in names. A scoped parameter
+# (rr:quantum=4) goes to its policy and wins over a bare one (quantum=4),
+# which goes to every policy that takes a parameter of that name.
+def policy_params(names, params):
+    import inspect
+
+    chosen = {name: {} for name in names}
+    # Bare parameters first, so scoped ones overwrite them
+    for policy, name, value in sorted(params, key=lambda param: param[0] is not None):
+        if policy is not None:
+            if policy not in chosen:
+                raise ValueError(f"Parameter {policy}:{name} is for a policy that is not being run")
+            chosen[policy][name] = value
+            continue
+        takers = [taker for taker in names if name in inspect.signature(POLICIES[taker]).parameters]
+        if not takers:
+            raise ValueError(f"None of the policies being run takes a parameter named {name}")
+        for taker in takers:
+            chosen[taker][name] = value
+    return chosen
+
+
+def parse_number(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+@contextlib.contextmanager
+def open_output(path):
+    if path is None or path == "-":
+        yield sys.stdout
+    else:
+        with open(path, "w", newline="") as f:
+            yield f
+
+
+def open_cache(args):
+    # Runs are cached by default; --no-cache bypasses the cache entirely
+    if args.no_cache:
+        return None
+    from .cache import ResultCache
+
+    return ResultCache(args.cache_dir, max_bytes=int(args.cache_size * (1 << 20)))
+
+
+@contextlib.contextmanager
+def instrumented(args):
+    # Record the run's phases and counters when any instrumentation option is given
+    if not (args.timings or args.instrument or args.profile or args.memory):
+        yield None
+        return
+    from .instrument import Recorder
+
+    recorder = Recorder(profile=args.profile, memory=args.memory)
+    with recorder:
+        yield recorder
+    if args.instrument:
+        with open_output(args.instrument) as f:
+            recorder.write(f, args.instrument_format)
+    if args.timings or not args.instrument:
+        print(recorder.format_report(), file=sys.stderr)
+
+
+# Gantt charts go out as text unless the file name asks for an image
+IMAGE_EXTENSIONS = (".png", ".svg", ".pdf")
+
+
+def gantt_is_image(path):
+    return os.path.splitext(path)[1].lower() in IMAGE_EXTENSIONS
+
+
+# One chart per (title, result), stacked in a single figure. The figure is
+# drawn on matplotlib's Agg canvas directly, so no GUI backend is loaded;
+# matplotlib is only imported here, once an image was asked for.
+def write_gantt_image(path, charts, pids):
+    from matplotlib.figure import Figure
+
+    from .plotting import plot_gantt
+
+    figure = Figure(figsize=(10, 1 + 2.5 * len(charts)), layout="constrained")
+    axes = figure.subplots(len(charts), squeeze=False)[:, 0]
+    for ax, (title, result) in zip(axes, charts):
+        plot_gantt(ax, result, pids)
+        ax.set_title(title)
+    axes[-1].set_xlabel("Time")
+    figure.savefig(path)
+
+
+def cmd_cache(args):
+    from .cache import ResultCache
+
+    cache = ResultCache(args.cache_dir)
+    if args.action == "clear":
+        cache.invalidate()
+    entries = cache.entries()
+    print(f"{cache.directory}: {len(entries)} entries, {sum(size for _, size, _ in entries) / (1 << 20):.1f} MiB")
+    return 0
+
+
+def cmd_policies(args):
+    for name in available_policies():
+        print(name)
+    return 0
+
+
+def cmd_run(args):
+    with instrumented(args):
+        return run(args)
+
+
+def run(args):
+    # NumPy-backed I/O is only imported once there is a workload to load
+    from .export import output_format, write_processes, write_segments, write_summaries
+    from .gantt import write_gantt_text
+    from .instrument import phase
+    from .workload import CHUNK_SIZE, load_table
+
+    names = args.policy or ["priority"]
+    params = policy_params(names, args.param)
+    chunk_size = args.chunk_size or CHUNK_SIZE
+    table = load_table(args.trace, args.input_format, chunk_size)
+    if not len(table):
+        print("No processes to schedule.", file=sys.stderr)
+        return 1
+    table.validate()
+
+    cache = open_cache(args)
+    summaries = []
+    with contextlib.ExitStack() as stack:
+        processes = segments = gantt = charts = None
+        if args.gantt and gantt_is_image(args.gantt):
+            charts = []
+        elif args.gantt:
+            gantt = stack.enter_context(open_output(args.gantt))
+            pids = table.pid.tolist()
+        if args.processes:
+            processes = stack.enter_context(open_output(args.processes))
+            processes_format = output_format(args.processes)
+        if args.segments:
+            segments = stack.enter_context(open_output(args.segments))
+            segments_format = output_format(args.segments)
+
+        for index, name in enumerate(names):
+            policy = get_policy(name, **params[name])
+            summary = table.schedule(policy, cpus=args.cpus, migration_cost=args.migration_cost,
+                                     switch_cost=args.switch_cost, dispatch_latency=args.dispatch_latency,
+                                     cache=cache, refresh=args.refresh)
+            summaries.append({"policy": policy.describe(), **summary})
+            if args.by_priority:
+                summaries.extend({"policy": policy.describe(), **row} for row in table.priority_summaries())
+            if processes is not None:
+                # Tag rows with the policy only when several runs share one file
+                with phase("export"):
+                    write_processes(processes, table, policy.describe() if len(names) > 1 else None,
+                                    processes_format, header=index == 0, chunk_size=chunk_size)
+            if segments is not None:
+                with phase("export"):
+                    write_segments(segments, table, policy.describe() if len(names) > 1 else None,
+                                   segments_format, header=index == 0, chunk_size=chunk_size)
+            if gantt is not None:
+                header = f"Gantt Chart ({policy.describe()}):\n" if len(names) > 1 else "Gantt Chart:\n"
+                with phase("render"):
+                    write_gantt_text(gantt, table.result.segments(), lambda job: f"P{pids[job]}", header)
+            if charts is not None:
+                charts.append((policy.describe(), table.result))
+
+        if charts is not None:
+            write_gantt_image(args.gantt, charts, table.pid)
+
+        with phase("export"), open_output(args.output) as out:
+            write_summaries(out, summaries, output_format(args.output or "", args.output_format))
+    return 0
+
+
+def cmd_realtime(args):
+    from .export import output_format, write_summaries
+    from .realtime import load_tasks, simulate_realtime
+
+    tasks = load_tasks(args.tasks)
+    if not tasks:
+        print("No tasks to schedule.", file=sys.stderr)
+        return 1
+    summaries = []
+    for name in args.dispatcher or ["edf"]:
+        result = simulate_realtime(tasks, name, horizon=args.horizon, record=False)
+        summaries.append(result.summary())
+        if args.by_task:
+            summaries.extend({"dispatcher": name, **row} for row in result.task_summaries())
+    with open_output(args.output) as out:
+        write_summaries(out, summaries, output_format(args.output or "", args.output_format))
+    return 0
+
+
+def cmd_convert(args):
+    from .trace import convert
+
+    count = convert(args.source, args.trace, args.input_format, args.chunk_size)
+    print(f"Wrote {count} records to {args.trace}", file=sys.stderr)
+    return 0
+
+
+def parse_sizes(text):
+    # "1e3,1e4,100000" -> [1000, 10000, 100000]
+    return [int(float(part)) for part in text.split(",")]
+
+
+def parse_names(text):
+    return [part for part in text.split(",") if part]
+
+
+def cmd_bench(args):
+    from .bench import IMPLEMENTATIONS, compare, format_result, load_baseline, run_suite, save_baseline
+    from .generators import WORKLOADS
+
+    workloads = args.workloads or sorted(WORKLOADS)
+    policies = args.policies or ["priority"]
+    implementations = args.implementations or list(IMPLEMENTATIONS)
+    for name in policies:
+        if name not in POLICIES:
+            raise ValueError(f"Unknown scheduling policy: {name}")
+
+    results = run_suite(workloads, args.sizes, policies, implementations, args.seed,
+                        isolate=not args.in_process, report=lambda result: print(format_result(result), flush=True))
+    if args.save:
+        save_baseline(args.save, results)
+    if args.compare:
+        regressions = compare(results, load_baseline(args.compare), args.tolerance)
+        for result, old, ratio in regressions:
+            print(f"REGRESSION {format_result(result)} ({ratio:.0%} of baseline {old['jobs_per_sec']:,.0f} jobs/s)")
+        return 1 if regressions else 0
+    return 0
+
+
+def parse_grid(text):
+    # "rr:quantum=1,2,4" -> ("rr", "quantum", [1, 2, 4])
+    policy, sep, assignment = text.partition(":")
+    name, eq, values = assignment.partition("=")
+    if not sep or not eq or not policy or not name:
+        raise argparse.ArgumentTypeError(f"Expected POLICY:NAME=V1,V2,..., got {text!r}")
+    return policy, name, [parse_number(value) for value in values.split(",")]
+
+
+def cmd_sweep(args):
+    from .export import output_format, write_summaries
+    from .sweep import run_sweep
+
+    if args.generate:
+        from .generators import generate
+        table = generate(args.generate, args.size, args.seed)
+    elif args.trace:
+        from .workload import load_table
+        table = load_table(args.trace, args.input_format)
+    else:
+        raise ValueError("Give a workload file or --generate")
+    if not len(table):
+        print("No processes to schedule.", file=sys.stderr)
+        return 1
+    table.validate()
+
+    grids = {}
+    for policy, name, values in args.grid:
+        grids.setdefault(policy, {})[name] = values
+    policies = args.policy or sorted(grids) or ["priority"]
+    for name in policies + list(grids):
+        if name not in POLICIES:
+            raise ValueError(f"Unknown scheduling policy: {name}")
+
+    rows = run_sweep(table, policies, grids, args.shards, args.workers, args.cpus, merge=not args.per_shard,
+                     migration_cost=args.migration_cost, switch_cost=args.switch_cost,
+                     dispatch_latency=args.dispatch_latency)
+    with open_output(args.output) as out:
+        write_summaries(out, rows, output_format(args.output or "", args.output_format))
+    return 0
+
+
+# Cold-start check: time "import scheduler" in fresh interpreters and make
+# sure no plotting, GUI or NumPy module comes along with it
+def cmd_import_budget(args):
+    code = (
+        "import sys, time\n"
+        "t = time.perf_counter()\n"
+        "import scheduler\n"
+        "print(time.perf_counter() - t)\n"
+        f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+
+    timings = []
+    for _ in range(args.repeat):
+        output = subprocess.run([sys.executable, "-c", code], env=env, check=True,
+                                capture_output=True, text=True).stdout.splitlines()
+        timings.append(float(output[0]) * 1000)
+        loaded = output[1].split() if len(output) > 1 else []
+
+    best = min(timings)
+    print(f"import scheduler: {best:.1f} ms (best of {args.repeat}, budget {args.budget:.0f} ms)")
+    if loaded:
+        print(f"heavy modules loaded at import: {', '.join(loaded)}")
+    return 0 if best <= args.budget and not loaded else 1
+
+
+def add_cache_arguments(parser):
+    parser.add_argument("--cache-dir", help="result cache directory (default: $SCHEDULER_CACHE_DIR or ~/.cache/os-scheduler)")
+
+
+def add_cost_arguments(parser):
+    parser.add_argument("--migration-cost", type=float, default=0.0,
+                        help="time a job loses when it resumes on a different CPU (default: 0)")
+    parser.add_argument("--switch-cost", type=float, default=0.0,
+                        help="CPU time charged when a different job is dispatched (default: 0)")
+    parser.add_argument("--dispatch-latency", type=float, default=0.0,
+                        help="CPU time charged on every dispatch (default: 0)")
+
+
+def add_instrument_arguments(parser):
+    parser.add_argument("--timings", action="store_true", help="print phase timings and run counters to stderr")
+    parser.add_argument("--instrument", help="write phase timings and run counters to this file (- for stdout)")
+    parser.add_argument("--instrument-format", choices=("json", "chrome"), default="json",
+                        help="json report or Chrome trace events for chrome://tracing and Perfetto (default: json)")
+    parser.add_argument("--profile", action="store_true", help="also collect cProfile function statistics")
+    parser.add_argument("--memory", action="store_true", help="also trace memory allocations with tracemalloc")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m scheduler", description="CPU scheduling simulator")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="simulate a workload file")
+    run.add_argument("trace", help="workload file with arrival and burst columns (pid and priority optional); - reads stdin")
+    run.add_argument("--input-format", choices=INPUT_FORMATS, help="workload format (default: from the file extension)")
+    run.add_argument("--chunk-size", type=int, help="rows read and written per chunk (default: 65536)")
+    run.add_argument("--policy", action="append", choices=sorted(POLICIES),
+                     help="scheduling policy; repeat to compare several on the same trace")
+    run.add_argument("-p", "--param", action="append", type=parse_param, default=[],
+                     help="policy parameter as [POLICY:]NAME=VALUE, e.g. rr:quantum=4; without POLICY: it goes to "
+                          "every policy that takes it")
+    run.add_argument("--cpus", type=int, default=1, help="simulated CPUs, each with its own run queue (default: 1)")
+    add_cost_arguments(run)
+    run.add_argument("-o", "--output", help="file for the aggregate results (default: stdout)")
+    run.add_argument("--output-format", choices=("csv", "json", "jsonl"), default="csv",
+                     help="aggregate format when it can't be told from the output file name")
+    run.add_argument("--processes", help="also write per-process results to this file (- for stdout)")
+    run.add_argument("--segments", help="also write the run, idle and switch segments to this file (- for stdout)")
+    run.add_argument("--gantt", help="also draw each run's Gantt chart: an image for .png, .svg or .pdf, "
+                                     "otherwise text (- for stdout)")
+    run.add_argument("--by-priority", action="store_true",
+                     help="also report the metric distributions of each priority class")
+    add_cache_arguments(run)
+    run.add_argument("--no-cache", action="store_true", help="always simulate; don't read or write the result cache")
+    run.add_argument("--refresh", action="store_true", help="simulate again and replace any cached result")
+    run.add_argument("--cache-size", type=float, default=512, help="result cache size cap in MiB (default: 512)")
+    add_instrument_arguments(run)
+    run.set_defaults(handler=cmd_run)
+
+    realtime = commands.add_parser("realtime", help="simulate periodic and sporadic real-time tasks")
+    realtime.add_argument("tasks", help="CSV of tasks: period, cost and optionally deadline, phase, max_delay, "
+                                        "name, seed; - reads stdin")
+    realtime.add_argument("--dispatcher", action="append", choices=("edf", "rm"),
+                          help="edf or rm (rate monotonic); repeat to compare both (default: edf)")
+    realtime.add_argument("--horizon", type=float,
+                          help="simulated time (default: latest phase plus one hyperperiod; required for sporadic tasks)")
+    realtime.add_argument("--by-task", action="store_true", help="also report every task's misses and response times")
+    realtime.add_argument("-o", "--output", help="file for the results (default: stdout)")
+    realtime.add_argument("--output-format", choices=("csv", "json", "jsonl"), default="csv",
+                          help="format when it can't be told from the output file name")
+    realtime.set_defaults(handler=cmd_realtime)
+
+    convert = commands.add_parser("convert", help="convert a workload file to the binary trace format")
+    convert.add_argument("source", help="CSV, JSONL or Parquet workload; - reads stdin")
+    convert.add_argument("trace", help="binary trace to write (conventionally *.trace)")
+    convert.add_argument("--input-format", choices=INPUT_FORMATS[:-1], help="source format (default: from the extension)")
+    convert.add_argument("--chunk-size", type=int, help="rows converted per chunk (default: 65536)")
+    convert.set_defaults(handler=cmd_convert)
+
+    cache = commands.add_parser("cache", help="show or clear the result cache")
+    cache.add_argument("action", nargs="?", choices=("info", "clear"), default="info")
+    add_cache_arguments(cache)
+    cache.set_defaults(handler=cmd_cache)
+
+    policies = commands.add_parser("policies", help="list the registered policies")
+    policies.set_defaults(handler=cmd_policies)
+
+    bench = commands.add_parser("bench", help="benchmark the scheduling core on synthetic workloads")
+    bench.add_argument("--sizes", type=parse_sizes, default=[1000, 10000, 100000],
+                       help="comma-separated job counts, e.g. 1e3,1e5,1e7 (default: 1e3,1e4,1e5)")
+    bench.add_argument("--workloads", type=parse_names, help="comma-separated generators (default: all)")
+    bench.add_argument("--policies", type=parse_names, help="comma-separated policies (default: priority)")
+    bench.add_argument("--implementations", type=parse_names, help="object and/or columnar (default: both)")
+    bench.add_argument("--seed", type=int, default=0)
+    bench.add_argument("--save", help="write the results to this JSON baseline")
+    bench.add_argument("--compare", help="fail if throughput regressed against this JSON baseline")
+    bench.add_argument("--tolerance", type=float, default=0.2, help="allowed throughput drop (default: 0.2)")
+    bench.add_argument("--in-process", action="store_true",
+                       help="run every case in this process (faster, but peak RSS is cumulative)")
+    bench.set_defaults(handler=cmd_bench)
+
+    sweep = commands.add_parser("sweep", help="run a grid of policies and parameters across a process pool")
+    sweep.add_argument("trace", nargs="?", help="workload file (or use --generate)")
+    sweep.add_argument("--input-format", choices=INPUT_FORMATS, help="workload format (default: from the file extension)")
+    sweep.add_argument("--generate", help="use a synthetic workload instead, e.g. poisson")
+    sweep.add_argument("--size", type=lambda text: int(float(text)), default=100000, help="jobs to generate")
+    sweep.add_argument("--seed", type=int, default=0)
+    sweep.add_argument("--policy", action="append", choices=sorted(POLICIES),
+                       help="policy to include; repeatable (default: every policy named in a --grid)")
+    sweep.add_argument("--grid", action="append", type=parse_grid, default=[],
+                       help="parameter values for one policy, e.g. rr:quantum=1,2,4; repeatable")
+    sweep.add_argument("--cpus", type=int, default=1, help="simulated CPUs per run (default: 1)")
+    add_cost_arguments(sweep)
+    sweep.add_argument("--shards", type=int, default=1, help="split the trace into this many independent runs")
+    sweep.add_argument("--per-shard", action="store_true", help="report every shard instead of merging them")
+    sweep.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    sweep.add_argument("-o", "--output", help="file for the comparison table (default: stdout)")
+    sweep.add_argument("--output-format", choices=("csv", "json", "jsonl"), default="csv",
+                       help="table format when it can't be told from the output file name")
+    sweep.set_defaults(handler=cmd_sweep)
+
+    budget = commands.add_parser("import-budget", help="check the cold-start import time of the scheduler core")
+    budget.add_argument("--budget", type=float, default=50.0, help="allowed import time in milliseconds")
+    budget.add_argument("--repeat", type=int, default=5, help="fresh interpreters to time")
+    budget.set_defaults(handler=cmd_import_budget)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except BrokenPipeError:
+        # The reader (e.g. head) went away; stop quietly without a second error at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
@@ -0,0 +1,304 @@
+# Processes that alternate CPU and I/O bursts. A process's bursts run
+# CPU, I/O, CPU, ..., CPU; each I/O burst goes to a simulated device with its
+# own servers, queue and service discipline, and while a process waits on a
+# device the CPU runs whatever else is ready. Arrivals, slice ends and I/O
+# completions all go through one event heap; the CPU's ready queue is a
+# regular policy, which sees each CPU burst as the job's burst and the time
+# the process last became ready as its arrival.
+#
+# Single CPU, no switch costs. With one CPU burst per process the run is
+# exactly engine.simulate's.
+import heapq
+from array import array
+
+from .engine import Schedule, arrival_order
+from .policies import get_policy
+from .segments import IDLE, RUN, SegmentLog, new_columns
+
+DISCIPLINES = ("fcfs", "sjf", "priority")
+
+# Event kinds; at equal times slice ends go first, then arrivals, then I/O completions
+SLICE = 0
+ARRIVAL = 1
+IO_DONE = 2
+
+
+# A device with servers identical channels serving one queue. fcfs serves in
+# request order, sjf the shortest I/O burst first, priority the process with
+# the lowest priority number first (request order among equals).
+class Device:
+    def __init__(self, name="io", servers=1, discipline="fcfs"):
+        if servers < 1:
+            raise ValueError("A device needs at least one server.")
+        if discipline not in DISCIPLINES:
+            raise ValueError(f"Unknown service discipline: {discipline}")
+        self.name = name
+        self.servers = servers
+        self.discipline = discipline
+
+    def reset(self, priority):
+        self.priority = priority
+        self.queue = []
+        self.free = self.servers
+        self.requests = 0
+        # Summed over servers: time spent serving, and time requests waited to be served
+        self.busy = 0.0
+        self.waited = 0.0
+        self.max_queue = 0
+
+    def __len__(self):
+        return len(self.queue)
+
+    # Queue an I/O burst; True if a server was free and it starts right away
+    def request(self, job, length, now):
+        self.requests += 1
+        if self.free:
+            self.free -= 1
+            self.busy += length
+            return True
+        if self.discipline == "sjf":
+            key = length
+        elif self.discipline == "priority":
+            key = self.priority[job]
+        else:
+            key = 0
+        heapq.heappush(self.queue, (key, self.requests, job, length, now))
+        if len(self.queue) > self.max_queue:
+            self.max_queue = len(self.queue)
+        return False
+
+    # A server finished; returns the (job, length) it starts next, or None
+    def release(self, now):
+        if not self.queue:
+            self.free += 1
+            return None
+        _, _, job, length, queued_at = heapq.heappop(self.queue)
+        self.waited += now - queued_at
+        self.busy += length
+        return job, length
+
+    def describe(self):
+        return f"{self.name}(servers={self.servers}, discipline={self.discipline})"
+
+
+# A Schedule whose jobs also did I/O. cpu_time and io_time are each process's
+# totals; device_log holds the device busy segments with the device index in
+# its cpu column; serial_finish is when the last process would have finished
+# had each one held the CPU through its own I/O, one after another.
+class IOSchedule(Schedule):
+    def __init__(self, start, finish, order, log, switches, devices, device_log, cpu_time, io_time, serial_finish):
+        super().__init__(start, finish, order, log, switches)
+        self.devices = devices
+        self.device_log = device_log
+        self.cpu_time = cpu_time
+        self.io_time = io_time
+        self.serial_finish = serial_finish
+
+
+# Split a burst sequence into CPU bursts and (device index, length) I/O
+# bursts. An I/O burst is a length (on the first device) or a (device name, length) pair.
+def _parse_bursts(sequence, device_index):
+    if not len(sequence) % 2:
+        raise ValueError("Burst sequences alternate CPU and I/O and must start and end with a CPU burst.")
+    cpu = []
+    io = []
+    for k, burst in enumerate(sequence):
+        if k % 2 == 0:
+            cpu.append(burst)
+            continue
+        if isinstance(burst, (tuple, list)):
+            name, burst = burst
+            try:
+                device = device_index[name]
+            except KeyError:
+                raise ValueError(f"Unknown device: {name}") from None
+        else:
+            device = 0
+        io.append((device, burst))
+    if any(burst < 0 for burst in cpu) or any(length < 0 for _, length in io):
+        raise ValueError("Burst lengths must be non-negative.")
+    return cpu, io
+
+
+# bursts[i] is process i's burst sequence. devices defaults to one fcfs device named "io".
+def simulate_io(arrival, bursts, priority, policy, devices=None):
+    if isinstance(policy, str):
+        policy = get_policy(policy)
+    devices = [Device()] if devices is None else list(devices)
+    device_index = {device.name: k for k, device in enumerate(devices)}
+    n = len(arrival)
+    cpu_bursts = []
+    io_bursts = []
+    for sequence in bursts:
+        cpu, io = _parse_bursts(sequence, device_index)
+        cpu_bursts.append(cpu)
+        io_bursts.append(io)
+    if len(cpu_bursts) != n:
+        raise ValueError("Every process needs a burst sequence.")
+
+    # The policy reads these at admit time; both change as processes move through their bursts
+    ready_at = array('d', arrival)
+    burst = array('d', [cpu[0] for cpu in cpu_bursts])
+    policy.reset(ready_at, burst, priority)
+    for device in devices:
+        device.reset(priority)
+    preemptive = policy.preemptive
+
+    start = array('d', [0.0]) * n
+    finish = array('d', [0.0]) * n
+    dispatched = array('q')
+    log_start, log_end, log_job, log_cpu, log_kind = columns = new_columns()
+    device_columns = new_columns()
+    # Index of each process's current CPU burst
+    step = array('q', [0]) * n
+    remaining = {}
+    events = []
+    sequence = 0
+
+    def push(time, kind, payload):
+        nonlocal sequence
+        heapq.heappush(events, (time, kind, sequence, payload))
+        sequence += 1
+
+    def add(columns, begin, end, job, cpu, kind):
+        columns[0].append(begin)
+        columns[1].append(end)
+        columns[2].append(job)
+        columns[3].append(cpu)
+        columns[4].append(kind)
+
+    def start_io(job, device, length, now):
+        push(now + length, IO_DONE, (device, job))
+        add(device_columns, now, now + length, job, device, RUN)
+
+    order = arrival_order(arrival)
+    cursor = 0
+    if n:
+        push(arrival[order[0]], ARRIVAL, order[0])
+    running = -1
+    last = -1
+    switches = 0
+    token = 0
+    idle_since = 0.0
+    since = left = slice_end = 0.0
+    completes = False
+    while events:
+        now = events[0][0]
+        expired = None
+        woken = False
+        while events and events[0][0] <= now:
+            _, kind, _, payload = heapq.heappop(events)
+            if kind == SLICE:
+                if payload != token:
+                    continue
+                job = running
+                add(columns, since, now, job, 0, RUN)
+                running = -1
+                idle_since = now
+                if not completes:
+                    # Arrivals and I/O completions at this instant queue up ahead of it
+                    expired = (job, left - (now - since))
+                    continue
+                # Done with this CPU burst, whether it goes on to I/O or is finished
+                policy.complete(job, now)
+                io = io_bursts[job]
+                k = step[job]
+                if k < len(io):
+                    device, length = io[k]
+                    if devices[device].request(job, length, now):
+                        start_io(job, device, length, now)
+                else:
+                    finish[job] = now
+            elif kind == ARRIVAL:
+                cursor += 1
+                if cursor < n:
+                    push(arrival[order[cursor]], ARRIVAL, order[cursor])
+                policy.admit(payload, now)
+                woken = True
+            else:
+                device, job = payload
+                following = devices[device].release(now)
+                if following is not None:
+                    start_io(following[0], device, following[1], now)
+                # Back from I/O, ready for the next CPU burst
+                step[job] += 1
+                burst[job] = cpu_bursts[job][step[job]]
+                ready_at[job] = now
+                policy.admit(job, now)
+                woken = True
+
+        if expired is not None:
+            job, rest = expired
+            remaining[job] = rest
+            policy.requeue(job, rest, now, True)
+
+        # Preemptive policies get a say whenever something became ready mid-slice
+        if preemptive and woken and running >= 0 and now < slice_end:
+            rest = left - (now - since) if now > since else left
+            if policy.preempts(running, rest, now):
+                if since < now:
+                    add(columns, since, now, running, 0, RUN)
+                remaining[running] = rest
+                policy.requeue(running, rest, now, False)
+                running = -1
+                token += 1
+                idle_since = now
+
+        if running < 0 and len(policy):
+            running = policy.pop(now)
+            rest = remaining.pop(running, None)
+            if rest is None:
+                rest = burst[running]
+                if step[running] == 0:
+                    start[running] = now
+                    dispatched.append(running)
+            if running != last:
+                if last >= 0:
+                    switches += 1
+                last = running
+            if idle_since < now:
+                add(columns, idle_since, now, -1, 0, IDLE)
+            time_slice = policy.quantum(running)
+            completes = time_slice is None or time_slice >= rest
+            since = now
+            left = rest
+            slice_end = now + (rest if completes else time_slice)
+            token += 1
+            push(slice_end, SLICE, token)
+
+    cpu_time = array('d', (sum(cpu) for cpu in cpu_bursts))
+    io_time = array('d', (sum(length for _, length in io) for io in io_bursts))
+    # No overlap: each process keeps the CPU through its own I/O, in arrival order
+    serial_finish = 0.0
+    for i in order:
+        serial_finish = max(serial_finish, arrival[i]) + cpu_time[i] + io_time[i]
+    return IOSchedule(start, finish, dispatched, SegmentLog(*columns), switches, devices,
+                      SegmentLog(*device_columns), cpu_time, io_time, serial_finish)
+
+
+# Where the time went in an IOSchedule, between the first arrival and the
+# last completion: CPU and per-device utilization (busy time over capacity),
+# throughput, and the gain over running the same processes without overlap.
+def io_summary(result):
+    jobs = len(result.order)
+    if not jobs:
+        return {}
+    begin = min(result.start[i] for i in result.order)
+    end = max(result.finish)
+    elapsed = end - begin
+    serial_elapsed = result.serial_finish - begin
+    summary = {
+        "elapsed": elapsed,
+        "cpu_utilization": result.log.total(RUN) / elapsed if elapsed else 0.0,
+        "throughput": jobs / elapsed if elapsed else 0.0,
+        "serial_elapsed": serial_elapsed,
+        "serial_throughput": jobs / serial_elapsed if serial_elapsed else 0.0,
+        "overlap_gain": serial_elapsed / elapsed if elapsed else 1.0,
+    }
+    for device in result.devices:
+        capacity = elapsed * device.servers
+        summary[f"{device.name}_utilization"] = device.busy / capacity if capacity else 0.0
+        summary[f"{device.name}_requests"] = device.requests
+        summary[f"{device.name}_avg_queue_wait"] = device.waited / device.requests if device.requests else 0.0
+        summary[f"{device.name}_max_queue"] = device.max_queue
+    return summary
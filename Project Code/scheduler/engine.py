@@ -0,0 +1,226 @@
+from array import array
+
+from . import instrument
+from .policies import get_policy
+from .segments import IDLE, RUN, SWITCH, SegmentLog, new_columns
+
+
+# Raised from a progress callback to abandon a run
+class SimulationCancelled(Exception):
+    pass
+
+
+# Outcome of one simulated run. start (first dispatch) and finish are indexed
+# like the input columns; order lists jobs by first dispatch; log is the
+# SegmentLog of run, idle and switch time. switches counts dispatches of a
+# different job than the CPU ran last; a CPU's first dispatch is not a switch.
+class Schedule:
+    def __init__(self, start, finish, order, log, switches=0):
+        self.start = start
+        self.finish = finish
+        self.order = order
+        self.log = log
+        self.switches = switches
+
+    # CPU time spent on switch and dispatch costs rather than on jobs
+    @property
+    def overhead(self):
+        return self.log.total(SWITCH)
+
+    def segments(self):
+        # (start, end, job, kind) for every segment, in timeline order; job is -1 when idle
+        return self.log.segments()
+
+
+def arrival_order(arrival):
+    # Traces are usually replayed already sorted, so skip the sort (and its index list) when we can
+    n = len(arrival)
+    for i in range(1, n):
+        if arrival[i] < arrival[i - 1]:
+            return array('q', sorted(range(n), key=arrival.__getitem__))
+    return range(n)
+
+
+# Discrete-event loop shared by every policy. An arrival cursor walks the
+# arrival-sorted indices; the policy's ready queue decides who runs next.
+# Events are arrivals, completions and quantum expiries. Callers that already
+# hold the arrival order (e.g. from a NumPy argsort) can pass it in; only the
+# jobs listed in order are simulated, so a subset can be replayed on its own.
+#
+# progress, if given, is called as progress(done, total, jobs, start, finish)
+# after every progress_every completions (and once at the end), where jobs
+# holds the indices completed since the previous call. It may raise
+# SimulationCancelled to stop the run.
+#
+# While an instrument observer is registered, sorting and the run are timed
+# as the "sort" and "dispatch" phases and the run's ready-queue counters are
+# reported; otherwise the loop runs exactly as it would without the hooks.
+#
+# idle, if given, is called as idle(cursor, now) whenever the CPU has nothing
+# left to run and the job at order[cursor] has not arrived yet. Nothing before
+# such a point depends on anything after it; returning True ends the run there.
+#
+# dispatch_latency is charged on every dispatch, the CPU's first (cold) one
+# included, and switch_cost on top of it only on a job-to-job change: when
+# the CPU last ran some other job, with or without idle time since. Both keep
+# the CPU busy without the job making progress: they are logged as a switch
+# segment ahead of the slice's run segment, and a preemption arriving before
+# they are paid off wastes what was spent.
+def simulate(arrival, burst, priority, policy, order=None, progress=None, progress_every=1024, idle=None,
+             switch_cost=0.0, dispatch_latency=0.0):
+    if isinstance(policy, str):
+        policy = get_policy(policy)
+    if switch_cost < 0 or dispatch_latency < 0:
+        raise ValueError("Switch cost and dispatch latency must be non-negative.")
+    if order is None:
+        with instrument.phase("sort"):
+            order = arrival_order(arrival)
+    options = (order, progress, progress_every, idle, switch_cost, dispatch_latency)
+    if not instrument.observers:
+        return _simulate(arrival, burst, priority, policy, *options)
+    counts = instrument.new_counts()
+    with instrument.phase("dispatch"):
+        result = _simulate(arrival, burst, priority, instrument.CountingPolicy(policy, counts), *options)
+    instrument.count("dispatch", instrument.finish_counts(counts, result.log.count(RUN)))
+    return result
+
+
+def _simulate(arrival, burst, priority, policy, order, progress, progress_every, idle, switch_cost, dispatch_latency):
+    n = len(arrival)
+    jobs = len(order)
+    policy.reset(arrival, burst, priority)
+    admit = policy.admit
+    complete = policy.complete
+    preemptive = policy.preemptive
+
+    start = array('d', [0.0]) * n
+    finish = array('d', [0.0]) * n
+    dispatched = array('q')
+    # The segment log; every segment is on CPU 0, so that column is filled in at the end
+    log_start, log_end, log_job, log_cpu, log_kind = columns = new_columns()
+    add_start = log_start.append
+    add_end = log_end.append
+    add_job = log_job.append
+    add_kind = log_kind.append
+
+    # Completions not yet reported to progress
+    completed = array('q')
+    done = 0
+
+    # Remaining burst is only kept for jobs that left the CPU unfinished
+    remaining = {}
+    cursor = 0
+    current_time = 0
+    running = -1
+    last = -1
+    switches = 0
+    while True:
+        if running < 0:
+            # Admit everything that has arrived by now
+            while cursor < jobs and arrival[order[cursor]] <= current_time:
+                admit(order[cursor], current_time)
+                cursor += 1
+            if not len(policy):
+                if cursor >= jobs:
+                    break
+                if idle is not None and idle(cursor, current_time):
+                    break
+                # CPU is idle: jump straight to the next arrival
+                add_start(current_time)
+                current_time = arrival[order[cursor]]
+                add_end(current_time)
+                add_job(-1)
+                add_kind(IDLE)
+                continue
+
+            running = policy.pop(current_time)
+            left = remaining.pop(running, None)
+            if left is None:
+                left = burst[running]
+                start[running] = current_time
+                dispatched.append(running)
+            # The job makes progress from since on, once the dispatch (and switch) is paid for
+            cost = dispatch_latency
+            if running != last:
+                if last >= 0:
+                    switches += 1
+                    cost += switch_cost
+                last = running
+            dispatched_at = current_time
+            since = current_time + cost
+            time_slice = policy.quantum(running)
+            completes = time_slice is None or time_slice >= left
+            slice_end = since + (left if completes else time_slice)
+
+        # Preemptive policies get a say at every arrival before the slice ends
+        if preemptive and cursor < jobs and arrival[order[cursor]] < slice_end:
+            current_time = arrival[order[cursor]]
+            while cursor < jobs and arrival[order[cursor]] <= current_time:
+                admit(order[cursor], current_time)
+                cursor += 1
+            now_left = left - (current_time - since) if current_time > since else left
+            if policy.preempts(running, now_left, current_time):
+                if cost:
+                    # What was paid for the dispatch; preempted before it was paid off, only part was spent
+                    add_start(dispatched_at)
+                    add_end(since if since < current_time else current_time)
+                    add_job(running)
+                    add_kind(SWITCH)
+                if since < current_time:
+                    add_start(since)
+                    add_end(current_time)
+                    add_job(running)
+                    add_kind(RUN)
+                remaining[running] = now_left
+                policy.requeue(running, now_left, current_time, False)
+                running = -1
+            continue
+
+        current_time = slice_end
+        if cost:
+            add_start(dispatched_at)
+            add_end(since)
+            add_job(running)
+            add_kind(SWITCH)
+        add_start(since)
+        add_end(current_time)
+        add_job(running)
+        add_kind(RUN)
+        if completes:
+            finish[running] = current_time
+            complete(running, current_time)
+            if progress is not None:
+                done += 1
+                completed.append(running)
+                if len(completed) >= progress_every:
+                    progress(done, jobs, completed, start, finish)
+                    completed = array('q')
+        else:
+            # Arrivals during the slice queue up ahead of the expired job
+            while cursor < jobs and arrival[order[cursor]] <= current_time:
+                admit(order[cursor], current_time)
+                cursor += 1
+            now_left = left - (current_time - since)
+            remaining[running] = now_left
+            policy.requeue(running, now_left, current_time, True)
+        running = -1
+
+    if progress is not None:
+        progress(done, jobs, completed, start, finish)
+    log_cpu.frombytes(bytes(log_cpu.itemsize * len(log_start)))
+    return Schedule(start, finish, dispatched, SegmentLog(*columns), switches)
+
+
+# Non-preemptive priority (lower number runs first)
+def simulate_priority(arrival, burst, priority):
+    return simulate(arrival, burst, priority, get_policy("priority"))
+
+
+# Preemptive priority: a better-priority arrival takes the CPU
+def simulate_preemptive_priority(arrival, burst, priority):
+    return simulate(arrival, burst, priority, get_policy("preemptive-priority"))
+
+
+# Shortest remaining time first
+def simulate_srtf(arrival, burst):
+    return simulate(arrival, burst, None, get_policy("srtf"))
@@ -0,0 +1,100 @@
+import csv
+import json
+import os
+
+import numpy as np
+
+from .segments import KINDS
+
+PROCESS_FIELDS = ("pid", "priority", "arrival", "burst", "finish",
+                  "waiting_time", "turnaround_time", "response_time")
+SEGMENT_FIELDS = ("start", "end", "pid", "cpu", "kind")
+CHUNK_SIZE = 1 << 16
+
+
+def output_format(path, default="csv"):
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if ext == ".json":
+        return "json"
+    if ext == ".csv":
+        return "csv"
+    return default
+
+
+def _csv_field(text):
+    if any(c in text for c in ',"\n'):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def _columns(table):
+    return (table.pid, table.priority, table.arrival, table.burst, table.finish,
+            table.waiting, table.turnaround, table.response)
+
+
+# Write one row per process, a chunk at a time; policy (if given) becomes the first column
+def write_processes(f, table, policy=None, fmt="csv", header=True, chunk_size=CHUNK_SIZE):
+    fields = PROCESS_FIELDS if policy is None else ("policy",) + PROCESS_FIELDS
+    columns = _columns(table)
+    if fmt == "csv":
+        if header:
+            f.write(",".join(fields) + "\n")
+        row_format = "%d,%d" + ",%.6f" * 6
+        if policy is not None:
+            row_format = _csv_field(policy).replace("%", "%%") + "," + row_format
+        for lo in range(0, len(table), chunk_size):
+            block = np.column_stack([column[lo:lo + chunk_size] for column in columns])
+            np.savetxt(f, block, fmt=row_format)
+    elif fmt == "jsonl":
+        for lo in range(0, len(table), chunk_size):
+            rows = zip(*(column[lo:lo + chunk_size].tolist() for column in columns))
+            prefix = {} if policy is None else {"policy": policy}
+            f.writelines(json.dumps({**prefix, **dict(zip(PROCESS_FIELDS, row))}) + "\n" for row in rows)
+    else:
+        raise ValueError(f"Unknown output format: {fmt}")
+
+
+# Write the segment log of the table's last run, a chunk at a time: one row per
+# run, idle or switch segment, with the pid of its job (-1 when idle)
+def write_segments(f, table, policy=None, fmt="csv", header=True, chunk_size=CHUNK_SIZE):
+    fields = SEGMENT_FIELDS if policy is None else ("policy",) + SEGMENT_FIELDS
+    log = table.result.log
+    columns = (np.frombuffer(log.start, dtype=np.float64), np.frombuffer(log.end, dtype=np.float64),
+               np.frombuffer(log.job, dtype=np.int32), np.frombuffer(log.cpu, dtype=np.int16),
+               np.frombuffer(log.kind, dtype=np.int8))
+    kinds = np.array(KINDS)
+    if fmt == "csv" and header:
+        f.write(",".join(fields) + "\n")
+    elif fmt not in ("csv", "jsonl"):
+        raise ValueError(f"Unknown output format: {fmt}")
+    prefix = "" if policy is None else _csv_field(policy) + ","
+    for lo in range(0, len(log), chunk_size):
+        start, end, job, cpu, kind = (column[lo:lo + chunk_size] for column in columns)
+        pid = np.where(job >= 0, table.pid[np.maximum(job, 0)], -1)
+        rows = zip(start.tolist(), end.tolist(), pid.tolist(), cpu.tolist(), kinds[kind].tolist())
+        if fmt == "csv":
+            f.writelines(f"{prefix}{row[0]:.6f},{row[1]:.6f},{row[2]},{row[3]},{row[4]}\n" for row in rows)
+        else:
+            extra = {} if policy is None else {"policy": policy}
+            f.writelines(json.dumps({**extra, **dict(zip(SEGMENT_FIELDS, row))}) + "\n" for row in rows)
+
+
+# Write the per-policy aggregate rows collected by a run
+def write_summaries(f, summaries, fmt="csv"):
+    if fmt == "json":
+        json.dump(summaries, f, indent=2)
+        f.write("\n")
+    elif fmt == "jsonl":
+        for summary in summaries:
+            f.write(json.dumps(summary) + "\n")
+    elif fmt == "csv":
+        fields = []
+        for summary in summaries:
+            fields.extend(key for key in summary if key not in fields)
+        writer = csv.DictWriter(f, fields, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(summaries)
+    else:
+        raise ValueError(f"Unknown output format: {fmt}")
@@ -0,0 +1,42 @@
+# Text Gantt charts, built as a stream of lines so the whole chart never has
+# to exist as one growing string. Pure Python; the plotting side is in
+# scheduler.plotting.
+from .instrument import phase
+from .segments import IDLE, SWITCH
+
+
+# Coalesce back-to-back stretches of the same job and kind (e.g. RR slices with nobody else queued)
+def merged_segments(segments):
+    segments = iter(segments)
+    current = next(segments, None)
+    if current is None:
+        return
+    start, end, job, kind = current
+    for next_start, next_end, next_job, next_kind in segments:
+        if next_job == job and next_kind == kind and next_start == end:
+            end = next_end
+            continue
+        yield start, end, job, kind
+        start, end, job, kind = next_start, next_end, next_job, next_kind
+    yield start, end, job, kind
+
+
+# segments are (start, end, job, kind) as a Schedule's segments() gives them
+def gantt_lines(segments, label=str):
+    for start, end, job, kind in merged_segments(segments):
+        if kind == IDLE:
+            yield f"Idle [{start:.1f} - {end:.1f}]\n"
+        elif kind == SWITCH:
+            yield f"Switch to {label(job)} [{start:.1f} - {end:.1f}]\n"
+        else:
+            yield f"{label(job)} [{start:.1f} - {end:.1f}]\n"
+
+
+def write_gantt_text(f, segments, label=str, header="Gantt Chart:\n"):
+    f.write(header)
+    f.writelines(gantt_lines(segments, label))
+
+
+def gantt_text(segments, label=str, header="Gantt Chart:\n"):
+    with phase("render"):
+        return header + "".join(gantt_lines(segments, label))
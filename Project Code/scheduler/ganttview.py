@@ -0,0 +1,169 @@
+# Interactive Gantt chart for embedding in a GUI canvas. Segments go into a
+# level-of-detail pyramid once; every pan or zoom then asks it for just the
+# visible window at roughly pixel resolution and swaps the vertices of three
+# PolyCollections (run, switch and idle time), so a redraw costs the same for a hundred segments or
+# millions of them.
+import numpy as np
+from matplotlib.collections import PolyCollection
+
+from .instrument import phase
+from .plotting import (IDLE_COLOR, MAX_LABELLED_LANES, SWITCH_COLOR, bar_vertices, busy_colors, clip, coalesce,
+                       gantt_lanes, set_lane_ticks)
+
+# Each pyramid level merges gaps FACTOR times wider than the level below
+FACTOR = 4
+# Stop adding levels once one has no more segments than this
+MIN_LEVEL_SIZE = 4096
+ZOOM_STEP = 1.25
+
+
+# Intervals per lane at several resolutions. Level 0 is exact (only back-to-back
+# stretches of one job joined); level k merges gaps up to resolution[k]. Every
+# level is sorted by (lane, start) with no overlaps inside a lane, so a lane's
+# visible stretch is one binary search on end and one on start.
+class IntervalPyramid:
+    def __init__(self, start, end, lane, job, span):
+        level = coalesce(start, end, lane, job)
+        self.levels = [level]
+        self.resolutions = [0.0]
+        resolution = span / (1 << 20) if span > 0 else 1.0
+        while len(level[0]) > MIN_LEVEL_SIZE and resolution < span:
+            coarser = coalesce(*level, gap=resolution, same_job=False)
+            # Levels that barely shrink aren't worth their memory
+            if len(coarser[0]) < 0.8 * len(level[0]):
+                level = coarser
+                self.levels.append(level)
+                self.resolutions.append(resolution)
+            resolution *= FACTOR
+        self.bounds = [self._lane_bounds(level[2]) for level in self.levels]
+
+    @staticmethod
+    def _lane_bounds(lane):
+        # (lane, lo, hi) for each lane's run of rows
+        if not len(lane):
+            return []
+        edges = np.flatnonzero(np.diff(lane)) + 1
+        los = np.r_[0, edges]
+        his = np.r_[edges, len(lane)]
+        return list(zip(lane[los].tolist(), los.tolist(), his.tolist()))
+
+    # Segments overlapping [t0, t1], clipped, with gaps below resolution merged
+    def query(self, t0, t1, resolution):
+        k = max(np.searchsorted(self.resolutions, resolution, side="right") - 1, 0)
+        level = self.levels[k]
+        start, end = level[0], level[1]
+        pieces = []
+        for _, lo, hi in self.bounds[k]:
+            i0 = lo + np.searchsorted(end[lo:hi], t0, side="right")
+            i1 = lo + np.searchsorted(start[lo:hi], t1, side="left")
+            if i1 > i0:
+                pieces.append(slice(i0, i1))
+        if not pieces:
+            return tuple(column[:0] for column in level)
+        visible = clip(*(np.concatenate([column[piece] for piece in pieces]) for column in level), t0, t1)
+        return coalesce(*visible, gap=resolution, same_job=False)
+
+
+# Drives one Axes: builds the pyramids for a Schedule and redraws the visible
+# window whenever the x range changes, whether from the mouse (wheel zooms
+# around the pointer, left-drag pans), the navigation toolbar or a resize.
+class InteractiveGantt:
+    def __init__(self, ax, result, pids=None, color="skyblue", lanes=None):
+        self.ax = ax
+        if lanes is None:
+            lanes = "process" if len(result.start) <= MAX_LABELLED_LANES else "cpu"
+        self.lanes = lanes
+        self.color = color
+        (start, end, lane, job), switch, idle, labels = gantt_lanes(result, pids, lanes)
+        self.extent = (0.0, float(end.max()) if len(end) else 1.0)
+        span = self.extent[1] - self.extent[0]
+        self.busy_index = IntervalPyramid(start, end, lane, job, span)
+        self.switch_index = IntervalPyramid(*switch, switch[2], span)
+        self.idle_index = IntervalPyramid(*idle, idle[2], span)
+
+        self.idle = PolyCollection([], facecolors=IDLE_COLOR, edgecolors="none")
+        self.busy = PolyCollection([], edgecolors="none")
+        self.switch = PolyCollection([], facecolors=SWITCH_COLOR, edgecolors="none")
+        ax.add_collection(self.idle)
+        ax.add_collection(self.busy)
+        ax.add_collection(self.switch)
+        set_lane_ticks(ax, labels)
+        ax.set_xlabel("Time")
+
+        self.drag = None
+        self._updating = False
+        canvas = ax.figure.canvas
+        self.connections = [
+            canvas.mpl_connect("scroll_event", self.on_scroll),
+            canvas.mpl_connect("button_press_event", self.on_press),
+            canvas.mpl_connect("motion_notify_event", self.on_motion),
+            canvas.mpl_connect("button_release_event", self.on_release),
+            canvas.mpl_connect("resize_event", lambda event: self.refresh()),
+        ]
+        ax.callbacks.connect("xlim_changed", lambda ax: self.refresh())
+        self.show(*self.extent)
+
+    def pixels(self):
+        return max(self.ax.bbox.width, 1.0)
+
+    # Make [t0, t1] the visible window and queue a redraw
+    def show(self, t0, t1):
+        self._updating = True
+        try:
+            self.ax.set_xlim(t0, t1)
+        finally:
+            self._updating = False
+        self.update(t0, t1)
+        self.ax.figure.canvas.draw_idle()
+
+    def refresh(self):
+        if not self._updating:
+            self.update(*self.ax.get_xlim())
+
+    def update(self, t0, t1):
+        with phase("render"):
+            resolution = (t1 - t0) / self.pixels()
+            start, end, lane, job = self.busy_index.query(t0, t1, resolution)
+            self.busy.set_verts(bar_vertices(start, end, lane))
+            self.busy.set_facecolor(busy_colors(job, self.lanes, self.color))
+            switch_start, switch_end, switch_lane, _ = self.switch_index.query(t0, t1, resolution)
+            self.switch.set_verts(bar_vertices(switch_start, switch_end, switch_lane))
+            idle_start, idle_end, idle_lane, _ = self.idle_index.query(t0, t1, resolution)
+            self.idle.set_verts(bar_vertices(idle_start, idle_end, idle_lane))
+
+    def reset(self):
+        self.show(*self.extent)
+
+    def on_scroll(self, event):
+        if event.inaxes is not self.ax or event.xdata is None:
+            return
+        t0, t1 = self.ax.get_xlim()
+        scale = 1 / ZOOM_STEP if event.button == "up" else ZOOM_STEP
+        x = event.xdata
+        self.show(x - (x - t0) * scale, x + (t1 - x) * scale)
+
+    def _toolbar_active(self):
+        toolbar = self.ax.figure.canvas.toolbar
+        return toolbar is not None and bool(toolbar.mode)
+
+    def on_press(self, event):
+        if event.inaxes is not self.ax or event.button != 1 or self._toolbar_active():
+            return
+        if event.dblclick:
+            self.reset()
+            return
+        self.drag = (event.x, self.ax.get_xlim())
+
+    def on_motion(self, event):
+        if self.drag is None or event.x is None:
+            return
+        x, (t0, t1) = self.drag
+        shift = (x - event.x) * (t1 - t0) / self.pixels()
+        self.show(t0 + shift, t1 + shift)
+
+    def on_release(self, event):
+        self.drag = None
+
+    def disconnect(self):
+        for cid in self.connections:
+            self.ax.figure.canvas.mpl_disconnect(cid)
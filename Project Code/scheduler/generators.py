@@ -0,0 +1,73 @@
+# Seeded synthetic workloads for benchmarks and sweeps. Every generator takes
+# (n, seed) and returns a ProcessTable with pids 1..n; the same seed always
+# gives the same trace. Offered load is kept just under 1 (mean burst 0.9 per
+# unit of mean inter-arrival time) so ready queues actually build up.
+import numpy as np
+
+from .table import ProcessTable
+
+LOAD = 0.9
+PRIORITY_LEVELS = 10
+
+
+def _table(arrival, burst, priority):
+    n = len(arrival)
+    return ProcessTable(np.arange(1, n + 1), priority, arrival, burst)
+
+
+# Poisson arrivals (exponential gaps, rate 1), exponential bursts, uniform priorities
+def poisson(n, seed=0):
+    rng = np.random.default_rng(seed)
+    arrival = np.cumsum(rng.exponential(1.0, n))
+    burst = rng.exponential(LOAD, n)
+    return _table(arrival, burst, rng.integers(0, PRIORITY_LEVELS, n))
+
+
+# Poisson arrivals with Pareto (shape 1.5) bursts: most jobs are tiny, a few are huge
+def heavy_tailed(n, seed=0, shape=1.5):
+    rng = np.random.default_rng(seed)
+    arrival = np.cumsum(rng.exponential(1.0, n))
+    scale = LOAD * (shape - 1) / shape
+    burst = (rng.pareto(shape, n) + 1) * scale
+    return _table(arrival, burst, rng.integers(0, PRIORITY_LEVELS, n))
+
+
+# Two job classes: 20% short interactive jobs at priority 0-1, 80% long batch
+# jobs at priority 8-9, with the mix keeping the overall load at LOAD
+def bimodal(n, seed=0, interactive=0.2):
+    rng = np.random.default_rng(seed)
+    arrival = np.cumsum(rng.exponential(1.0, n))
+    is_interactive = rng.random(n) < interactive
+    short = LOAD * 0.1
+    long = (LOAD - interactive * short) / (1 - interactive)
+    burst = rng.exponential(np.where(is_interactive, short, long))
+    priority = np.where(is_interactive, rng.integers(0, 2, n), rng.integers(PRIORITY_LEVELS - 2, PRIORITY_LEVELS, n))
+    return _table(arrival, burst, priority)
+
+
+# On/off source: arrivals come five times faster than average while "on", and
+# with probability switch a gap also contains an "off" period long enough to
+# bring the mean rate back to 1
+def bursty(n, seed=0, speedup=5.0, switch=0.05):
+    rng = np.random.default_rng(seed)
+    on_gap = 1.0 / speedup
+    off_mean = (1.0 - on_gap) / switch
+    gaps = rng.exponential(on_gap, n) + (rng.random(n) < switch) * rng.exponential(off_mean, n)
+    arrival = np.cumsum(gaps)
+    burst = rng.exponential(LOAD, n)
+    return _table(arrival, burst, rng.integers(0, PRIORITY_LEVELS, n))
+
+
+WORKLOADS = {
+    "poisson": poisson,
+    "heavy-tailed": heavy_tailed,
+    "bimodal": bimodal,
+    "bursty": bursty,
+}
+
+
+def generate(name, n, seed=0):
+    try:
+        return WORKLOADS[name](n, seed)
+    except KeyError:
+        raise ValueError(f"Unknown workload generator: {name}") from None
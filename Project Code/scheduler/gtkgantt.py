@@ -0,0 +1,27 @@
+import gi
+
+gi.require_version("Gtk", "4.0")
+from gi.repository import Gtk
+from matplotlib.backends.backend_gtk4 import NavigationToolbar2GTK4
+from matplotlib.backends.backend_gtk4agg import FigureCanvasGTK4Agg
+from matplotlib.figure import Figure
+
+from .ganttview import InteractiveGantt
+
+
+# Zoomable Gantt chart as a GTK 4 widget: the figure canvas with its toolbar
+# underneath. Wheel zooms, drag pans, double-click resets.
+class GanttView(Gtk.Box):
+    def __init__(self, result, pids=None, color="skyblue", title="Gantt Chart"):
+        super().__init__(orientation=Gtk.Orientation.VERTICAL)
+
+        self.figure = Figure(figsize=(8, 4), layout="constrained")
+        self.canvas = FigureCanvasGTK4Agg(self.figure)
+        self.canvas.set_hexpand(True)
+        self.canvas.set_vexpand(True)
+        self.append(self.canvas)
+        self.append(NavigationToolbar2GTK4(self.canvas))
+
+        ax = self.figure.add_subplot()
+        ax.set_title(title)
+        self.gantt = InteractiveGantt(ax, result, pids, color)
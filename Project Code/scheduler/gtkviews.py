@@ -0,0 +1,86 @@
+import gi
+
+gi.require_version("Gtk", "4.0")
+from gi.repository import Gio, GObject, Gtk
+
+from .views import RESULT_COLUMNS, format_cell, format_summary, sorted_order
+
+
+# A row handle created on demand; it only carries the row's index into the table
+class ResultRow(GObject.Object):
+    def __init__(self, index):
+        super().__init__()
+        self.index = index
+
+
+# Lazy Gio.ListModel over a ProcessTable. No per-row objects are stored: the
+# ColumnView asks for the rows it is about to show and gets fresh handles.
+class ResultsModel(GObject.Object, Gio.ListModel):
+    def __init__(self, table):
+        super().__init__()
+        self.table = table
+        self.order = None
+
+    def do_get_item_type(self):
+        return ResultRow.__gtype__
+
+    def do_get_n_items(self):
+        return len(self.table)
+
+    def do_get_item(self, position):
+        if position >= len(self.table):
+            return None
+        return ResultRow(position if self.order is None else int(self.order[position]))
+
+    def sort_by(self, key, descending=False):
+        self.order = sorted_order(self.table, key, descending)
+        n = len(self.table)
+        self.items_changed(0, n, n)
+
+
+# Results view: sort controls, a virtualized ColumnView and the aggregates below it
+class ResultsView(Gtk.Box):
+    def __init__(self):
+        super().__init__(orientation=Gtk.Orientation.VERTICAL, spacing=6)
+        self.model = None
+
+        sort_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
+        sort_box.append(Gtk.Label(label="Sort by"))
+        self.dropdown_sort = Gtk.DropDown.new_from_strings([title for _, title in RESULT_COLUMNS])
+        self.dropdown_sort.connect("notify::selected", self.on_sort_changed)
+        sort_box.append(self.dropdown_sort)
+        self.check_descending = Gtk.CheckButton(label="Descending")
+        self.check_descending.connect("toggled", self.on_sort_changed)
+        sort_box.append(self.check_descending)
+        self.append(sort_box)
+
+        self.column_view = Gtk.ColumnView()
+        for key, title in RESULT_COLUMNS:
+            factory = Gtk.SignalListItemFactory()
+            factory.connect("setup", self.on_setup)
+            factory.connect("bind", self.on_bind, key)
+            self.column_view.append_column(Gtk.ColumnViewColumn(title=title, factory=factory))
+        scrolled = Gtk.ScrolledWindow()
+        scrolled.set_child(self.column_view)
+        scrolled.set_vexpand(True)
+        self.append(scrolled)
+
+        self.label_summary = Gtk.Label(xalign=0)
+        self.append(self.label_summary)
+
+    def set_table(self, table, summary=None):
+        self.model = ResultsModel(table)
+        self.column_view.set_model(Gtk.NoSelection.new(self.model))
+        self.label_summary.set_text(format_summary(summary or table.summary()))
+
+    def on_setup(self, factory, list_item):
+        list_item.set_child(Gtk.Label(xalign=1))
+
+    def on_bind(self, factory, list_item, key):
+        index = list_item.get_item().index
+        list_item.get_child().set_text(format_cell(key, getattr(self.model.table, key)[index]))
+
+    def on_sort_changed(self, *args):
+        if self.model is not None:
+            key = RESULT_COLUMNS[self.dropdown_sort.get_selected()][0]
+            self.model.sort_by(key, self.check_descending.get_active())
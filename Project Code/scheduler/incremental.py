@@ -0,0 +1,177 @@
+# What-if editing of a single-CPU schedule. The timeline falls apart into busy
+# periods, separated by moments when the CPU is idle with nothing queued. Those
+# moments are free checkpoints: the schedule after one does not depend on
+# anything before it. An edit therefore re-simulates from the start of the busy
+# period it lands in and stops as soon as the new run goes idle right where an
+# old busy period began after the edit; from there on the old schedule stands.
+#
+# An edit therefore costs as much as simulating its busy period, which is only
+# cheap while the CPU idles now and then. A saturated trace is one busy
+# period, and every edit re-simulates it from the first job: no faster than a
+# fresh run. On top of that each edit allocates and shifts O(n) arrays, which
+# is a few milliseconds per million jobs.
+import bisect
+from array import array
+from itertools import compress
+
+from .engine import Schedule, simulate
+from .policies import Policy, get_policy
+from .segments import RUN, SegmentLog
+
+NAN = float("nan")
+
+
+class IncrementalScheduler:
+    def __init__(self, policy="priority", **params):
+        if not isinstance(policy, Policy):
+            policy = get_policy(policy, **params)
+        self.policy = policy
+        self.load([], [], [])
+
+    # Replace the workload and schedule it from scratch; jobs are numbered 0..n-1
+    def load(self, arrival, burst, priority=None):
+        n = len(arrival)
+        self.arrival = array('d', arrival)
+        self.burst = array('d', burst)
+        self.priority = array('q', priority) if priority is not None else array('q', [0]) * n
+        self.alive = bytearray(b"\x01") * n
+        self.start = array('d', [NAN]) * n
+        self.finish = array('d', [NAN]) * n
+        # Live jobs by (arrival, index), the same order a stable sort gives the engine
+        self.order = array('q', sorted(range(n), key=self._key))
+        self.dispatched = array('q')
+        # Only the run segments are kept; the idle gaps between them are filled in by result
+        self.run_start = array('d')
+        self.run_end = array('d')
+        self.run_job = array('q')
+        # First job of every busy period and its arrival, in time order
+        self.period_job = array('q')
+        self.period_time = array('d')
+        self._resimulate(0, 0, 0, None)
+
+    def _key(self, i):
+        return (self.arrival[i], i)
+
+    def __len__(self):
+        return len(self.order)
+
+    # Add a job and return its index
+    def insert(self, arrival, burst, priority=0):
+        if burst <= 0:
+            raise ValueError("Burst time must be positive.")
+        i = len(self.arrival)
+        self.arrival.append(arrival)
+        self.burst.append(burst)
+        self.priority.append(priority)
+        self.alive.append(1)
+        self.start.append(NAN)
+        self.finish.append(NAN)
+        self._edit(i, None, lambda: self._link(i), 1)
+        return i
+
+    def delete(self, i):
+        self._check(i)
+
+        def unlink():
+            self._unlink(i)
+            self.alive[i] = 0
+            self.start[i] = self.finish[i] = NAN
+
+        self._edit(i, self._key(i), unlink, -1)
+
+    # Change any of a job's fields in place
+    def modify(self, i, arrival=None, burst=None, priority=None):
+        self._check(i)
+        if burst is not None and burst <= 0:
+            raise ValueError("Burst time must be positive.")
+
+        def change():
+            self._unlink(i)
+            if arrival is not None:
+                self.arrival[i] = arrival
+            if burst is not None:
+                self.burst[i] = burst
+            if priority is not None:
+                self.priority[i] = priority
+            self._link(i)
+
+        self._edit(i, self._key(i), change, 0)
+
+    def _check(self, i):
+        if not (0 <= i < len(self.alive) and self.alive[i]):
+            raise KeyError(f"No job {i}")
+
+    def _link(self, i):
+        self.order.insert(bisect.bisect_left(self.order, self._key(i), key=self._key), i)
+
+    def _unlink(self, i):
+        del self.order[bisect.bisect_left(self.order, self._key(i), key=self._key)]
+
+    def _edit(self, i, old_key, mutate, delta):
+        # The busy period the edit lands in: the last one starting no later than the job (before or after)
+        keys = [old_key] if old_key is not None else []
+        mutate()
+        if self.alive[i]:
+            keys.append(self._key(i))
+        p = max(bisect.bisect_right(self.period_time, min(keys)[0]) - 1, 0)
+        boundary = min(keys)
+        if p < len(self.period_job):
+            boundary = min(boundary, (self.period_time[p], self.period_job[p]))
+        cursor = bisect.bisect_left(self.order, boundary, key=self._key)
+        self._resimulate(p, cursor, delta, max(keys))
+
+    # Simulate order[cursor:], which starts busy period p. delta is how many
+    # more jobs the new run covers than the old one did, and stable_key the
+    # (arrival, index) after which every job is unchanged; once the run idles
+    # just before such a job that also opened an old busy period, it stops.
+    def _resimulate(self, p, cursor, delta, stable_key):
+        arrival = self.arrival
+        jobs = self.order[cursor:]
+        periods = [jobs[0]] if jobs else []
+        resync = None
+
+        def idle(c, now):
+            nonlocal resync
+            j = jobs[c]
+            if stable_key is not None and (arrival[j], j) > stable_key:
+                k = bisect.bisect_left(self.period_time, arrival[j], lo=p)
+                if k < len(self.period_job) and self.period_job[k] == j:
+                    resync = (c, k)
+                    return True
+            if c:
+                periods.append(j)
+            return False
+
+        result = simulate(arrival, self.burst, self.priority, self.policy, order=jobs, idle=idle)
+        count, q = resync if resync is not None else (len(jobs), len(self.period_job))
+
+        # Splice the new stretch of timeline over the old one
+        seg_lo = bisect.bisect_left(self.run_start, self.period_time[p]) if p < len(self.period_time) else 0
+        seg_hi = bisect.bisect_left(self.run_start, self.period_time[q]) if q < len(self.period_time) else len(
+            self.run_start)
+        log = result.log
+        ran = [kind == RUN for kind in log.kind]
+        self.run_start[seg_lo:seg_hi] = array('d', compress(log.start, ran))
+        self.run_end[seg_lo:seg_hi] = array('d', compress(log.end, ran))
+        self.run_job[seg_lo:seg_hi] = array('q', compress(log.job, ran))
+        # Jobs are dispatched busy period by busy period, so the window sits at the same cursor
+        self.dispatched[cursor:cursor + count - delta] = result.order
+        self.period_job[p:q] = array('q', periods)
+        self.period_time[p:q] = array('d', [arrival[j] for j in periods])
+        for j in result.order:
+            self.start[j] = result.start[j]
+            self.finish[j] = result.finish[j]
+        # Jobs simulated by the last load or edit, for comparing against a full run
+        self.recomputed = count
+
+    # The current schedule, indexed by job number (deleted jobs have NaN start and finish)
+    @property
+    def result(self):
+        # Runs are free of switch costs, so every change of job between segments is one switch
+        run_job = self.run_job
+        switches = sum(1 for a, b in zip(run_job, run_job[1:]) if a != b)
+        log = SegmentLog.from_runs(self.run_start, self.run_end, run_job)
+        return Schedule(self.start, self.finish, self.dispatched, log, switches)
+
+    def segments(self):
+        return self.result.segments()
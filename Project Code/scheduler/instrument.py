@@ -0,0 +1,413 @@
+# Instrumentation for the scheduling pipeline. Code marks its phases (load,
+# sort, dispatch, metrics, render, ...) with "with phase(name):" and the
+# engines hand their per-run counters to count(); both go to every registered
+# Observer. With no observer registered, phase() returns a shared do-nothing
+# context manager and the engines keep their plain loop, so the hooks cost a
+# function call per phase and nothing per event.
+#
+# Recorder is the built-in observer: it keeps the spans and counters, can run
+# cProfile and tracemalloc while it is active, and exports everything as JSON
+# or as a Chrome trace (chrome://tracing, Perfetto).
+# cProfile, pstats, tracemalloc, json and threading are imported where used,
+# keeping "import scheduler" cheap.
+import os
+import time
+from _thread import get_ident
+
+clock = time.perf_counter
+
+# Registered observers; the hot paths only test whether this is empty
+observers = []
+
+
+def add_observer(observer):
+    observers.append(observer)
+
+
+def remove_observer(observer):
+    observers.remove(observer)
+
+
+def enabled():
+    return bool(observers)
+
+
+# Hook interface; every method is optional to override. Times are
+# time.perf_counter() seconds, thread is threading.get_ident().
+class Observer:
+    def phase_started(self, name, thread):
+        pass
+
+    def phase_ended(self, name, start, end, thread):
+        pass
+
+    # counts is a dict of counter name -> value for one run of phase name
+    def counted(self, name, counts, now, thread):
+        pass
+
+
+class _Phase:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        thread = get_ident()
+        for observer in observers:
+            observer.phase_started(self.name, thread)
+        self.start = clock()
+        return self
+
+    def __exit__(self, *exc):
+        end = clock()
+        thread = get_ident()
+        for observer in observers:
+            observer.phase_ended(self.name, self.start, end, thread)
+        return False
+
+
+class _NoPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NO_PHASE = _NoPhase()
+
+
+def phase(name):
+    if not observers:
+        return NO_PHASE
+    return _Phase(name)
+
+
+def count(name, counts):
+    now = clock()
+    thread = get_ident()
+    for observer in observers:
+        observer.counted(name, counts, now, thread)
+
+
+# Counter values of one run. moving is set while a stolen job is on its way
+# to another CPU's queue, so that push isn't taken for an arrival or preemption.
+class Counts(dict):
+    moving = 0
+
+
+# Counts the ready-queue traffic of one run by standing in for its policy.
+# The engines only build one when an observer is registered, so their own
+# loops never pay for the bookkeeping.
+class CountingPolicy:
+    def __init__(self, policy, counts):
+        self.policy = policy
+        self.counts = counts
+        self.preemptive = policy.preemptive
+        self.last = -1
+
+    def reset(self, arrival, burst, priority):
+        self.policy.reset(arrival, burst, priority)
+
+    def __len__(self):
+        return len(self.policy)
+
+    def admit(self, i, now):
+        self._pushed("arrivals")
+        self.policy.admit(i, now)
+
+    def requeue(self, i, remaining, now, expired):
+        self._pushed("expiries" if expired else "preemptions")
+        self.policy.requeue(i, remaining, now, expired)
+
+    def _pushed(self, reason):
+        counts = self.counts
+        counts["heap_pushes"] += 1
+        if counts.moving:
+            counts.moving -= 1
+        else:
+            counts[reason] += 1
+
+    def complete(self, i, now):
+        self.policy.complete(i, now)
+
+    def pop(self, now):
+        job = self.policy.pop(now)
+        counts = self.counts
+        counts["dispatches"] += 1
+        counts["heap_pops"] += 1
+        if job != self.last:
+            if self.last >= 0:
+                counts["context_switches"] += 1
+            self.last = job
+        return job
+
+    def peek(self):
+        return self.policy.peek()
+
+    def steal(self, now):
+        self.counts["steals"] += 1
+        self.counts["heap_pops"] += 1
+        self.counts.moving += 1
+        return self.policy.steal(now)
+
+    def quantum(self, i):
+        return self.policy.quantum(i)
+
+    def preempts(self, running, remaining, now):
+        self.counts["preempt_checks"] += 1
+        return self.policy.preempts(running, remaining, now)
+
+    def describe(self):
+        return self.policy.describe()
+
+
+COUNTERS = ("events", "arrivals", "dispatches", "context_switches", "expiries", "preemptions", "preempt_checks",
+            "heap_pushes", "heap_pops", "steals", "segments")
+
+
+def new_counts():
+    return Counts.fromkeys(COUNTERS, 0)
+
+
+def finish_counts(counts, segments):
+    # Every dispatch ends in exactly one event (completion, expiry or preemption)
+    counts["events"] = counts["arrivals"] + counts["dispatches"]
+    counts["segments"] = segments
+    return counts
+
+
+# Observer that keeps everything it sees. Use it as a context manager (or
+# start()/stop()) around the code to look at; profile adds cProfile function
+# statistics and memory adds tracemalloc allocation figures. cProfile follows
+# the thread that started the recorder plus, for the length of each of their
+# phases, any other thread (such as a GUI's simulation worker).
+class Recorder(Observer):
+    def __init__(self, profile=False, memory=False):
+        self.profile = profile
+        self.memory = memory
+        self.spans = []
+        self.samples = []
+        self.threads = {}
+        self.started = None
+        self.stopped = None
+        self.profilers = []
+        self._thread_profilers = {}
+        self._depth = {}
+        self._tracing = False
+        self.memory_report = None
+
+    def start(self):
+        self.started = clock()
+        self.thread = get_ident()
+        self._name_thread(self.thread)
+        if self.memory:
+            import tracemalloc
+
+            self._tracing = not tracemalloc.is_tracing()
+            if self._tracing:
+                tracemalloc.start()
+        if self.profile:
+            import cProfile
+
+            profiler = cProfile.Profile()
+            self.profilers.append(profiler)
+            self._thread_profilers[self.thread] = profiler
+            profiler.enable()
+        add_observer(self)
+        return self
+
+    def stop(self):
+        if self in observers:
+            remove_observer(self)
+        self.stopped = clock()
+        profiler = self._thread_profilers.pop(self.thread, None)
+        if profiler is not None:
+            profiler.disable()
+        if self.memory:
+            import tracemalloc
+
+            if tracemalloc.is_tracing():
+                current, peak = tracemalloc.get_traced_memory()
+                top = tracemalloc.take_snapshot().statistics("lineno")[:20]
+                self.memory_report = {
+                    "current": current,
+                    "peak": peak,
+                    "top": [{"where": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                             "size": stat.size, "count": stat.count} for stat in top],
+                }
+                if self._tracing:
+                    tracemalloc.stop()
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def _name_thread(self, thread):
+        if thread not in self.threads:
+            import threading
+
+            self.threads[thread] = threading.current_thread().name
+
+    def phase_started(self, name, thread):
+        self._name_thread(thread)
+        depth = self._depth.get(thread, 0)
+        self._depth[thread] = depth + 1
+        if self.profile and not depth and thread not in self._thread_profilers:
+            import cProfile
+
+            profiler = cProfile.Profile()
+            self.profilers.append(profiler)
+            self._thread_profilers[thread] = profiler
+            profiler.enable()
+
+    def phase_ended(self, name, start, end, thread):
+        memory = None
+        if self.memory:
+            import tracemalloc
+
+            memory = tracemalloc.get_traced_memory()[0]
+        self.spans.append((name, start, end, thread, memory))
+        depth = self._depth.get(thread, 1) - 1
+        self._depth[thread] = depth
+        if not depth and thread != self.thread:
+            profiler = self._thread_profilers.pop(thread, None)
+            if profiler is not None:
+                profiler.disable()
+
+    def counted(self, name, counts, now, thread):
+        self.samples.append((name, dict(counts), now, thread))
+
+    # Per-phase call count, total and longest duration in seconds
+    def phases(self):
+        phases = {}
+        for name, start, end, _, _ in self.spans:
+            entry = phases.setdefault(name, {"calls": 0, "total": 0.0, "max": 0.0})
+            entry["calls"] += 1
+            entry["total"] += end - start
+            entry["max"] = max(entry["max"], end - start)
+        return phases
+
+    # Counters summed over every run of each phase
+    def counters(self):
+        totals = {}
+        for name, counts, _, _ in self.samples:
+            entry = totals.setdefault(name, {})
+            for key, value in counts.items():
+                entry[key] = entry.get(key, 0) + value
+        return totals
+
+    # The busiest functions by cumulative time, across every profiled thread
+    def profile_rows(self, limit=30):
+        if not self.profilers:
+            return []
+        import pstats
+
+        stats = pstats.Stats(self.profilers[0])
+        for profiler in self.profilers[1:]:
+            stats.add(profiler)
+        rows = []
+        for (filename, line, function), (primitive, calls, total, cumulative, _) in stats.stats.items():
+            rows.append({"function": f"{filename}:{line}({function})", "calls": calls,
+                         "primitive_calls": primitive, "total_time": total, "cumulative_time": cumulative})
+        rows.sort(key=lambda row: row["cumulative_time"], reverse=True)
+        return rows[:limit]
+
+    def to_dict(self):
+        origin = self.started or 0.0
+        report = {
+            "phases": self.phases(),
+            "counters": self.counters(),
+            "spans": [{"name": name, "start": start - origin, "end": end - origin,
+                       "thread": self.threads.get(thread, str(thread)), **({} if memory is None else {"memory": memory})}
+                      for name, start, end, thread, memory in self.spans],
+        }
+        if self.memory_report is not None:
+            report["memory"] = self.memory_report
+        if self.profilers:
+            report["profile"] = self.profile_rows()
+        return report
+
+    # Chrome trace event format: one complete ("X") event per span, counter
+    # ("C") events for run counters and traced memory, thread names as metadata
+    def chrome_trace(self):
+        origin = self.started or 0.0
+        pid = os.getpid()
+        events = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": thread, "args": {"name": name}}
+                  for thread, name in self.threads.items()]
+        for name, start, end, thread, memory in self.spans:
+            events.append({"name": name, "cat": "phase", "ph": "X", "pid": pid, "tid": thread,
+                           "ts": (start - origin) * 1e6, "dur": (end - start) * 1e6})
+            if memory is not None:
+                events.append({"name": "traced memory", "ph": "C", "pid": pid, "tid": thread,
+                               "ts": (end - origin) * 1e6, "args": {"bytes": memory}})
+        for name, counts, now, thread in self.samples:
+            events.append({"name": f"{name} counters", "cat": "counters", "ph": "C", "pid": pid, "tid": thread,
+                           "ts": (now - origin) * 1e6, "args": counts})
+        trace = {"traceEvents": events, "displayTimeUnit": "ms"}
+        if self.memory_report is not None:
+            trace["otherData"] = {"peak_traced_memory": self.memory_report["peak"]}
+        return trace
+
+    # fmt is "json" (to_dict) or "chrome" (chrome_trace)
+    def write(self, f, fmt="json"):
+        import json
+
+        if fmt == "json":
+            json.dump(self.to_dict(), f, indent=2)
+        elif fmt == "chrome":
+            json.dump(self.chrome_trace(), f)
+        else:
+            raise ValueError(f"Unknown instrumentation format: {fmt}")
+        f.write("\n")
+
+    def save(self, path, fmt="json"):
+        with open(path, "w") as f:
+            self.write(f, fmt)
+
+    # Plain-text summary for a terminal
+    def format_report(self, functions=15):
+        lines = ["phase              calls     total ms       max ms"]
+        for name, entry in self.phases().items():
+            lines.append(f"{name:<16}{entry['calls']:>8}{entry['total'] * 1000:>13.2f}{entry['max'] * 1000:>13.2f}")
+        for name, counts in self.counters().items():
+            lines.append(f"{name} counters: " + ", ".join(f"{key}={value}" for key, value in counts.items() if value))
+        if self.memory_report is not None:
+            lines.append(f"traced memory: {self.memory_report['current'] / (1 << 20):.1f} MiB at the end, "
+                         f"{self.memory_report['peak'] / (1 << 20):.1f} MiB peak")
+        rows = self.profile_rows(functions)
+        if rows:
+            lines.append("   calls   own ms   cum ms  function")
+            for row in rows:
+                lines.append(f"{row['calls']:>8}{row['total_time'] * 1000:>9.1f}{row['cumulative_time'] * 1000:>9.1f}"
+                             f"  {row['function']}")
+        return "\n".join(lines)
+
+
+# Let the GUIs be instrumented without code changes: SCHEDULER_INSTRUMENT
+# names the output file, SCHEDULER_INSTRUMENT_FORMAT is json (default) or
+# chrome, and SCHEDULER_PROFILE lists extras ("cpu", "memory" or both). The
+# recorder is saved when the interpreter exits.
+def from_environment(environ=os.environ):
+    path = environ.get("SCHEDULER_INSTRUMENT")
+    if not path:
+        return None
+    import atexit
+
+    extras = environ.get("SCHEDULER_PROFILE", "").replace(",", " ").split()
+    recorder = Recorder(profile="cpu" in extras, memory="memory" in extras).start()
+    fmt = environ.get("SCHEDULER_INSTRUMENT_FORMAT", "json")
+
+    def save():
+        recorder.stop()
+        recorder.save(path, fmt)
+
+    atexit.register(save)
+    return recorder
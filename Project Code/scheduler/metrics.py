@@ -0,0 +1,90 @@
+from .segments import RUN, SWITCH
+from .sketches import QuantileSketch
+
+METRICS = ("waiting_time", "turnaround_time", "response_time")
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def percentile_name(q):
+    # 99 -> "p99", 99.9 -> "p99.9"
+    return f"p{q:g}"
+
+
+# avg, total, max, stddev and percentile columns for each metric, read off
+# its sketch; sketches maps metric name -> QuantileSketch
+def sketch_summary(sketches, summary=None):
+    summary = {} if summary is None else summary
+    for name in METRICS:
+        sketch = sketches[name]
+        summary[f"avg_{name}"] = sketch.mean
+        summary[f"total_{name}"] = sketch.total
+        summary[f"max_{name}"] = sketch.max
+        summary[f"stddev_{name}"] = sketch.stddev
+        for q in PERCENTILES:
+            summary[f"{percentile_name(q)}_{name}"] = sketch.quantile(q / 100)
+    return summary
+
+
+# Sketches of the rows of a (3, n) waiting/turnaround/response block. Each is
+# built in a few vectorized passes without sorting, and sketches from separate
+# runs or shards merge into the sketch of the combined run.
+def metric_sketches(block, relative_accuracy=0.01):
+    return {name: QuantileSketch.from_values(block[row], relative_accuracy) for row, name in enumerate(METRICS)}
+
+
+# Summarize a (3, n) block of waiting/turnaround/response rows. Percentiles
+# come from the sketches, so they are within their relative accuracy (1% by
+# default) of the exact values; counts, totals, means, maxima and standard
+# deviations are exact.
+def summarize(block, finish=None, sketches=None):
+    n = block.shape[1]
+    summary = {"count": n}
+    if n == 0:
+        return summary
+    sketch_summary(sketches or metric_sketches(block), summary)
+    if finish is not None:
+        summary["makespan"] = float(finish.max())
+    return summary
+
+
+# One summary row per priority class, lowest priority number first
+def priority_summaries(block, priority, relative_accuracy=0.01):
+    grouped = {name: QuantileSketch.grouped(block[row], priority, relative_accuracy)
+               for row, name in enumerate(METRICS)}
+    rows = []
+    for level in sorted(grouped[METRICS[0]]):
+        sketches = {name: grouped[name][level] for name in METRICS}
+        rows.append(sketch_summary(sketches, {"priority": level, "count": sketches[METRICS[0]].count}))
+    return rows
+
+
+# Host-level view of a run: where the CPUs' time went between the first
+# dispatch and the last completion. busy_time is time spent running jobs,
+# overhead_time time spent on switch, dispatch and migration costs, and
+# idle_time the rest of the capacity (elapsed time x CPUs). The three
+# fractions share that denominator, so they add up to 1. Pure Python: busy
+# and overhead are sums over the run and switch segments of the result's log.
+def timeline_summary(result):
+    cpus = getattr(result, "cpus", 1)
+    jobs = len(result.order)
+    summary = {"context_switches": result.switches}
+    if not jobs:
+        return summary
+    begin = result.start[result.order[0]]
+    end = max(result.finish[i] for i in result.order) if jobs < len(result.finish) else max(result.finish)
+    elapsed = end - begin
+    capacity = elapsed * cpus
+    busy = result.log.total(RUN)
+    overhead = result.log.total(SWITCH)
+    idle = max(capacity - busy - overhead, 0.0)
+    summary.update({
+        "elapsed": elapsed,
+        "busy_time": busy,
+        "overhead_time": overhead,
+        "idle_time": idle,
+        "utilization": busy / capacity if capacity else 0.0,
+        "overhead_fraction": overhead / capacity if capacity else 0.0,
+        "idle_fraction": idle / capacity if capacity else 0.0,
+        "throughput": jobs / elapsed if elapsed else 0.0,
+    })
+    return summary
@@ -0,0 +1,349 @@
+# N simulated CPUs, each with its own run queue (its own copy of the policy),
+# driven by one global event heap of slice ends. Arrivals go to an idle CPU if
+# there is one, otherwise to the CPU with the shortest queue; a CPU whose job
+# expires at that moment counts as busy, since it requeues the job. After every
+# event, each CPU left with nothing to run steals the next job from the longest
+# queue, so no CPU idles while a job it may run is waiting. A job that resumes
+# on a different CPU than it last ran on pays migration_cost before it makes progress.
+import copy
+import heapq
+from array import array
+
+from . import instrument
+from .engine import Schedule, arrival_order
+from .policies import get_policy
+from .segments import IDLE, RUN, SWITCH, SegmentLog, new_columns
+
+INFINITY = float("inf")
+
+
+# A Schedule over several CPUs, with per-CPU busy time and migration counts.
+# busy and overhead include the migration, switch and dispatch costs.
+class MulticoreSchedule(Schedule):
+    def __init__(self, start, finish, order, log, busy, migrations, switches=0):
+        super().__init__(start, finish, order, log, switches)
+        self.cpus = len(busy)
+        self.busy = busy
+        self.migrations = migrations
+
+    def segments(self, cpu=None):
+        # (start, end, job, kind) in timeline order, for one CPU or (ordered by end) for all of them
+        return self.log.segments(cpu)
+
+    def makespan(self):
+        return max(self.finish, default=0.0)
+
+    def utilization(self):
+        # Share of the makespan each CPU spent running jobs or migrating them
+        makespan = self.makespan()
+        return [busy / makespan if makespan else 0.0 for busy in self.busy]
+
+
+# Which CPU is idle, least loaded or most loaded, from lazy heaps: entries are
+# pushed whenever a queue length changes and checked against it on the way
+# out. The heaps are rebuilt once stale entries outnumber the CPUs, so each
+# change costs O(log cpus) amortized.
+class _Loads:
+    def __init__(self, sizes, running):
+        self.sizes = sizes
+        self.running = running
+        self.limit = 4 * len(sizes) + 64
+        self._rebuild()
+
+    def _rebuild(self):
+        sizes = [(size, cpu) for cpu, size in enumerate(self.sizes)]
+        self.idle_heap = [cpu for size, cpu in sizes if not size and self.running[cpu] < 0]
+        self.least_heap = sizes
+        self.most_heap = [(-size, cpu) for size, cpu in sizes if size]
+        heapq.heapify(self.least_heap)
+        heapq.heapify(self.most_heap)
+
+    def changed(self, cpu):
+        size = self.sizes[cpu]
+        heapq.heappush(self.least_heap, (size, cpu))
+        if size:
+            heapq.heappush(self.most_heap, (-size, cpu))
+        elif self.running[cpu] < 0:
+            heapq.heappush(self.idle_heap, cpu)
+        if len(self.least_heap) > self.limit:
+            self._rebuild()
+
+    # Lowest-numbered CPU with nothing running or queued, or -1
+    def idle(self):
+        heap = self.idle_heap
+        while heap:
+            cpu = heap[0]
+            if self.running[cpu] < 0 and not self.sizes[cpu]:
+                return cpu
+            heapq.heappop(heap)
+        return -1
+
+    def least(self):
+        heap = self.least_heap
+        while self.sizes[heap[0][1]] != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0][1]
+
+    # CPU with the longest non-empty queue, or -1
+    def most(self):
+        heap = self.most_heap
+        while heap:
+            size, cpu = heap[0]
+            if self.sizes[cpu] == -size:
+                return cpu
+            heapq.heappop(heap)
+        return -1
+
+
+# Multi-core counterpart of engine.simulate. affinity, if given, holds for each
+# job either None (any CPU) or the CPUs it may run on; it limits placement and
+# stealing alike. switch_cost and dispatch_latency are charged per CPU as in
+# engine.simulate, on top of any migration cost. With cpus=1 the result
+# matches engine.simulate. Instrument
+# observers see the same phases and counters as for engine.simulate, summed
+# over the CPUs, plus steals and migrations.
+def simulate_multicore(arrival, burst, priority, policy, cpus=2, affinity=None, migration_cost=0.0, steal=True,
+                       order=None, progress=None, progress_every=1024, switch_cost=0.0, dispatch_latency=0.0):
+    if isinstance(policy, str):
+        policy = get_policy(policy)
+    if cpus < 1:
+        raise ValueError("At least one CPU is needed.")
+    if migration_cost < 0:
+        raise ValueError("Migration cost must be non-negative.")
+    if switch_cost < 0 or dispatch_latency < 0:
+        raise ValueError("Switch cost and dispatch latency must be non-negative.")
+    if order is None:
+        with instrument.phase("sort"):
+            order = arrival_order(arrival)
+    options = (cpus, affinity, migration_cost, steal, order, progress, progress_every, switch_cost, dispatch_latency)
+    if not instrument.observers:
+        return _simulate_multicore(arrival, burst, priority, policy, *options)
+    counts = instrument.new_counts()
+    with instrument.phase("dispatch"):
+        result = _simulate_multicore(arrival, burst, priority, policy, *options, counts)
+    counts = instrument.finish_counts(counts, result.log.count(RUN))
+    counts["migrations"] = result.migrations
+    instrument.count("dispatch", counts)
+    return result
+
+
+def _simulate_multicore(arrival, burst, priority, policy, cpus, affinity, migration_cost, steal, order, progress,
+                        progress_every, switch_cost, dispatch_latency, counts=None):
+    n = len(arrival)
+    jobs = len(order)
+    queues = []
+    for _ in range(cpus):
+        queue = copy.copy(policy)
+        if counts is not None:
+            # Wrapped after copying, so every CPU counts into the same totals through its own queue
+            queue = instrument.CountingPolicy(queue, counts)
+        queue.reset(arrival, burst, priority)
+        queues.append(queue)
+    preemptive = policy.preemptive
+
+    start = array('d', [0.0]) * n
+    finish = array('d', [0.0]) * n
+    dispatched = array('q')
+    columns = new_columns()
+    add_start, add_end, add_job, add_cpu, add_kind = (column.append for column in columns)
+    busy = array('d', [0.0]) * cpus
+    last_cpu = array('q', [-1]) * n
+    migrations = 0
+    switches = 0
+    completed = array('q')
+    done = 0
+
+    # Per-CPU state of the current slice. since is when the job starts making
+    # progress, i.e. after the costs paid from slice_start. A CPU with nothing
+    # running has been idle since idle_since.
+    running = [-1] * cpus
+    idle_since = [0.0] * cpus
+    last_job = [-1] * cpus
+    slice_start = [0.0] * cpus
+    since = [0.0] * cpus
+    left = [0.0] * cpus
+    completes = [False] * cpus
+    # Bumped when a slice is cut short so its pending event is ignored
+    token = [0] * cpus
+    events = []
+    # Ready queue lengths, kept here so load checks don't go through the policies
+    sizes = [0] * cpus
+    loads = _Loads(sizes, running)
+
+    # Remaining burst is only kept for jobs that left a CPU unfinished
+    remaining = {}
+
+    def allowed(i, cpu):
+        return affinity is None or affinity[i] is None or cpu in affinity[i]
+
+    def place(i):
+        if affinity is not None and affinity[i] is not None:
+            cpus_allowed = affinity[i]
+            for cpu in cpus_allowed:
+                if running[cpu] < 0 and not sizes[cpu]:
+                    return cpu
+            return min(cpus_allowed, key=sizes.__getitem__)
+        cpu = loads.idle()
+        return cpu if cpu >= 0 else loads.least()
+
+    def add(begin, end, job, cpu, kind):
+        add_start(begin)
+        add_end(end)
+        add_job(job)
+        add_cpu(cpu)
+        add_kind(kind)
+
+    def end_slice(cpu, now):
+        # Close the running slice on cpu at now and return the job's remaining burst
+        if since[cpu] > slice_start[cpu]:
+            add(slice_start[cpu], min(now, since[cpu]), running[cpu], cpu, SWITCH)
+        if since[cpu] < now:
+            add(since[cpu], now, running[cpu], cpu, RUN)
+        busy[cpu] += now - slice_start[cpu]
+        idle_since[cpu] = now
+        return left[cpu] - max(0.0, now - since[cpu])
+
+    def dispatch(cpu, now):
+        nonlocal migrations, switches
+        queue = queues[cpu]
+        job = queue.pop(now)
+        sizes[cpu] -= 1
+        rest = remaining.pop(job, None)
+        if rest is None:
+            rest = burst[job]
+            start[job] = now
+            dispatched.append(job)
+        cost = dispatch_latency
+        if last_job[cpu] != job:
+            if last_job[cpu] >= 0:
+                switches += 1
+                cost += switch_cost
+            last_job[cpu] = job
+        if last_cpu[job] != cpu:
+            if last_cpu[job] >= 0:
+                migrations += 1
+                cost += migration_cost
+            last_cpu[job] = cpu
+        time_slice = queue.quantum(job)
+        if idle_since[cpu] < now:
+            add(idle_since[cpu], now, -1, cpu, IDLE)
+        running[cpu] = job
+        slice_start[cpu] = now
+        since[cpu] = now + cost
+        left[cpu] = rest
+        completes[cpu] = time_slice is None or time_slice >= rest
+        token[cpu] += 1
+        heapq.heappush(events, (since[cpu] + (rest if completes[cpu] else time_slice), cpu, token[cpu]))
+
+    # Move victim's next job to cpu's queue, if there is one cpu may run
+    def take_from(victim, cpu, now):
+        if victim < 0 or victim == cpu or not allowed(queues[victim].peek(), cpu):
+            return False
+        job = queues[victim].steal(now)
+        sizes[victim] -= 1
+        loads.changed(victim)
+        if job in remaining:
+            queues[cpu].requeue(job, remaining[job], now, False)
+        else:
+            queues[cpu].admit(job, now)
+        sizes[cpu] += 1
+        return True
+
+    cursor = 0
+    while True:
+        while events and events[0][2] != token[events[0][1]]:
+            heapq.heappop(events)
+        next_arrival = arrival[order[cursor]] if cursor < jobs else INFINITY
+        next_end = events[0][0] if events else INFINITY
+        if next_arrival == INFINITY and next_end == INFINITY:
+            break
+        now = min(next_arrival, next_end)
+
+        # Slices ending now, then arrivals, then expired jobs back to their queues
+        ready = []
+        expired = []
+        while events and events[0][0] <= now:
+            _, cpu, tok = heapq.heappop(events)
+            if tok != token[cpu]:
+                continue
+            job = running[cpu]
+            rest = end_slice(cpu, now)
+            if completes[cpu]:
+                finish[job] = now
+                queues[cpu].complete(job, now)
+                running[cpu] = -1
+                if progress is not None:
+                    done += 1
+                    completed.append(job)
+            else:
+                # The CPU keeps its job until the arrivals are placed, so none of them looks idle
+                expired.append((cpu, job, rest))
+            ready.append(cpu)
+
+        expiring = {cpu for cpu, _, _ in expired}
+        woken = []
+        while cursor < jobs and arrival[order[cursor]] <= now:
+            job = order[cursor]
+            cursor += 1
+            cpu = place(job)
+            queues[cpu].admit(job, now)
+            sizes[cpu] += 1
+            loads.changed(cpu)
+            if running[cpu] < 0:
+                ready.append(cpu)
+            elif cpu not in expiring:
+                woken.append(cpu)
+
+        for cpu, job, rest in expired:
+            running[cpu] = -1
+            remaining[job] = rest
+            queues[cpu].requeue(job, rest, now, True)
+            sizes[cpu] += 1
+            loads.changed(cpu)
+
+        # Preemptive policies get a say on every busy CPU that received an arrival
+        if preemptive:
+            for cpu in woken:
+                job = running[cpu]
+                if job < 0:
+                    continue
+                rest = left[cpu] - max(0.0, now - since[cpu])
+                if queues[cpu].preempts(job, rest, now):
+                    end_slice(cpu, now)
+                    remaining[job] = rest
+                    queues[cpu].requeue(job, rest, now, False)
+                    sizes[cpu] += 1
+                    running[cpu] = -1
+                    token[cpu] += 1
+                    loads.changed(cpu)
+                    ready.append(cpu)
+
+        for cpu in ready:
+            if running[cpu] >= 0:
+                continue
+            if steal and not sizes[cpu]:
+                take_from(loads.most(), cpu, now)
+            if sizes[cpu]:
+                dispatch(cpu, now)
+            loads.changed(cpu)
+
+        # CPUs left idle by earlier events steal too, so no CPU idles while a job it may run is queued
+        if steal and loads.idle() >= 0 and loads.most() >= 0:
+            for cpu in range(cpus):
+                if running[cpu] < 0 and not sizes[cpu] and take_from(loads.most(), cpu, now):
+                    dispatch(cpu, now)
+                    loads.changed(cpu)
+
+        if progress is not None and len(completed) >= progress_every:
+            progress(done, jobs, completed, start, finish)
+            completed = array('q')
+
+    # CPUs that ran dry before the last completion sit idle until it
+    makespan = max(finish, default=0.0)
+    for cpu in range(cpus):
+        if idle_since[cpu] < makespan:
+            add(idle_since[cpu], makespan, -1, cpu, IDLE)
+
+    if progress is not None:
+        progress(done, jobs, completed, start, finish)
+    return MulticoreSchedule(start, finish, dispatched, SegmentLog(*columns), busy, migrations, switches)
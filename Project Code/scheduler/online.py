@@ -0,0 +1,158 @@
+import math
+from collections import namedtuple
+
+from .metrics import METRICS, sketch_summary
+from .policies import Policy, get_policy
+from .sketches import QuantileSketch
+
+Completion = namedtuple(
+    "Completion",
+    "pid priority arrival burst start finish waiting_time turnaround_time response_time",
+)
+
+
+# Online scheduler for unbounded arrival streams. Jobs are fed in arrival
+# order and completions are handed back as soon as they are final, i.e. once
+# no later arrival can change them. Only jobs in flight are kept; metrics are
+# running sums and quantile sketches, so memory is O(ready queue), not
+# O(jobs seen). The dispatch rules mirror engine.simulate exactly.
+class OnlineScheduler:
+    def __init__(self, policy="priority", relative_accuracy=0.01, **params):
+        if not isinstance(policy, Policy):
+            policy = get_policy(policy, **params)
+        self.policy = policy
+
+        # Per-job columns, keyed by an internal sequence number and dropped on completion
+        self.pid = {}
+        self.arrival = {}
+        self.burst = {}
+        self.priority = {}
+        self.start = {}
+        self.remaining = {}
+        policy.reset(self.arrival, self.burst, self.priority)
+
+        self.stats = {name: QuantileSketch(relative_accuracy) for name in METRICS}
+        self.current_time = 0
+        self.last_arrival = -math.inf
+        self.running = -1
+        self._next_id = 0
+        self._events = []
+
+    def __len__(self):
+        # Jobs in flight: queued plus running
+        return len(self.arrival)
+
+    # Add one arrival; returns the completions it made final
+    def feed(self, pid, priority, arrival_time, burst_time):
+        if arrival_time < self.last_arrival:
+            raise ValueError("Arrivals must be fed in non-decreasing arrival time order.")
+        if burst_time <= 0:
+            raise ValueError("Burst time must be positive.")
+        self.last_arrival = arrival_time
+        self._run_until(arrival_time)
+
+        i = self._next_id
+        self._next_id += 1
+        self.pid[i] = pid
+        self.arrival[i] = arrival_time
+        self.burst[i] = burst_time
+        self.priority[i] = priority
+        if self.current_time < arrival_time:
+            self.current_time = arrival_time
+        self.policy.admit(i, arrival_time)
+
+        # A slice ending exactly now is settled before preemption is considered, as in the batch engine
+        if self.running >= 0 and self.policy.preemptive and self.slice_end > arrival_time:
+            left = self.left - (arrival_time - self.since)
+            if self.policy.preempts(self.running, left, arrival_time):
+                self.remaining[self.running] = left
+                self.policy.requeue(self.running, left, arrival_time, False)
+                self.running = -1
+        return self._take_events()
+
+    # No more arrivals: run everything still in flight to completion
+    def drain(self):
+        self._run_until(math.inf)
+        return self._take_events()
+
+    # Consume an iterable of Process objects or (pid, priority, arrival, burst) tuples
+    def run(self, stream):
+        for item in stream:
+            yield from self.feed(*_fields(item))
+        yield from self.drain()
+
+    # Same as run() for an asyncio.Queue; put None on the queue to end the stream
+    async def arun(self, queue):
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            for event in self.feed(*_fields(item)):
+                yield event
+        for event in self.drain():
+            yield event
+
+    def summary(self):
+        return sketch_summary(self.stats, {"count": self.stats[METRICS[0]].count})
+
+    def _take_events(self):
+        events = self._events
+        self._events = []
+        return events
+
+    # Settle every event strictly before horizon. The CPU is not dispatched at
+    # the horizon itself, because arrivals at that instant must be queued first.
+    def _run_until(self, horizon):
+        policy = self.policy
+        while True:
+            if self.running < 0:
+                if not len(policy) or self.current_time >= horizon:
+                    return
+                self._dispatch()
+            if self.slice_end < horizon or (self.slice_end == horizon and self.completes):
+                self._end_slice()
+            else:
+                return
+
+    def _dispatch(self):
+        i = self.policy.pop(self.current_time)
+        left = self.remaining.pop(i, None)
+        if left is None:
+            left = self.burst[i]
+            self.start[i] = self.current_time
+        self.running = i
+        self.since = self.current_time
+        self.left = left
+        time_slice = self.policy.quantum(i)
+        self.completes = time_slice is None or time_slice >= left
+        self.slice_end = self.current_time + (left if self.completes else time_slice)
+
+    def _end_slice(self):
+        i = self.running
+        self.current_time = self.slice_end
+        self.running = -1
+        if self.completes:
+            self.policy.complete(i, self.current_time)
+            self._complete(i, self.current_time)
+        else:
+            left = self.left - (self.current_time - self.since)
+            self.remaining[i] = left
+            self.policy.requeue(i, left, self.current_time, True)
+
+    def _complete(self, i, finish):
+        arrival = self.arrival.pop(i)
+        burst = self.burst.pop(i)
+        start = self.start.pop(i)
+        turnaround = finish - arrival
+        event = Completion(self.pid.pop(i), self.priority.pop(i), arrival, burst, start, finish,
+                           turnaround - burst, turnaround, start - arrival)
+        self.stats["waiting_time"].add(event.waiting_time)
+        self.stats["turnaround_time"].add(turnaround)
+        self.stats["response_time"].add(event.response_time)
+        self._events.append(event)
+
+
+def _fields(item):
+    if hasattr(item, "arrival_time"):
+        return item.pid, item.priority, item.arrival_time, item.burst_time
+    return item
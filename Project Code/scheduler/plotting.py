@@ -0,0 +1,172 @@
+# Matplotlib Gantt rendering that scales to millions of segments: segments are
+# merged and downsampled with NumPy, then drawn as one PolyCollection, so
+# matplotlib sees a single artist instead of one bar (and label) per process.
+import matplotlib
+import numpy as np
+from matplotlib.collections import PolyCollection
+
+from .instrument import phase
+from .segments import IDLE, RUN, SWITCH
+
+# Above this many processes the chart switches from one row per process to a single CPU lane
+MAX_LABELLED_LANES = 50
+IDLE_COLOR = "lightgrey"
+SWITCH_COLOR = "orange"
+
+
+# Zero-copy NumPy views of a Schedule's segment log: start, end, job, cpu, kind
+def timeline_arrays(result):
+    log = result.log
+    return (
+        np.frombuffer(log.start, dtype=np.float64),
+        np.frombuffer(log.end, dtype=np.float64),
+        np.frombuffer(log.job, dtype=np.int32),
+        np.frombuffer(log.cpu, dtype=np.int16),
+        np.frombuffer(log.kind, dtype=np.int8),
+    )
+
+
+# Merge segments that sit in the same lane with a gap of at most `gap`. With
+# same_job, only stretches of one job are joined (gap=0 merges back-to-back
+# slices exactly); otherwise a zoomed-out lane collapses into busy blocks that
+# take the job of their first segment.
+def coalesce(start, end, lane, job, gap=0.0, same_job=True):
+    if len(start) < 2:
+        return start, end, lane, job
+    order = np.lexsort((start, lane))
+    start, end, lane, job = start[order], end[order], lane[order], job[order]
+    new = np.empty(len(start), dtype=bool)
+    new[0] = True
+    new[1:] = (lane[1:] != lane[:-1]) | (start[1:] - end[:-1] > gap)
+    if same_job:
+        new[1:] |= job[1:] != job[:-1]
+    first = np.flatnonzero(new)
+    return start[first], np.maximum.reduceat(end, first), lane[first], job[first]
+
+
+# Keep only segments that overlap the window, clipped to it
+def clip(start, end, lane, job, t0, t1):
+    visible = (end > t0) & (start < t1)
+    return np.maximum(start[visible], t0), np.minimum(end[visible], t1), lane[visible], job[visible]
+
+
+def idle_gaps(start, end):
+    # Stretches where no CPU runs anything (or pays a switch), including the one before the first dispatch
+    if not len(start):
+        return start, end
+    if (start[1:] < start[:-1]).any():
+        # Multi-core segment logs are ordered by end time, not start time
+        order = np.argsort(start, kind="stable")
+        start, end = start[order], end[order]
+    busy_until = np.maximum.accumulate(end)
+    gap_start = np.r_[0.0, busy_until[:-1]]
+    gap = start > gap_start
+    return gap_start[gap], start[gap]
+
+
+def bar_vertices(start, end, y, height=0.8):
+    verts = np.empty((len(start), 4, 2))
+    y0 = y - height / 2
+    y1 = y + height / 2
+    verts[:, 0, 0] = verts[:, 1, 0] = start
+    verts[:, 2, 0] = verts[:, 3, 0] = end
+    verts[:, 0, 1] = verts[:, 3, 1] = y0
+    verts[:, 1, 1] = verts[:, 2, 1] = y1
+    return verts
+
+
+# Lay a Schedule's segment log out in lanes: one per process (in first-dispatch
+# order, above an idle row) or, with lanes="cpu", a single CPU lane or one per
+# CPU for multi-core results. Switch overhead goes on the lane of the job being
+# dispatched. Returns (start, end, lane, job) for the run segments,
+# (start, end, lane) for the switch and for the idle ones, and the lane labels.
+def gantt_lanes(result, pids=None, lanes=None):
+    start, end, job, cpu, kind = timeline_arrays(result)
+    if pids is None:
+        pids = np.arange(1, len(result.start) + 1)
+    pids = np.asarray(pids)
+    if lanes is None:
+        lanes = "process" if len(pids) <= MAX_LABELLED_LANES else "cpu"
+    cpus = getattr(result, "cpus", 1)
+
+    idle = kind == IDLE
+    if lanes == "process":
+        # One row per process in first-dispatch order, plus an idle row at the bottom
+        row = np.zeros(len(pids) + 1, dtype=np.int64)
+        row[np.asarray(result.order, dtype=np.int64)] = np.arange(1, len(result.order) + 1)
+        # Idle segments (job -1) pick up the idle row from the spare last entry
+        lane = row[job]
+        labels = ["Idle"] + [f"P{pid}" for pid in pids[np.asarray(result.order, dtype=np.int64)]]
+    elif cpus > 1:
+        lane = cpu.astype(np.int64)
+        labels = [f"CPU{cpu}" for cpu in range(cpus)]
+    else:
+        lane = np.where(idle, 0, 1)
+        labels = ["Idle", "CPU"]
+
+    if lanes == "process" and cpus > 1:
+        # The idle row only shows time when every CPU is idle
+        idle_start, idle_end = idle_gaps(start[~idle], end[~idle])
+        idle_lane = np.zeros(len(idle_start), dtype=np.int64)
+    else:
+        idle_start, idle_end, idle_lane = start[idle], end[idle], lane[idle]
+    run = kind == RUN
+    switch = kind == SWITCH
+    return ((start[run], end[run], lane[run], job[run]), (start[switch], end[switch], lane[switch]),
+            (idle_start, idle_end, idle_lane), labels)
+
+
+def busy_colors(job, lanes, color):
+    if lanes == "process":
+        return [color]
+    # Neighbouring jobs on a shared lane get distinct colours
+    return matplotlib.colormaps["tab20"](job % 20)
+
+
+# One colour of (start, end, lane) segments, clipped to the window and merged below resolution
+def _overlay(segments, t0, t1, resolution, color):
+    start, end, lane = segments
+    start, end, lane, _ = clip(start, end, lane, lane, t0, t1)
+    start, end, lane, _ = coalesce(start, end, lane, lane, gap=resolution, same_job=False)
+    return PolyCollection(bar_vertices(start, end, lane), facecolors=color, edgecolors="none")
+
+
+def set_lane_ticks(ax, labels):
+    ax.set_ylim(-0.5, len(labels) - 0.5)
+    ax.set_yticks(range(len(labels)))
+    ax.set_yticklabels(labels)
+
+
+# Draw a Schedule's timeline onto ax. pids labels the job indices; window is an
+# optional (t0, t1) time range; segments shorter than a pixel are merged so the
+# number of bars is bounded by the axes width, not by the trace length.
+# Multi-core results get one lane per CPU, each with its own idle time.
+# Switch overhead is drawn in SWITCH_COLOR.
+def plot_gantt(ax, result, pids=None, color="skyblue", window=None, pixels=None, lanes=None):
+    with phase("render"):
+        if lanes is None:
+            lanes = "process" if len(result.start) <= MAX_LABELLED_LANES else "cpu"
+        busy, switch, idle, labels = gantt_lanes(result, pids, lanes)
+        start, end, lane, job = busy
+
+        if window is None:
+            window = (0.0, float(end.max()) if len(end) else 1.0)
+        t0, t1 = window
+        if pixels is None:
+            pixels = max(ax.bbox.width, 1.0)
+        resolution = (t1 - t0) / pixels
+
+        start, end, lane, job = clip(start, end, lane, job, t0, t1)
+        start, end, lane, job = coalesce(start, end, lane, job)
+        if len(start) > pixels:
+            start, end, lane, job = coalesce(start, end, lane, job, gap=resolution, same_job=False)
+
+        busy = PolyCollection(bar_vertices(start, end, lane), facecolors=busy_colors(job, lanes, color),
+                              edgecolors="none")
+        ax.add_collection(_overlay(idle, t0, t1, resolution, IDLE_COLOR))
+        ax.add_collection(busy)
+        ax.add_collection(_overlay(switch, t0, t1, resolution, SWITCH_COLOR))
+
+        ax.set_xlim(t0, t1)
+        set_lane_ticks(ax, labels)
+        return busy
@@ -0,0 +1,442 @@
+import heapq
+from collections import deque
+
+POLICIES = {}
+
+# Linux's load weight for each nice value from -20 to 19. One nice step is
+# worth about 10% of CPU time against a neighbour.
+NICE_WEIGHTS = (
+    88761, 71755, 56483, 46273, 36291,
+    29154, 23254, 18705, 14949, 11916,
+    9548, 7620, 6100, 4904, 3906,
+    3121, 2501, 1991, 1586, 1277,
+    1024, 820, 655, 526, 423,
+    335, 272, 215, 172, 137,
+    110, 87, 70, 56, 45,
+    36, 29, 23, 18, 15,
+)
+NICE_0_WEIGHT = 1024
+
+
+def nice_weight(nice):
+    return NICE_WEIGHTS[min(max(int(nice), -20), 19) + 20]
+
+
+def register_policy(name):
+    def decorator(cls):
+        cls.name = name
+        POLICIES[name] = cls
+        return cls
+    return decorator
+
+
+def get_policy(name, **params):
+    try:
+        cls = POLICIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown scheduling policy: {name}") from None
+    return cls(**params)
+
+
+def available_policies():
+    return sorted(POLICIES)
+
+
+# Base class for scheduling policies. The engine owns the clock, the arrival
+# cursor and the metrics; a policy only owns its ready queue.
+class Policy:
+    name = None
+    # Preemptive policies are consulted on every arrival while a job runs
+    preemptive = False
+
+    def reset(self, arrival, burst, priority):
+        self.arrival = arrival
+        self.burst = burst
+        self.priority = priority
+
+    def __len__(self):
+        raise NotImplementedError
+
+    # A job has arrived and joins the ready queue
+    def admit(self, i, now):
+        raise NotImplementedError
+
+    # A job left the CPU unfinished, either preempted or because its quantum expired
+    def requeue(self, i, remaining, now, expired):
+        self.admit(i, now)
+
+    # The running job finished its burst
+    def complete(self, i, now):
+        pass
+
+    # Remove and return the next job to run
+    def pop(self, now):
+        raise NotImplementedError
+
+    # The job pop would return, left in the queue
+    def peek(self):
+        raise NotImplementedError
+
+    # Remove and return a job for another CPU to run (multi-core work stealing)
+    def steal(self, now):
+        return self.pop(now)
+
+    # Longest stretch the job may run before the policy is asked again; None means run to completion
+    def quantum(self, i):
+        return None
+
+    # Called after new arrivals are admitted; True sends the running job back to the queue
+    def preempts(self, running, remaining, now):
+        return False
+
+    def describe(self):
+        return self.name
+
+
+# First come, first served: a plain FIFO, O(1) per operation
+@register_policy("fcfs")
+class FCFSPolicy(Policy):
+    def reset(self, arrival, burst, priority):
+        super().reset(arrival, burst, priority)
+        self.queue = deque()
+
+    def __len__(self):
+        return len(self.queue)
+
+    def admit(self, i, now):
+        self.queue.append(i)
+
+    def pop(self, now):
+        return self.queue.popleft()
+
+    def peek(self):
+        return self.queue[0]
+
+
+# Non-preemptive shortest job first: binary heap keyed by (burst, arrival, index)
+@register_policy("sjf")
+class SJFPolicy(Policy):
+    def reset(self, arrival, burst, priority):
+        super().reset(arrival, burst, priority)
+        self.heap = []
+
+    def __len__(self):
+        return len(self.heap)
+
+    def admit(self, i, now):
+        heapq.heappush(self.heap, (self.burst[i], self.arrival[i], i))
+
+    def pop(self, now):
+        return heapq.heappop(self.heap)[2]
+
+    def peek(self):
+        return self.heap[0][2]
+
+
+# Shortest remaining time first: binary heap keyed by (remaining, arrival, index).
+# The running job is off the heap, so a preempted or expired job is pushed
+# back with its remaining burst and no queued key ever changes.
+@register_policy("srtf")
+class SRTFPolicy(Policy):
+    preemptive = True
+
+    def reset(self, arrival, burst, priority):
+        super().reset(arrival, burst, priority)
+        self.heap = []
+
+    def __len__(self):
+        return len(self.heap)
+
+    def admit(self, i, now):
+        heapq.heappush(self.heap, (self.burst[i], self.arrival[i], i))
+
+    def requeue(self, i, remaining, now, expired):
+        heapq.heappush(self.heap, (remaining, self.arrival[i], i))
+
+    def pop(self, now):
+        return heapq.heappop(self.heap)[2]
+
+    def peek(self):
+        return self.heap[0][2]
+
+    def preempts(self, running, remaining, now):
+        return self.heap[0] < (remaining, self.arrival[running], running)
+
+
+# Non-preemptive priority (lower number runs first): binary heap keyed by (priority, arrival, index)
+@register_policy("priority")
+class PriorityPolicy(Policy):
+    def reset(self, arrival, burst, priority):
+        super().reset(arrival, burst, priority)
+        self.heap = []
+
+    def __len__(self):
+        return len(self.heap)
+
+    def admit(self, i, now):
+        heapq.heappush(self.heap, (self.priority[i], self.arrival[i], i))
+
+    def pop(self, now):
+        return heapq.heappop(self.heap)[2]
+
+    def peek(self):
+        return self.heap[0][2]
+
+
+# Preemptive priority: same ordering, but a better-priority arrival takes the CPU
+@register_policy("preemptive-priority")
+class PreemptivePriorityPolicy(PriorityPolicy):
+    preemptive = True
+
+    def preempts(self, running, remaining, now):
+        return self.heap[0] < (self.priority[running], self.arrival[running], running)
+
+
+# Priority with aging. A job's effective priority improves by aging_rate per
+# unit of time spent waiting: priority - aging_rate * (now - queued_at). The
+# aging_rate * now term is shared by every queued job, so ordering by
+# priority + aging_rate * queued_at is equivalent and never has to be rescanned.
+@register_policy("priority-aging")
+class AgingPriorityPolicy(Policy):
+    def __init__(self, aging_rate=0.1):
+        if aging_rate < 0:
+            raise ValueError("Aging rate must be non-negative.")
+        self.aging_rate = aging_rate
+
+    def reset(self, arrival, burst, priority):
+        super().reset(arrival, burst, priority)
+        self.heap = []
+
+    def __len__(self):
+        return len(self.heap)
+
+    def admit(self, i, now):
+        queued_at = self.arrival[i]
+        heapq.heappush(self.heap, (self.priority[i] + self.aging_rate * queued_at, queued_at, i))
+
+    def pop(self, now):
+        return heapq.heappop(self.heap)[2]
+
+    def peek(self):
+        return self.heap[0][2]
+
+    def describe(self):
+        return f"{self.name}(aging_rate={self.aging_rate})"
+
+
+# Round robin: FIFO plus a fixed time slice
+@register_policy("rr")
+class RoundRobinPolicy(FCFSPolicy):
+    def __init__(self, quantum=2):
+        if quantum <= 0:
+            raise ValueError("Quantum must be positive.")
+        self.time_slice = quantum
+
+    def quantum(self, i):
+        return self.time_slice
+
+    def describe(self):
+        return f"{self.name}(quantum={self.time_slice})"
+
+
+# Multilevel feedback queue. Arrivals enter level 0; a job that uses up its
+# level's quantum drops one level. The last level has no quantum (FCFS). A job
+# arriving at a higher level preempts a job running at a lower one.
+@register_policy("mlfq")
+class MLFQPolicy(Policy):
+    preemptive = True
+
+    def __init__(self, quanta=(8, 16)):
+        if isinstance(quanta, (int, float)):
+            quanta = (quanta,)
+        if any(q <= 0 for q in quanta):
+            raise ValueError("Quanta must be positive.")
+        self.quanta = tuple(quanta)
+
+    def reset(self, arrival, burst, priority):
+        super().reset(arrival, burst, priority)
+        self.levels = [deque() for _ in range(len(self.quanta) + 1)]
+        self.size = 0
+        self.running = -1
+        self.running_level = 0
+
+    def __len__(self):
+        return self.size
+
+    def admit(self, i, now):
+        self.levels[0].append(i)
+        self.size += 1
+
+    # A job migrated from another CPU's queues starts again at level 0
+    def requeue(self, i, remaining, now, expired):
+        level = self.running_level if i == self.running else 0
+        if expired and level < len(self.quanta):
+            level += 1
+        self.levels[level].append(i)
+        self.size += 1
+
+    def pop(self, now):
+        self.running, self.running_level = self._take()
+        return self.running
+
+    def peek(self):
+        for queue in self.levels:
+            if queue:
+                return queue[0]
+        raise IndexError("peek at an empty ready queue")
+
+    # Like pop, but leaves the level of this CPU's running job alone
+    def steal(self, now):
+        return self._take()[0]
+
+    def _take(self):
+        for level, queue in enumerate(self.levels):
+            if queue:
+                self.size -= 1
+                return queue.popleft(), level
+        raise IndexError("pop from an empty ready queue")
+
+    def quantum(self, i):
+        if self.running_level < len(self.quanta):
+            return self.quanta[self.running_level]
+        return None
+
+    # Only arrivals can outrank the running job, and they always land on level 0
+    def preempts(self, running, remaining, now):
+        return self.running_level > 0 and bool(self.levels[0])
+
+    def describe(self):
+        return f"{self.name}(quanta={','.join(str(q) for q in self.quanta)})"
+
+
+# Completely fair scheduling, after Linux CFS. Priority is read as a nice value
+# (clamped to -20..19) and sets the job's weight. A job's virtual runtime grows
+# by NICE_0_WEIGHT / weight per unit of CPU it gets, and the job with the
+# least vruntime runs next, from a heap keyed by (vruntime, arrival, index),
+# so CPU time is shared in proportion to weight at O(log n) a pick.
+#
+# Slices split target_latency over the runnable jobs by weight, but never go
+# below min_granularity (with many jobs the period stretches instead). New
+# and migrated jobs start at the queue's min_vruntime, so time spent waiting
+# or on another CPU is not banked as credit. An arrival preempts the running
+# job once the running job's vruntime leads by more than wakeup_granularity.
+#
+# Per-job state is keyed by job and dropped on completion, so the online
+# scheduler's growing id space works too. Whenever the queue runs dry,
+# vruntimes start again from zero: each busy period is scheduled as if the run
+# began there, which is what incremental rescheduling relies on.
+@register_policy("cfs")
+class FairPolicy(Policy):
+    preemptive = True
+
+    def __init__(self, target_latency=6.0, min_granularity=0.75, wakeup_granularity=1.0):
+        if target_latency <= 0 or min_granularity <= 0:
+            raise ValueError("Target latency and minimum granularity must be positive.")
+        if wakeup_granularity < 0:
+            raise ValueError("Wakeup granularity must be non-negative.")
+        self.target_latency = target_latency
+        self.min_granularity = min_granularity
+        self.wakeup_granularity = wakeup_granularity
+
+    def reset(self, arrival, burst, priority):
+        super().reset(arrival, burst, priority)
+        self.heap = []
+        self.weights = {}
+        self.vruntime = {}
+        # Burst left when the job was last dispatched
+        self.left = {}
+        # Summed weight of the queued jobs, for slice lengths
+        self.queued_weight = 0
+        # Never moves backwards within a busy period, so new jobs cannot be placed behind old ones
+        self.min_vruntime = 0.0
+        self.running = -1
+        self.dispatched_at = 0.0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def _enqueue(self, i, vruntime):
+        self.vruntime[i] = vruntime
+        self.queued_weight += self.weights[i]
+        heapq.heappush(self.heap, (vruntime, self.arrival[i], i))
+
+    # The running job's vruntime if it ran from dispatch until now
+    def _current(self, i, ran):
+        return self.vruntime[i] + ran * NICE_0_WEIGHT / self.weights[i]
+
+    def _update_min(self, now):
+        least = self.heap[0][0] if self.heap else None
+        if self.running >= 0:
+            ran = min(max(now - self.dispatched_at, 0.0), self.left[self.running])
+            current = self._current(self.running, ran)
+            least = current if least is None or current < least else least
+        if least is not None and least > self.min_vruntime:
+            self.min_vruntime = least
+
+    # A job joining from outside this queue, placed at min_vruntime
+    def _place(self, i, remaining, now):
+        self._update_min(now)
+        self.weights[i] = nice_weight(self.priority[i])
+        self.left[i] = remaining
+        self._enqueue(i, self.min_vruntime)
+
+    def _forget(self, i):
+        del self.weights[i], self.vruntime[i], self.left[i]
+        # Idle: the next busy period starts from zero
+        if not self.heap and self.running < 0:
+            self.min_vruntime = 0.0
+
+    def admit(self, i, now):
+        self._place(i, self.burst[i], now)
+
+    def requeue(self, i, remaining, now, expired):
+        if i != self.running:
+            # Stolen from another CPU's queue: its vruntime there means nothing here
+            self._place(i, remaining, now)
+            return
+        vruntime = self._current(i, self.left[i] - remaining)
+        self.running = -1
+        self.left[i] = remaining
+        self._enqueue(i, vruntime)
+
+    def complete(self, i, now):
+        if i == self.running:
+            self.running = -1
+        self._forget(i)
+
+    def steal(self, now):
+        _, _, i = heapq.heappop(self.heap)
+        self.queued_weight -= self.weights[i]
+        self._forget(i)
+        return i
+
+    def pop(self, now):
+        vruntime, _, i = heapq.heappop(self.heap)
+        self.queued_weight -= self.weights[i]
+        if vruntime > self.min_vruntime:
+            self.min_vruntime = vruntime
+        self.running = i
+        self.dispatched_at = now
+        return i
+
+    def peek(self):
+        return self.heap[0][2]
+
+    # The running job's share of target_latency, stretched to min_granularity
+    # per runnable job once there are too many to fit
+    def quantum(self, i):
+        weight = self.weights[i]
+        period = max(self.target_latency, (len(self.heap) + 1) * self.min_granularity)
+        return max(period * weight / (self.queued_weight + weight), self.min_granularity)
+
+    def preempts(self, running, remaining, now):
+        if not self.heap:
+            return False
+        vruntime, _, i = self.heap[0]
+        # The granularity is wall time, in the waking job's vruntime units
+        granularity = self.wakeup_granularity * NICE_0_WEIGHT / self.weights[i]
+        return vruntime + granularity < self._current(running, self.left[running] - remaining)
+
+    def describe(self):
+        return (f"{self.name}(target_latency={self.target_latency}, min_granularity={self.min_granularity}, "
+                f"wakeup_granularity={self.wakeup_granularity})")
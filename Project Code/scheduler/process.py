@@ -0,0 +1,149 @@
+from .devices import io_summary, simulate_io
+from .instrument import phase
+from .metrics import timeline_summary
+from .policies import Policy, get_policy
+
+
+# Define process class. bursts, if given, alternates CPU and I/O bursts (see
+# devices.simulate_io); burst_time then defaults to the total CPU time.
+class Process:
+    __slots__ = ("pid", "priority", "arrival_time", "burst_time", "bursts",
+                 "waiting_time", "turnaround_time", "response_time")
+
+    def __init__(self, pid, priority, arrival_time, burst_time=None, bursts=None):
+        self.pid = pid
+        self.priority = priority
+        self.arrival_time = arrival_time
+        if burst_time is None:
+            if bursts is None:
+                raise ValueError("A process needs a burst time or a burst sequence.")
+            burst_time = sum(bursts[0::2])
+        self.burst_time = burst_time
+        self.bursts = bursts
+        self.waiting_time = 0
+        self.turnaround_time = 0
+        self.response_time = 0
+
+    # Summed I/O burst lengths; an I/O burst is a length or a (device name, length) pair
+    @property
+    def io_time(self):
+        if self.bursts is None:
+            return 0
+        return sum(burst[1] if isinstance(burst, (tuple, list)) else burst for burst in self.bursts[1::2])
+
+    # Waiting time for a given turnaround. Time on a device isn't waiting; time queued for one is.
+    def waiting(self, turnaround):
+        return turnaround - self.burst_time - self.io_time
+
+
+# Define the CPU scheduler; policy is a registered policy name or a Policy
+# instance, cpus > 1 simulates that many cores with per-core run queues, the
+# costs are charged as in engine.simulate, and a ResultCache as cache reuses
+# earlier runs of the same workload. Processes with burst sequences are run
+# by devices.simulate_io on the given devices instead, which supports neither
+# several CPUs, switch costs nor the cache; asking for them raises ValueError.
+class Scheduler:
+    def __init__(self, policy="priority", cpus=1, migration_cost=0.0, cache=None, switch_cost=0.0,
+                 dispatch_latency=0.0, devices=None, **params):
+        if not isinstance(policy, Policy):
+            policy = get_policy(policy, **params)
+        self.policy = policy
+        self.cpus = cpus
+        self.migration_cost = migration_cost
+        self.switch_cost = switch_cost
+        self.dispatch_latency = dispatch_latency
+        self.cache = cache
+        self.devices = devices
+        self.processes = []
+
+    def add_process(self, process):
+        self.processes.append(process)
+
+    # progress is passed through to engine.simulate (see there). Instrument
+    # observers see the "load", "dispatch" and "metrics" phases of every run.
+    # The run goes through a ProcessTable, kept as self.table (in input order)
+    # with its summary as self.summary, so views can show it without copying
+    # the processes again; the processes get their metrics from its columns.
+    def schedule(self, progress=None):
+        # NumPy comes in with the table, on the first run rather than on import
+        from .table import ProcessTable
+
+        processes = self.processes
+        with phase("load"):
+            table = ProcessTable(
+                [p.pid for p in processes],
+                [p.priority for p in processes],
+                [p.arrival_time for p in processes],
+                [p.burst_time for p in processes],
+            )
+            io = any(p.bursts is not None for p in processes)
+        if io:
+            if self.cpus > 1:
+                raise ValueError("Processes with I/O bursts run on a single CPU.")
+            if self.switch_cost or self.dispatch_latency:
+                raise ValueError("Switch cost and dispatch latency are not modelled for processes with I/O bursts.")
+            if self.cache is not None:
+                raise ValueError("Runs of processes with I/O bursts are not cached.")
+            bursts = [p.bursts if p.bursts is not None else [p.burst_time] for p in processes]
+            with phase("dispatch"):
+                result = simulate_io(table.arrival.tolist(), bursts, table.priority.tolist(), self.policy, self.devices)
+            if progress is not None:
+                progress(len(result.order), len(processes), result.order, result.start, result.finish)
+            with phase("metrics"):
+                # Time on a device isn't waiting, so the waiting column can't come from turnaround - burst
+                table.result = result
+                table.finish[:] = result.finish
+                table.turnaround[:] = table.finish - table.arrival
+                table.waiting[:] = [p.waiting(t) for p, t in zip(processes, table.turnaround.tolist())]
+                table.response[:] = result.start
+                table.response -= table.arrival
+                self.summary = table.summary()
+        else:
+            self.summary = table.schedule(self.policy, cpus=self.cpus, migration_cost=self.migration_cost,
+                                          switch_cost=self.switch_cost, dispatch_latency=self.dispatch_latency,
+                                          cache=self.cache, progress=progress)
+            result = table.result
+
+        with phase("metrics"):
+            columns = zip(processes, table.waiting.tolist(), table.turnaround.tolist(), table.response.tolist())
+            for process, waiting, turnaround, response in columns:
+                process.waiting_time = waiting
+                process.turnaround_time = turnaround
+                process.response_time = response
+
+            # List the processes in first-dispatch order; jobs keeps the input order the result is indexed by
+            self.processes = [processes[i] for i in result.order]
+            self.jobs = processes
+            self.result = result
+            self.table = table
+
+            # Calculate average times
+            self.avg_waiting_time = float(table.waiting.mean())
+            self.avg_turnaround_time = float(table.turnaround.mean())
+            self.avg_response_time = float(table.response.mean())
+
+            # Utilization, throughput, idle time and switch count for the whole run
+            self.timeline = timeline_summary(result)
+            # Device utilization and the throughput gained from overlapping I/O, for runs with I/O
+            self.io = io_summary(result) if io else None
+
+    def segments(self):
+        # (start, end, process, kind) for every segment, in timeline order; process is None when idle
+        jobs = self.jobs
+        for start, end, i, kind in self.result.segments():
+            yield start, end, jobs[i] if i >= 0 else None, kind
+
+
+# Priority scheduling; mode is "non-preemptive", "preemptive" or "srtf" (shortest remaining time first)
+class PriorityScheduler(Scheduler):
+    MODES = {
+        "non-preemptive": "priority",
+        "preemptive": "preemptive-priority",
+        "srtf": "srtf",
+    }
+
+    def __init__(self, mode="non-preemptive"):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown scheduling mode: {mode}")
+        super().__init__(self.MODES[mode])
+        self.mode = mode
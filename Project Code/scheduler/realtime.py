@@ -0,0 +1,400 @@
+# Periodic and sporadic real-time tasks under EDF or rate-monotonic
+# scheduling, with deadline-miss analytics.
+#
+# A task releases a job every period; a sporadic task waits at least period
+# between releases and up to max_delay more, drawn from its own seeded
+# stream. Each job needs cost units of CPU within deadline of its release.
+# Releases are generated on the fly from one heap holding each task's next
+# release, so a run keeps O(tasks) release state however many jobs a long
+# hyperperiod covers; only released, unfinished jobs sit in the ready heap.
+#
+# Both dispatchers are preemptive: a release that outranks the running job
+# takes the CPU. Late jobs still run to completion. The run stops at horizon;
+# jobs unfinished by then count as missed when their deadline has passed and
+# as pending otherwise.
+# fractions and random are imported where used, keeping "import scheduler" cheap.
+import heapq
+import math
+
+from .metrics import PERCENTILES, percentile_name
+from .segments import IDLE, RUN, SegmentLog, new_columns
+from .sketches import QuantileSketch
+
+REALTIME_METRICS = ("response_time", "tardiness")
+
+
+class Task:
+    def __init__(self, period, cost, deadline=None, phase=0.0, max_delay=0.0, name=None, seed=0):
+        if period <= 0 or cost <= 0:
+            raise ValueError("Period and cost must be positive.")
+        if deadline is not None and deadline <= 0:
+            raise ValueError("Deadline must be positive.")
+        if phase < 0 or max_delay < 0:
+            raise ValueError("Phase and max delay must be non-negative.")
+        self.period = period
+        self.cost = cost
+        # Implicit deadline: each job is due by the next release
+        self.deadline = period if deadline is None else deadline
+        self.phase = phase
+        self.max_delay = max_delay
+        self.name = name
+        self.seed = seed
+
+    @property
+    def sporadic(self):
+        return self.max_delay > 0
+
+    @property
+    def utilization(self):
+        return self.cost / self.period
+
+    @property
+    def density(self):
+        return self.cost / min(self.deadline, self.period)
+
+    # Release times, without end
+    def releases(self):
+        if not self.sporadic:
+            # Multiples of the period rather than a running sum, so long runs don't drift
+            k = 0
+            while True:
+                yield self.phase + k * self.period
+                k += 1
+        import random
+
+        rng = random.Random(self.seed)
+        t = self.phase
+        while True:
+            yield t
+            t += self.period + rng.uniform(0, self.max_delay)
+
+    def __repr__(self):
+        return (f"Task(period={self.period}, cost={self.cost}, deadline={self.deadline}, phase={self.phase}, "
+                f"max_delay={self.max_delay}, name={self.name!r})")
+
+
+# Least common multiple of the periods. Periods are read as the decimals they
+# print as (0.1 is 1/10), so the result is exact for the usual task sets.
+def hyperperiod(tasks):
+    from fractions import Fraction
+
+    numerator, denominator = 1, 0
+    for task in tasks:
+        period = Fraction(str(task.period))
+        numerator = math.lcm(numerator, period.numerator)
+        denominator = math.gcd(denominator, period.denominator)
+    return numerator / denominator
+
+
+# Earliest deadline first: ready jobs ordered by absolute deadline
+class EDFDispatcher:
+    name = "edf"
+
+    def key(self, index, task, release, deadline):
+        return deadline
+
+
+# Rate monotonic: fixed priorities, shorter period first
+class RateMonotonicDispatcher:
+    name = "rm"
+
+    def key(self, index, task, release, deadline):
+        return task.period
+
+
+DISPATCHERS = {dispatcher.name: dispatcher for dispatcher in (EDFDispatcher, RateMonotonicDispatcher)}
+
+
+def get_dispatcher(name):
+    try:
+        return DISPATCHERS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown real-time dispatcher: {name}") from None
+
+
+# Worst-case response time of each task under fixed priorities in list order
+# (highest first), by the usual fixed-point iteration
+#   R = C_i + sum over higher-priority j of ceil(R / T_j) * C_j
+# None where R exceeds the task's deadline. Exact for D <= T.
+def response_time_analysis(tasks):
+    times = []
+    for i, task in enumerate(tasks):
+        higher = tasks[:i]
+        response = task.cost + sum(other.cost for other in higher)
+        while response <= task.deadline:
+            demand = task.cost + sum(math.ceil(response / other.period) * other.cost for other in higher)
+            if demand == response:
+                break
+            response = demand
+        times.append(response if response <= task.deadline else None)
+    return times
+
+
+# Schedulability of a task set from utilization bounds and, for rate
+# monotonic, response-time analysis. A check that can't decide gives None.
+#
+#   edf_schedulable     U <= 1, exact when no deadline is shorter than its
+#                       period; otherwise density <= 1, which is sufficient
+#   liu_layland_ok      U <= n (2^(1/n) - 1), sufficient for RM
+#   hyperbolic_ok       prod(U_i + 1) <= 2, a tighter sufficient RM test
+#   rm_schedulable      response-time analysis (exact for D <= T)
+def utilization_checks(tasks):
+    tasks = list(tasks)
+    n = len(tasks)
+    utilization = math.fsum(task.utilization for task in tasks)
+    density = math.fsum(task.density for task in tasks)
+    if all(task.deadline >= task.period for task in tasks):
+        edf = utilization <= 1
+    else:
+        edf = True if density <= 1 else (False if utilization > 1 else None)
+    bound = n * (2 ** (1 / n) - 1) if n else 1.0
+    rm = None
+    if all(task.deadline <= task.period for task in tasks):
+        rm = all(time is not None for time in response_time_analysis(rate_monotonic_order(tasks)))
+    return {
+        "tasks": n,
+        "utilization": utilization,
+        "density": density,
+        "edf_schedulable": edf,
+        "liu_layland_bound": bound,
+        "liu_layland_ok": utilization <= bound,
+        "hyperbolic_ok": math.prod(task.utilization + 1 for task in tasks) <= 2,
+        "rm_schedulable": rm,
+    }
+
+
+# Tasks from a CSV file with period and cost columns; deadline, phase,
+# max_delay, name and seed are optional. "-" reads stdin.
+def load_tasks(path):
+    import csv
+    import sys
+
+    f = sys.stdin if path == "-" else open(path, newline="")
+    try:
+        tasks = []
+        reader = csv.DictReader(f)
+        for row in reader:
+            line = reader.line_num
+
+            def number(name, required=False):
+                value = (row.get(name) or "").strip()
+                if not value:
+                    if required:
+                        raise ValueError(f"Line {line}: missing {name} column.")
+                    return None
+                try:
+                    return float(value)
+                except ValueError:
+                    raise ValueError(f"Line {line}: {name} value {value!r} is not a valid number.") from None
+
+            fields = {"deadline": number("deadline"), "phase": number("phase") or 0.0,
+                      "max_delay": number("max_delay") or 0.0, "seed": int(number("seed") or 0)}
+            period = number("period", True)
+            cost = number("cost", True)
+            try:
+                task = Task(period, cost, name=row.get("name") or None, **fields)
+            except ValueError as e:
+                raise ValueError(f"Line {line}: {e}") from None
+            tasks.append(task)
+        return tasks
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def rate_monotonic_order(tasks):
+    return sorted(tasks, key=lambda task: task.period)
+
+
+class RealtimeResult:
+    def __init__(self, tasks, dispatcher, horizon, log, busy, released, completed, missed, pending,
+                 max_lateness, max_response, sketches):
+        self.tasks = tasks
+        self.dispatcher = dispatcher
+        self.horizon = horizon
+        # Segment log; the job column holds the task index. None when not recorded.
+        self.log = log
+        self.busy = busy
+        # Per-task job counts and worst cases
+        self.released = released
+        self.completed = completed
+        self.missed = missed
+        self.pending = pending
+        self.max_lateness = max_lateness
+        self.max_response = max_response
+        # {metric: QuantileSketch} over every completed job, see REALTIME_METRICS
+        self.sketches = sketches
+
+    @property
+    def jobs(self):
+        return sum(self.released)
+
+    # Missed over decided jobs (completed ones plus those unfinished past their deadline)
+    @property
+    def miss_ratio(self):
+        decided = self.jobs - sum(self.pending)
+        return sum(self.missed) / decided if decided else 0.0
+
+    # Share of the horizon the CPU spent running jobs
+    @property
+    def utilization(self):
+        return self.busy / self.horizon if self.horizon else 0.0
+
+    def summary(self):
+        summary = {"dispatcher": self.dispatcher, "horizon": self.horizon, "jobs": self.jobs,
+                   "completed": sum(self.completed), "missed": sum(self.missed), "pending": sum(self.pending),
+                   "miss_ratio": self.miss_ratio, "cpu_utilization": self.utilization,
+                   "max_lateness": max((value for value in self.max_lateness if not math.isnan(value)),
+                                       default=math.nan)}
+        for name in REALTIME_METRICS:
+            sketch = self.sketches[name]
+            summary[f"avg_{name}"] = sketch.mean
+            summary[f"max_{name}"] = sketch.max if sketch.count else math.nan
+            for q in PERCENTILES:
+                summary[f"{percentile_name(q)}_{name}"] = sketch.quantile(q / 100)
+        summary.update(utilization_checks(self.tasks))
+        return summary
+
+    # One row per task, with its response-time bound under rate monotonic
+    def task_summaries(self):
+        bounds = {}
+        if all(task.deadline <= task.period for task in self.tasks):
+            ordered = rate_monotonic_order(self.tasks)
+            bounds = dict(zip(map(id, ordered), response_time_analysis(ordered)))
+        rows = []
+        for i, task in enumerate(self.tasks):
+            decided = self.released[i] - self.pending[i]
+            rows.append({"task": task.name if task.name is not None else i, "period": task.period,
+                         "cost": task.cost, "deadline": task.deadline, "utilization": task.utilization,
+                         "released": self.released[i], "completed": self.completed[i],
+                         "missed": self.missed[i], "pending": self.pending[i],
+                         "miss_ratio": self.missed[i] / decided if decided else 0.0,
+                         "max_response_time": self.max_response[i], "max_lateness": self.max_lateness[i],
+                         "rm_response_bound": bounds.get(id(task))})
+        return rows
+
+
+# Run tasks from time 0 to horizon (default: the latest phase plus one
+# hyperperiod; sporadic task sets need an explicit horizon). record=False
+# skips the segment log for very long runs.
+def simulate_realtime(tasks, dispatcher="edf", horizon=None, record=True, relative_accuracy=0.01):
+    tasks = list(tasks)
+    if isinstance(dispatcher, str):
+        dispatcher = get_dispatcher(dispatcher)
+    if horizon is None:
+        if any(task.sporadic for task in tasks):
+            raise ValueError("Sporadic task sets need an explicit horizon.")
+        horizon = max((task.phase for task in tasks), default=0.0) + hyperperiod(tasks) if tasks else 0.0
+    key = dispatcher.key
+    n = len(tasks)
+    released = [0] * n
+    completed = [0] * n
+    missed = [0] * n
+    pending = [0] * n
+    # NaN until the task completes a job
+    max_lateness = [math.nan] * n
+    max_response = [0.0] * n
+    response_sketch = QuantileSketch(relative_accuracy)
+    tardiness_sketch = QuantileSketch(relative_accuracy)
+    if record:
+        log_start, log_end, log_job, log_cpu, log_kind = columns = new_columns()
+
+    # (next release, task index) for every task, and the task's release stream
+    streams = [task.releases() for task in tasks]
+    releases = [(next(stream), i) for i, stream in enumerate(streams)]
+    heapq.heapify(releases)
+    # Ready jobs as [key, release, task index, sequence, deadline, remaining]
+    ready = []
+    sequence = 0
+
+    def release_due(now):
+        nonlocal sequence
+        while releases and releases[0][0] <= now:
+            t, i = heapq.heappop(releases)
+            if t >= horizon:
+                # Streams are increasing, so this task is done releasing
+                continue
+            task = tasks[i]
+            deadline = t + task.deadline
+            heapq.heappush(ready, [key(i, task, t, deadline), t, i, sequence, deadline, task.cost])
+            sequence += 1
+            released[i] += 1
+            heapq.heappush(releases, (next(streams[i]), i))
+
+    now = 0.0
+    busy = 0.0
+    running = None
+    while True:
+        if running is None:
+            release_due(now)
+        next_release = releases[0][0] if releases and releases[0][0] < horizon else math.inf
+        if running is None:
+            if not ready:
+                # Nothing to run: idle until the next release, or out to the horizon
+                idle_until = min(next_release, horizon)
+                if record and idle_until > now:
+                    log_start.append(now)
+                    log_end.append(idle_until)
+                    log_job.append(-1)
+                    log_kind.append(IDLE)
+                now = idle_until
+                if now >= horizon:
+                    break
+                continue
+            running = heapq.heappop(ready)
+            since = now
+
+        job_key, release, i, _, deadline, left = running
+        end = min(since + left, horizon)
+        if next_release < end:
+            # Run up to the release, then let the new job compete
+            now = next_release
+            release_due(now)
+            if not (ready and ready[0] < running):
+                continue
+            end = now
+        if record and end > since:
+            log_start.append(since)
+            log_end.append(end)
+            log_job.append(i)
+            log_kind.append(RUN)
+        busy += end - since
+        running[5] = left - (end - since)
+        now = end
+        if end == since + left:
+            lateness = now - deadline
+            response = now - release
+            completed[i] += 1
+            if lateness > 0:
+                missed[i] += 1
+            if completed[i] == 1 or lateness > max_lateness[i]:
+                max_lateness[i] = lateness
+            if response > max_response[i]:
+                max_response[i] = response
+            response_sketch.add(response)
+            tardiness_sketch.add(lateness if lateness > 0 else 0.0)
+        elif now < horizon:
+            # Preempted by a release
+            heapq.heappush(ready, running)
+        else:
+            break
+        running = None
+        if now >= horizon:
+            break
+
+    # Jobs left at the horizon: missed once their deadline has gone by, undecided otherwise
+    if running is not None:
+        ready.append(running)
+    for _, _, i, _, deadline, _ in ready:
+        if deadline <= horizon:
+            missed[i] += 1
+        else:
+            pending[i] += 1
+
+    log = None
+    if record:
+        log_cpu.frombytes(bytes(log_cpu.itemsize * len(log_start)))
+        log = SegmentLog(*columns)
+    sketches = {"response_time": response_sketch, "tardiness": tardiness_sketch}
+    return RealtimeResult(tasks, dispatcher.name, horizon, log, busy, released, completed, missed, pending,
+                          max_lateness, max_response, sketches)
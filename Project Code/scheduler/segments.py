@@ -0,0 +1,96 @@
+# Typed log of everything a run's CPUs did, one row per segment:
+#
+#   start, end  float64   when the segment began and ended
+#   job         int32     job index, or -1 for idle time
+#   cpu         int16     CPU the segment ran on (0 on a single core)
+#   kind        int8      RUN, IDLE or SWITCH (dispatch, switch and migration overhead)
+#
+# 23 bytes a segment. The engines append to plain growable arrays while they
+# run and wrap them once at the end; the log then only hands out read-only
+# memoryviews, so nothing downstream can change a finished run's timeline
+# and NumPy can view every column without a copy.
+# numpy is imported where used, keeping "import scheduler" cheap.
+from array import array
+
+RUN = 0
+IDLE = 1
+SWITCH = 2
+KINDS = ("run", "idle", "switch")
+
+TYPECODES = ("d", "d", "i", "h", "b")
+COLUMNS = ("start", "end", "job", "cpu", "kind")
+
+
+def new_columns():
+    return tuple(array(typecode) for typecode in TYPECODES)
+
+
+class SegmentLog:
+    def __init__(self, start=None, end=None, job=None, cpu=None, kind=None):
+        columns = (start, end, job, cpu, kind)
+        if start is None:
+            columns = new_columns()
+        self._arrays = columns
+        self.start, self.end, self.job, self.cpu, self.kind = (memoryview(column).toreadonly() for column in columns)
+
+    # Runs from a single CPU with the gaps between them filled in as idle time,
+    # starting from time 0
+    @classmethod
+    def from_runs(cls, start, end, job):
+        columns = new_columns()
+        log_start, log_end, log_job, log_cpu, log_kind = (column.append for column in columns)
+        now = 0.0
+        for s, e, j in zip(start, end, job):
+            if s > now:
+                log_start(now)
+                log_end(s)
+                log_job(-1)
+                log_cpu(0)
+                log_kind(IDLE)
+            log_start(s)
+            log_end(e)
+            log_job(j)
+            log_cpu(0)
+            log_kind(RUN)
+            now = e
+        return cls(*columns)
+
+    def __len__(self):
+        return len(self.start)
+
+    def __iter__(self):
+        # (start, end, job, cpu, kind) in log order
+        return zip(self.start, self.end, self.job, self.cpu, self.kind)
+
+    # The underlying arrays, for writers that want the raw bytes
+    def arrays(self):
+        return dict(zip(COLUMNS, self._arrays))
+
+    def nbytes(self):
+        return sum(column.itemsize * len(column) for column in self._arrays)
+
+    # Segments of one kind, counted over a NumPy view of the kind column
+    def count(self, kind=RUN):
+        import numpy as np
+
+        return int(np.count_nonzero(np.frombuffer(self.kind, dtype=np.int8) == kind))
+
+    # Summed length of the segments of one kind, as a masked sum over the columns
+    def total(self, kind=RUN):
+        import numpy as np
+
+        chosen = np.frombuffer(self.kind, dtype=np.int8) == kind
+        start = np.frombuffer(self.start, dtype=np.float64)
+        end = np.frombuffer(self.end, dtype=np.float64)
+        # Lengths first: summing the endpoints apart would cancel badly on long runs
+        return float(np.sum(end[chosen] - start[chosen]))
+
+    # (start, end, job, kind) in log order, for one CPU or for all of them
+    def segments(self, cpu=None):
+        if cpu is None:
+            return zip(self.start, self.end, self.job, self.kind)
+        return ((s, e, j, k) for s, e, j, c, k in self if c == cpu)
+
+    # (start, end, job) of the stretches a job actually ran
+    def runs(self, cpu=None):
+        return ((s, e, j) for s, e, j, k in self.segments(cpu) if k == RUN)
@@ -0,0 +1,195 @@
+import math
+
+# Values within this of zero are counted as exact zeros (zero waiting time is common)
+ZERO = 1e-9
+# grouped() counts every (group, bucket) pair in one flat array while it has
+# at most this many cells, and falls back to one pass per group beyond that
+MAX_DENSE_CELLS = 1 << 21
+
+
+# Log-bucketed quantile sketch (DDSketch style). Each value lands in bucket
+# ceil(log_gamma(value)), so any quantile comes back within relative_accuracy
+# of the true value. Memory is one counter per occupied bucket, independent of
+# how many values were added, and two sketches with the same accuracy merge by
+# adding counters. Negative values get their own store, bucketed by magnitude,
+# so they keep the same relative accuracy instead of collapsing into zero.
+# Mean and variance are kept alongside (Welford / Chan), so they merge exactly too.
+class QuantileSketch:
+    def __init__(self, relative_accuracy=0.01):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("Relative accuracy must be between 0 and 1.")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins = {}
+        self.negative_bins = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        # Running mean and sum of squared deviations from it
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        delta = value - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (value - self._mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value > ZERO:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self.bins[key] = self.bins.get(key, 0) + 1
+        elif value < -ZERO:
+            key = math.ceil(math.log(-value) / self._log_gamma)
+            self.negative_bins[key] = self.negative_bins.get(key, 0) + 1
+        else:
+            self.zero_count += 1
+
+    # Add a whole NumPy array at once: one log and one bincount, no sort
+    def add_many(self, values):
+        import numpy as np
+
+        values = np.asarray(values, dtype=np.float64)
+        if not len(values):
+            return self
+        mean = float(values.mean())
+        batch = QuantileSketch(self.relative_accuracy)
+        batch.count = len(values)
+        batch.total = float(values.sum())
+        batch.min = float(values.min())
+        batch.max = float(values.max())
+        batch._mean = mean
+        batch._m2 = float(np.square(values - mean).sum())
+        positive = values[values > ZERO]
+        negative = values[values < -ZERO]
+        batch.zero_count = len(values) - len(positive) - len(negative)
+        batch.bins = self._bucket(positive)
+        batch.negative_bins = self._bucket(-negative)
+        return self.merge(batch)
+
+    # {bucket: count} for an array of positive values
+    def _bucket(self, values):
+        import numpy as np
+
+        if not len(values):
+            return {}
+        keys = np.ceil(np.log(values) / self._log_gamma).astype(np.int64)
+        low = int(keys.min())
+        counts = np.bincount(keys - low)
+        occupied = np.flatnonzero(counts)
+        return dict(zip((occupied + low).tolist(), counts[occupied].tolist()))
+
+    @classmethod
+    def from_values(cls, values, relative_accuracy=0.01):
+        return cls(relative_accuracy).add_many(values)
+
+    # One sketch per distinct group (e.g. priority class) of a values array,
+    # as {group: sketch}. Groups are non-negative integers.
+    @classmethod
+    def grouped(cls, values, groups, relative_accuracy=0.01):
+        import numpy as np
+
+        values = np.asarray(values, dtype=np.float64)
+        groups = np.asarray(groups, dtype=np.int64)
+        if not len(values):
+            return {}
+        # Nonzero values are bucketed by magnitude; each group gets a positive
+        # and a negative row of buckets
+        nonzero = np.abs(values) > ZERO
+        keys = np.ceil(np.log(np.abs(values[nonzero])) / cls(relative_accuracy)._log_gamma).astype(np.int64)
+        key_low = int(keys.min()) if len(keys) else 0
+        span = int(keys.max()) - key_low + 1 if len(keys) else 1
+        size = int(groups.max()) + 1
+        if groups.min() < 0 or 2 * size * span > MAX_DENSE_CELLS:
+            return {int(group): cls.from_values(values[groups == group], relative_accuracy)
+                    for group in np.unique(groups)}
+
+        # Per-group moments from weighted bincounts
+        count = np.bincount(groups, minlength=size)
+        present = np.flatnonzero(count)
+        total = np.bincount(groups, weights=values, minlength=size)
+        mean = np.divide(total, count, out=np.zeros(size), where=count > 0)
+        m2 = np.bincount(groups, weights=np.square(values - mean[groups]), minlength=size)
+        low = np.full(size, np.inf)
+        high = np.full(size, -np.inf)
+        np.minimum.at(low, groups, values)
+        np.maximum.at(high, groups, values)
+
+        # Bucket counts for every (group, bucket) pair in one flat bincount
+        zeros = np.bincount(groups[~nonzero], minlength=size)
+        rows = groups[nonzero] * 2 + (values[nonzero] < 0)
+        flat = np.bincount(rows * span + (keys - key_low), minlength=2 * size * span).reshape(size, 2, span)
+
+        sketches = {}
+        for group in present.tolist():
+            sketch = cls(relative_accuracy)
+            sketch.count = int(count[group])
+            sketch.total = float(total[group])
+            sketch.min = float(low[group])
+            sketch.max = float(high[group])
+            sketch._mean = float(mean[group])
+            sketch._m2 = float(m2[group])
+            sketch.zero_count = int(zeros[group])
+            for sign, bins in enumerate((sketch.bins, sketch.negative_bins)):
+                occupied = np.flatnonzero(flat[group, sign])
+                bins.update(zip((occupied + key_low).tolist(), flat[group, sign, occupied].tolist()))
+            sketches[group] = sketch
+        return sketches
+
+    def merge(self, other):
+        if other.gamma != self.gamma:
+            raise ValueError("Only sketches with the same accuracy can be merged.")
+        if not other.count:
+            return self
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        for key, count in other.negative_bins.items():
+            self.negative_bins[key] = self.negative_bins.get(key, 0) + count
+        count = self.count + other.count
+        delta = other._mean - self._mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self._mean += delta * other.count / count
+        self.zero_count += other.zero_count
+        self.count = count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else math.nan
+
+    # Population standard deviation
+    @property
+    def stddev(self):
+        return math.sqrt(self._m2 / self.count) if self.count else math.nan
+
+    def quantile(self, q):
+        if not self.count:
+            return math.nan
+        rank = q * (self.count - 1)
+        seen = 0
+        # Negatives first, largest magnitude first
+        for key in sorted(self.negative_bins, reverse=True):
+            seen += self.negative_bins[key]
+            if rank < seen:
+                return min(max(-self._value(key), self.min), self.max)
+        seen += self.zero_count
+        if rank < seen:
+            return min(max(0.0, self.min), self.max)
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if rank < seen:
+                return min(max(self._value(key), self.min), self.max)
+        return self.max
+
+    # Representative magnitude of a bucket, within relative_accuracy of all it holds
+    def _value(self, key):
+        return 2 * self.gamma ** key / (self.gamma + 1)
@@ -0,0 +1,174 @@
+# Parameter sweeps: (policy x parameter grid x trace shard) fanned out over a
+# process pool. The workload columns are copied once into a shared memory
+# block that every worker maps; tasks only carry the block's name and a row
+# range, so nothing proportional to the trace is ever pickled.
+import itertools
+import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from .metrics import METRICS, sketch_summary
+from .policies import get_policy
+from .table import ProcessTable
+
+# Column name, dtype; laid out back to back in the shared block
+LAYOUT = (("pid", np.int64), ("arrival", np.float64), ("burst", np.float64), ("priority", np.int32))
+
+
+def _views(buffer, n):
+    views = {}
+    offset = 0
+    for name, dtype in LAYOUT:
+        views[name] = np.ndarray(n, dtype=dtype, buffer=buffer, offset=offset)
+        offset += n * np.dtype(dtype).itemsize
+    return views
+
+
+# A ProcessTable's input columns in one shared memory block
+class SharedTable:
+    def __init__(self, table):
+        self.n = len(table)
+        size = sum(self.n * np.dtype(dtype).itemsize for _, dtype in LAYOUT)
+        self.shm = SharedMemory(create=True, size=max(size, 1))
+        for name, view in _views(self.shm.buf, self.n).items():
+            view[:] = getattr(table, name)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Worker side: each task maps the block, runs its shard and unmaps the block
+# again, so no worker holds a mapping past the task that needed it
+def _run_task(task):
+    name, n = task[:2]
+    shm = SharedMemory(name=name)
+    try:
+        return _run_shard(shm.buf, n, *task[2:])
+    except BaseException as e:
+        # A failed run's frames still hold views of the block; drop them so it can be closed
+        traceback.clear_frames(e.__traceback__)
+        raise
+    finally:
+        shm.close()
+
+
+def _run_shard(buffer, n, policy_name, params, cpus, costs, shard, lo, hi):
+    columns = _views(buffer, n)
+    # Slices of the shared columns are views, and ProcessTable keeps correctly typed contiguous arrays as is
+    table = ProcessTable(*(columns[key][lo:hi] for key in ("pid", "priority", "arrival", "burst")))
+    policy = get_policy(policy_name, **params)
+    summary = table.schedule(policy, cpus=cpus, **costs)
+    # The metric sketches travel back with the row so shards can be merged
+    return {"policy": policy.describe(), "shard": shard, **summary}, table.sketches
+
+
+def expand_grid(grid):
+    # {"quantum": [1, 2], "x": [3]} -> [{"quantum": 1, "x": 3}, {"quantum": 2, "x": 3}]
+    if not grid:
+        return [{}]
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def shard_bounds(n, shards):
+    edges = np.linspace(0, n, shards + 1).astype(np.int64)
+    return [(int(lo), int(hi)) for lo, hi in zip(edges[:-1], edges[1:]) if hi > lo]
+
+
+# Run every policy (with every combination from its grid) on every shard of
+# table. grids maps a policy name to {param: [values]}; shards split the trace
+# into contiguous row ranges, which should be in arrival order. costs holds
+# switch_cost / dispatch_latency / migration_cost for every run. Returns one
+# row per task, in task order, or with merge one row per policy and params.
+def run_sweep(table, policies, grids=None, shards=1, workers=None, cpus=1, merge=False, **costs):
+    grids = grids or {}
+    bounds = shard_bounds(len(table), shards)
+    with SharedTable(table) as shared:
+        tasks = [
+            (shared.name, shared.n, policy, params, cpus, costs, shard, lo, hi)
+            for policy in policies
+            for params in expand_grid(grids.get(policy))
+            for shard, (lo, hi) in enumerate(bounds)
+        ]
+        workers = workers or min(len(tasks), os.cpu_count() or 1)
+        with ProcessPoolExecutor(workers, mp_context=get_context("spawn")) as pool:
+            results = list(pool.map(_run_task, tasks))
+    if merge:
+        return merge_shards(results)
+    return [row for row, _ in results]
+
+
+# Columns summed across shards: each shard runs on CPUs of its own, so their
+# busy/overhead/idle times add up to the capacity of all of them together.
+# elapsed is not among them: shards can overlap in time, so the merged run
+# spans from the earliest first dispatch to the latest completion.
+SUMMED = ("count", "migrations", "context_switches", "busy_time", "overhead_time", "idle_time")
+# Recomputed from the sums: column -> (numerator, denominator columns)
+RATIOS = {
+    "utilization": ("busy_time", ("busy_time", "overhead_time", "idle_time")),
+    "overhead_fraction": ("overhead_time", ("busy_time", "overhead_time", "idle_time")),
+    "idle_fraction": ("idle_time", ("busy_time", "overhead_time", "idle_time")),
+    "throughput": ("count", ("elapsed",)),
+}
+
+
+# Fold (row, sketches) shard results into one row per (policy, params).
+# Counts, totals and maxima combine exactly and ratios are recomputed from the
+# totals. The metric columns (means, deviations, percentiles) are read off the
+# merged sketches, so the tails are those of the whole trace.
+def merge_shards(results):
+    merged = {}
+    sketches = {}
+    for row, row_sketches in results:
+        target = merged.setdefault(row["policy"], {"policy": row["policy"], "shards": 0})
+        target["shards"] += 1
+        if row_sketches is not None:
+            if row["policy"] in sketches:
+                for name, sketch in row_sketches.items():
+                    sketches[row["policy"]][name].merge(sketch)
+            else:
+                sketches[row["policy"]] = row_sketches
+        if "elapsed" in row:
+            # A shard's first dispatch is its last completion less its elapsed time
+            begin = row["makespan"] - row["elapsed"]
+            target["begin"] = min(target.get("begin", begin), begin)
+        for name, value in row.items():
+            if name == "elapsed":
+                target[name] = None
+            elif name.endswith(METRICS):
+                # Filled in from the merged sketches below
+                target[name] = None
+            elif name in SUMMED:
+                target[name] = target.get(name, 0) + value
+            elif name in RATIOS:
+                target[name] = None
+            elif name.startswith("max_") or name in ("makespan", "cpus"):
+                target[name] = max(target.get(name, value), value)
+            elif name == "min_utilization":
+                target[name] = min(target.get(name, value), value)
+    for policy, target in merged.items():
+        if "begin" in target:
+            target["elapsed"] = target["makespan"] - target.pop("begin")
+        if policy in sketches:
+            sketch_summary(sketches[policy], target)
+        for name in target:
+            if name in RATIOS:
+                numerator, denominator = RATIOS[name]
+                whole = sum(target.get(column, 0.0) for column in denominator)
+                target[name] = target.get(numerator, 0.0) / whole if whole else 0.0
+    return list(merged.values())
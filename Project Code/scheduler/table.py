@@ -0,0 +1,99 @@
+import numpy as np
+
+from .cache import cached_simulate
+from .instrument import phase
+from .metrics import metric_sketches, priority_summaries, summarize, timeline_summary
+from .policies import Policy, get_policy
+
+
+# Structure-of-arrays process table: one typed NumPy column per field instead
+# of one Process object per job. The three metric columns are rows of a single
+# (3, n) block so summaries reduce over all of them at once.
+class ProcessTable:
+    def __init__(self, pid, priority, arrival, burst):
+        # asarray keeps views (e.g. fields of a memory-mapped trace) as they are
+        self.pid = np.asarray(pid, dtype=np.int64)
+        self.priority = np.asarray(priority, dtype=np.int32)
+        self.arrival = np.asarray(arrival, dtype=np.float64)
+        self.burst = np.asarray(burst, dtype=np.float64)
+        n = len(self.pid)
+        if not (len(self.priority) == len(self.arrival) == len(self.burst) == n):
+            raise ValueError("All process columns must have the same length.")
+
+        self.metrics = np.zeros((3, n))
+        self.waiting = self.metrics[0]
+        self.turnaround = self.metrics[1]
+        self.response = self.metrics[2]
+        self.finish = np.zeros(n)
+        self.result = None
+        self.sketches = None
+
+    def __len__(self):
+        return len(self.pid)
+
+    @classmethod
+    def from_processes(cls, processes):
+        # Metric columns are copied too, so already scheduled processes keep their results
+        table = cls(
+            [p.pid for p in processes],
+            [p.priority for p in processes],
+            [p.arrival_time for p in processes],
+            [p.burst_time for p in processes],
+        )
+        table.waiting[:] = [p.waiting_time for p in processes]
+        table.turnaround[:] = [p.turnaround_time for p in processes]
+        table.response[:] = [p.response_time for p in processes]
+        table.finish = table.arrival + table.turnaround
+        return table
+
+    def validate(self):
+        if (self.arrival < 0).any():
+            raise ValueError("Arrival time must be non-negative.")
+        if (self.burst <= 0).any():
+            raise ValueError("Burst time must be positive.")
+
+    # cpus > 1 runs the multi-core engine (see scheduler.multicore); the costs
+    # are as for engine.simulate, cache and refresh as for cache.cached_simulate
+    def schedule(self, policy="priority", cpus=1, migration_cost=0.0, switch_cost=0.0, dispatch_latency=0.0,
+                 cache=None, refresh=False, progress=None, **params):
+        if not isinstance(policy, Policy):
+            policy = get_policy(policy, **params)
+
+        # Traces are normally stored in arrival order; only sort when they aren't
+        with phase("sort"):
+            if (self.arrival[1:] >= self.arrival[:-1]).all():
+                order = range(len(self))
+            else:
+                order = memoryview(np.argsort(self.arrival, kind="stable"))
+        # memoryviews hand the engine plain Python scalars without copying the columns
+        columns = (memoryview(self.arrival), memoryview(self.burst), memoryview(self.priority), policy)
+        result = cached_simulate(cache, *columns, cpus=cpus, migration_cost=migration_cost, switch_cost=switch_cost,
+                                 dispatch_latency=dispatch_latency, refresh=refresh, order=order, progress=progress)
+
+        with phase("metrics"):
+            start = np.frombuffer(result.start, dtype=np.float64)
+            self.finish = np.frombuffer(result.finish, dtype=np.float64)
+            np.subtract(self.finish, self.arrival, out=self.turnaround)
+            np.subtract(self.turnaround, self.burst, out=self.waiting)
+            np.subtract(start, self.arrival, out=self.response)
+            self.result = result
+            return self.summary()
+
+    # Aggregates of the last run; self.sketches keeps the per-metric sketches
+    # behind the percentiles so shards or repeated runs can be merged
+    def summary(self):
+        self.sketches = metric_sketches(self.metrics) if len(self) else None
+        summary = summarize(self.metrics, self.finish, self.sketches)
+        if self.result is None or not len(self):
+            return summary
+        summary.update(timeline_summary(self.result))
+        if hasattr(self.result, "cpus"):
+            # Least busy CPU's share of the makespan, costs included
+            summary["cpus"] = self.result.cpus
+            summary["min_utilization"] = min(self.result.utilization())
+            summary["migrations"] = self.result.migrations
+        return summary
+
+    # The same metric columns broken down by priority class, one row per class
+    def priority_summaries(self):
+        return priority_summaries(self.metrics, self.priority)
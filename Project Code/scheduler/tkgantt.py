@@ -0,0 +1,27 @@
+import tkinter as tk
+
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+from matplotlib.figure import Figure
+
+from .ganttview import InteractiveGantt
+
+
+# Zoomable Gantt chart in its own Toplevel. The figure is embedded with
+# FigureCanvasTkAgg rather than pyplot, so it shares the application's event
+# loop instead of blocking in plt.show(). Wheel zooms, drag pans, double-click
+# resets; the toolbar's pan/zoom tools work too.
+class GanttWindow(tk.Toplevel):
+    def __init__(self, master, result, pids=None, color="skyblue", title="Gantt Chart"):
+        super().__init__(master)
+        self.title(title)
+
+        self.figure = Figure(figsize=(8, 4), layout="constrained")
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self)
+        self.toolbar = NavigationToolbar2Tk(self.canvas, self, pack_toolbar=False)
+        self.toolbar.update()
+        self.toolbar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+
+        ax = self.figure.add_subplot()
+        ax.set_title(title)
+        self.gantt = InteractiveGantt(ax, result, pids, color)
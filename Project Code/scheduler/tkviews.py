@@ -0,0 +1,92 @@
+import tkinter as tk
+from tkinter import ttk
+
+import numpy as np
+
+from .views import RESULT_COLUMNS, format_cell, format_summary, sorted_order
+
+
+# Virtualized results table. The Treeview only ever holds the rows on screen;
+# the scrollbar drives an offset into the ProcessTable columns (or into a
+# sort permutation of them) and the visible rows are refilled on every move,
+# so the widget costs the same for fifty processes or fifty million.
+class ResultsTable(ttk.Frame):
+    def __init__(self, master, table, rows=20):
+        super().__init__(master)
+        self.table = table
+        self.rows = rows
+        self.offset = 0
+        self.order = None
+        self.sort_key = None
+        self.descending = False
+
+        keys = [key for key, _ in RESULT_COLUMNS]
+        self.tree = ttk.Treeview(self, columns=keys, show="headings", height=rows, selectmode="none")
+        for key, title in RESULT_COLUMNS:
+            self.tree.heading(key, text=title, command=lambda key=key: self.sort_by(key))
+            self.tree.column(key, width=90, anchor=tk.E)
+        self.items = [self.tree.insert("", tk.END) for _ in range(rows)]
+
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.on_scroll)
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+
+        self.tree.bind("<MouseWheel>", self.on_wheel)
+        self.tree.bind("<Button-4>", lambda event: self.scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda event: self.scroll_by(3))
+        self.refresh()
+
+    # Clicking a heading sorts by that column; clicking it again flips the direction
+    def sort_by(self, key):
+        if key == self.sort_key:
+            self.descending = not self.descending
+        else:
+            self.sort_key = key
+            self.descending = False
+        self.order = sorted_order(self.table, key, self.descending)
+        for column, title in RESULT_COLUMNS:
+            arrow = (" ▼" if self.descending else " ▲") if column == key else ""
+            self.tree.heading(column, text=title + arrow)
+        self.offset = 0
+        self.refresh()
+
+    def on_scroll(self, action, amount, unit=None):
+        if action == "moveto":
+            self.offset = int(float(amount) * len(self.table))
+            self.refresh()
+        elif action == "scroll":
+            self.scroll_by(int(amount) * (self.rows if unit == "pages" else 1))
+
+    def on_wheel(self, event):
+        self.scroll_by(-3 if event.delta > 0 else 3)
+
+    def scroll_by(self, rows):
+        self.offset += rows
+        self.refresh()
+
+    def refresh(self):
+        n = len(self.table)
+        self.offset = max(0, min(self.offset, n - self.rows))
+        lo = self.offset
+        hi = min(lo + self.rows, n)
+        index = np.arange(lo, hi) if self.order is None else self.order[lo:hi]
+
+        values = [getattr(self.table, key)[index].tolist() for key, _ in RESULT_COLUMNS]
+        for item, row in zip(self.items, zip(*values)):
+            self.tree.item(item, values=[format_cell(key, value) for (key, _), value in zip(RESULT_COLUMNS, row)])
+        for item in self.items[hi - lo:]:
+            self.tree.item(item, values=())
+        self.scrollbar.set(lo / n if n else 0.0, hi / n if n else 1.0)
+
+
+# Results window: the virtualized table plus the aggregates, shown separately below it
+class ResultsWindow(tk.Toplevel):
+    def __init__(self, master, table, summary=None, title="Scheduling Results"):
+        super().__init__(master)
+        self.title(title)
+        self.results = ResultsTable(self, table)
+        self.results.pack(fill=tk.BOTH, expand=True, padx=6, pady=6)
+        self.label_summary = tk.Label(self, text=format_summary(summary or table.summary()), justify=tk.LEFT)
+        self.label_summary.pack(anchor=tk.W, padx=6, pady=6)
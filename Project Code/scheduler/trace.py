@@ -0,0 +1,119 @@
+# Binary trace format for very large workloads: a 32-byte header followed by
+# fixed 32-byte little-endian records
+#
+#   header: magic "SCHDTRC1", version u16, header size u16, record size u32,
+#           record count u64, 8 reserved bytes
+#   record: pid i64, arrival f64, burst f64, priority i32, reserved u32
+#
+# Records are 8-byte aligned, so open_trace can hand NumPy memmap views of the
+# fields straight to ProcessTable: the OS pages the file in as the simulation
+# walks it and nothing is parsed or copied.
+import os
+import struct
+
+import numpy as np
+
+from .table import ProcessTable
+
+MAGIC = b"SCHDTRC1"
+VERSION = 1
+HEADER = struct.Struct("<8sHHIQ8x")
+RECORD = np.dtype([
+    ("pid", "<i8"),
+    ("arrival", "<f8"),
+    ("burst", "<f8"),
+    ("priority", "<i4"),
+    ("reserved", "<u4"),
+])
+
+
+def read_header(f):
+    data = f.read(HEADER.size)
+    if len(data) < HEADER.size:
+        raise ValueError("Not a scheduler trace: file is too short.")
+    magic, version, header_size, record_size, count = HEADER.unpack(data)
+    if magic != MAGIC:
+        raise ValueError("Not a scheduler trace: bad magic number.")
+    if version != VERSION:
+        raise ValueError(f"Unsupported trace version: {version}")
+    if record_size != RECORD.itemsize:
+        raise ValueError(f"Unsupported trace record size: {record_size}")
+    return header_size, count
+
+
+# Appends records chunk by chunk; the count in the header is filled in on close
+class TraceWriter:
+    def __init__(self, path):
+        self.f = open(path, "wb")
+        self.count = 0
+        self._write_header()
+
+    def _write_header(self):
+        self.f.write(HEADER.pack(MAGIC, VERSION, HEADER.size, RECORD.itemsize, self.count))
+
+    def write(self, pid, priority, arrival, burst):
+        records = np.zeros(len(arrival), dtype=RECORD)
+        records["pid"] = pid
+        records["priority"] = priority
+        records["arrival"] = arrival
+        records["burst"] = burst
+        records.tofile(self.f)
+        self.count += len(records)
+
+    def write_table(self, table, chunk_size=1 << 20):
+        for lo in range(0, len(table), chunk_size):
+            hi = lo + chunk_size
+            self.write(table.pid[lo:hi], table.priority[lo:hi], table.arrival[lo:hi], table.burst[lo:hi])
+
+    def close(self):
+        if self.f.closed:
+            return
+        self.f.seek(0)
+        self._write_header()
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_trace(path, table):
+    with TraceWriter(path) as writer:
+        writer.write_table(table)
+
+
+# Stream any workload the readers understand (CSV, JSONL, Parquet) into a trace
+def convert(source, path, fmt=None, chunk_size=None):
+    from .workload import CHUNK_SIZE, read_chunks
+
+    with TraceWriter(path) as writer:
+        for chunk in read_chunks(source, fmt, chunk_size or CHUNK_SIZE):
+            writer.write(*chunk)
+    return writer.count
+
+
+def map_trace(path):
+    # The records as a read-only structured memmap
+    with open(path, "rb") as f:
+        header_size, count = read_header(f)
+    expected = header_size + count * RECORD.itemsize
+    if os.path.getsize(path) < expected:
+        raise ValueError(f"Truncated trace: expected {expected} bytes for {count} records.")
+    if not count:
+        return np.zeros(0, dtype=RECORD)
+    return np.memmap(path, dtype=RECORD, mode="r", offset=header_size, shape=(count,))
+
+
+# A ProcessTable whose input columns are views into the mapped file
+def open_trace(path):
+    records = map_trace(path)
+    return ProcessTable(records["pid"], records["priority"], records["arrival"], records["burst"])
+
+
+def read_chunks(path, chunk_size):
+    records = map_trace(path)
+    for lo in range(0, len(records), chunk_size):
+        chunk = records[lo:lo + chunk_size]
+        yield chunk["pid"], chunk["priority"], chunk["arrival"], chunk["burst"]
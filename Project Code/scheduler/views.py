@@ -0,0 +1,43 @@
+# Toolkit-neutral pieces of the results views in tkviews and gtkviews: the
+# columns, cell formatting and sorting, all read straight from a ProcessTable.
+import numpy as np
+
+# (ProcessTable attribute, heading)
+RESULT_COLUMNS = (
+    ("pid", "PID"),
+    ("priority", "Priority"),
+    ("arrival", "Arrival"),
+    ("burst", "Burst"),
+    ("waiting", "Waiting"),
+    ("turnaround", "Turnaround"),
+    ("response", "Response"),
+)
+INTEGER_COLUMNS = ("pid", "priority")
+
+
+def format_cell(key, value):
+    if key in INTEGER_COLUMNS:
+        return str(int(value))
+    # Float round-off (waiting = turnaround - burst) must not show up as -0.00
+    return f"{value:.2f}" if abs(value) >= 0.005 else "0.00"
+
+
+# Row order for a sorted view; the permutation is the only per-row state a view keeps
+def sorted_order(table, key, descending=False):
+    order = np.argsort(getattr(table, key), kind="stable")
+    return order[::-1] if descending else order
+
+
+def format_summary(summary):
+    lines = [f"Processes: {summary['count']}"]
+    for name, title in (("waiting_time", "Waiting"), ("turnaround_time", "Turnaround"),
+                        ("response_time", "Response")):
+        if f"avg_{name}" not in summary:
+            continue
+        lines.append(
+            f"{title} Time: avg {summary[f'avg_{name}']:.2f}, p50 {summary[f'p50_{name}']:.2f}, "
+            f"p90 {summary[f'p90_{name}']:.2f}, p99 {summary[f'p99_{name}']:.2f}, "
+            f"p99.9 {summary[f'p99.9_{name}']:.2f}, max {summary[f'max_{name}']:.2f}, "
+            f"stddev {summary[f'stddev_{name}']:.2f}"
+        )
+    return "\n".join(lines)
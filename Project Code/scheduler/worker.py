@@ -0,0 +1,103 @@
+import queue
+import threading
+import time
+
+from .engine import SimulationCancelled
+
+
+# Runs Scheduler.schedule() on a background thread so the GUI event loop keeps
+# running. Callbacks never run on the worker thread: each one is handed to
+# post(fn, *args), which must get it onto the GUI thread (GLib.idle_add for
+# GTK, a TkPoster for tkinter).
+#
+#   on_progress(done, total)   at most every `interval` seconds
+#   on_rows(rows)              newly finished (process, waiting, turnaround, response) rows
+#   on_done(scheduler)         the run finished; scheduler holds the full results
+#   on_cancelled()             cancel() stopped the run
+#   on_error(exception)        the run failed
+class SimulationWorker:
+    def __init__(self, scheduler, post, on_progress=None, on_rows=None, on_done=None,
+                 on_cancelled=None, on_error=None, interval=0.1):
+        self.scheduler = scheduler
+        self.post = post
+        self.on_progress = on_progress
+        self.on_rows = on_rows
+        self.on_done = on_done
+        self.on_cancelled = on_cancelled
+        self.on_error = on_error
+        self.interval = interval
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="scheduler-worker", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    def is_alive(self):
+        return self._thread.is_alive()
+
+    def _send(self, callback, *args):
+        if callback is not None:
+            self.post(callback, *args)
+
+    def _run(self):
+        # Input order, which is what the engine's job indices refer to
+        processes = list(self.scheduler.processes)
+        rows = []
+        last_post = time.monotonic()
+
+        def progress(done, total, jobs, start, finish):
+            nonlocal rows, last_post
+            if self._cancel.is_set():
+                raise SimulationCancelled()
+            if self.on_rows is not None:
+                for i in jobs:
+                    process = processes[i]
+                    turnaround = finish[i] - process.arrival_time
+                    rows.append((process, process.waiting(turnaround), turnaround, start[i] - process.arrival_time))
+            now = time.monotonic()
+            if now - last_post >= self.interval or done == total:
+                last_post = now
+                self._send(self.on_progress, done, total)
+                if rows:
+                    self._send(self.on_rows, rows)
+                    rows = []
+
+        try:
+            self.scheduler.schedule(progress=progress)
+        except SimulationCancelled:
+            self._send(self.on_cancelled)
+        except Exception as e:
+            self._send(self.on_error, e)
+        else:
+            self._send(self.on_done, self.scheduler)
+
+
+# tkinter must only be touched from its own thread, so the worker queues
+# callbacks here and the Tk thread drains them with after() until close()
+class TkPoster:
+    def __init__(self, widget, interval_ms=50):
+        self.widget = widget
+        self.interval_ms = interval_ms
+        self.queue = queue.SimpleQueue()
+        self.closed = False
+        self.widget.after(self.interval_ms, self._poll)
+
+    def __call__(self, callback, *args):
+        self.queue.put((callback, args))
+
+    def close(self):
+        self.closed = True
+
+    def _poll(self):
+        while True:
+            try:
+                callback, args = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            callback(*args)
+        if not self.closed:
+            self.widget.after(self.interval_ms, self._poll)
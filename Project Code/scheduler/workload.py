@@ -0,0 +1,184 @@
+import csv
+import json
+import os
+import sys
+
+import numpy as np
+
+from .instrument import phase
+from .table import ProcessTable
+from .trace import open_trace
+from .trace import read_chunks as _read_trace
+
+CHUNK_SIZE = 1 << 16
+
+# Accepted column names for each field, so traces written by the GUIs' field
+# names (arrival_time, burst_time) and short names both load
+COLUMNS = {
+    "pid": ("pid",),
+    "priority": ("priority",),
+    "arrival": ("arrival", "arrival_time"),
+    "burst": ("burst", "burst_time"),
+}
+
+
+def detect_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if ext in (".parquet", ".pq"):
+        return "parquet"
+    if ext == ".trace":
+        return "trace"
+    return "csv"
+
+
+def _resolve(names):
+    found = {}
+    for field, aliases in COLUMNS.items():
+        for alias in aliases:
+            if alias in names:
+                found[field] = alias
+                break
+    for field in ("arrival", "burst"):
+        if field not in found:
+            raise ValueError(f"Workload has no {field} column.")
+    return found
+
+
+# Build one chunk of typed columns; a missing pid counts from 1, a missing priority is 0
+def _chunk(offset, pid, priority, arrival, burst):
+    n = len(arrival)
+    return (
+        np.arange(offset + 1, offset + n + 1, dtype=np.int64) if pid is None else np.array(pid, dtype=np.int64),
+        np.zeros(n, dtype=np.int32) if priority is None else np.array(priority, dtype=np.int32),
+        np.array(arrival, dtype=np.float64),
+        np.array(burst, dtype=np.float64),
+    )
+
+
+def _open_text(path):
+    if path == "-":
+        # A second handle on stdin, so closing it when done leaves sys.stdin open
+        return open(sys.stdin.fileno(), newline="", closefd=False)
+    return open(path, newline="")
+
+
+def _read_csv(path, chunk_size):
+    with _open_text(path) as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        names = {name.strip(): index for index, name in enumerate(header)}
+        found = _resolve(names)
+        columns = [names[found[field]] if field in found else None for field in COLUMNS]
+        # Blank lines, such as a trailing one, are skipped
+        rows = ((reader.line_num, row) for row in reader if any(cell.strip() for cell in row))
+        yield from _rows_to_chunks(rows, columns, found, chunk_size)
+
+
+def _read_jsonl(path, chunk_size):
+    with _open_text(path) as f:
+        records = ((number, json.loads(line)) for number, line in enumerate(f, 1) if line.strip())
+        first = next(records, None)
+        if first is None:
+            return
+        found = _resolve(first[1])
+        keys = [found.get(field) for field in COLUMNS]
+
+        def rows():
+            yield first
+            yield from records
+
+        yield from _rows_to_chunks(rows(), keys, found, chunk_size)
+
+
+# Why a row could not be read: the first of its columns that is missing or not a number
+def _bad_row(line, row, keys, found):
+    for field, key, convert in zip(COLUMNS, keys, (int, int, float, float)):
+        if key is None:
+            continue
+        try:
+            value = row[key]
+        except (IndexError, KeyError, TypeError):
+            return f"Line {line}: missing {found[field]} column."
+        try:
+            convert(value)
+        except (TypeError, ValueError):
+            return f"Line {line}: {found[field]} value {value!r} is not a valid number."
+    return f"Line {line}: unreadable row."
+
+
+# rows yields (line number, row) pairs; keys index each row for pid, priority,
+# arrival and burst, and found holds the column names for error messages
+def _rows_to_chunks(rows, keys, found, chunk_size):
+    pid_key, priority_key, arrival_key, burst_key = keys
+    offset = 0
+    pid, priority, arrival, burst = [], [], [], []
+
+    def chunk():
+        return _chunk(offset, pid if pid_key is not None else None,
+                      priority if priority_key is not None else None, arrival, burst)
+
+    for line, row in rows:
+        try:
+            if pid_key is not None:
+                pid.append(int(row[pid_key]))
+            if priority_key is not None:
+                priority.append(int(row[priority_key]))
+            arrival.append(float(row[arrival_key]))
+            burst.append(float(row[burst_key]))
+        except (IndexError, KeyError, TypeError, ValueError):
+            raise ValueError(_bad_row(line, row, keys, found)) from None
+        if len(arrival) == chunk_size:
+            yield chunk()
+            offset += len(arrival)
+            pid, priority, arrival, burst = [], [], [], []
+    if arrival:
+        yield chunk()
+
+
+def _read_parquet(path, chunk_size):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Reading Parquet workloads needs the pyarrow package.") from None
+
+    parquet = pq.ParquetFile(path)
+    found = _resolve(set(parquet.schema_arrow.names))
+    offset = 0
+    for batch in parquet.iter_batches(batch_size=chunk_size, columns=list(found.values())):
+        def column(field):
+            if field not in found:
+                return None
+            return batch.column(batch.schema.get_field_index(found[field])).to_numpy()
+
+        chunk = _chunk(offset, column("pid"), column("priority"), column("arrival"), column("burst"))
+        offset += len(chunk[2])
+        yield chunk
+
+
+# Stream a workload file as (pid, priority, arrival, burst) NumPy chunks of at most chunk_size rows
+def read_chunks(path, fmt=None, chunk_size=CHUNK_SIZE):
+    fmt = fmt or detect_format(path)
+    if fmt == "csv":
+        return _read_csv(path, chunk_size)
+    if fmt == "jsonl":
+        return _read_jsonl(path, chunk_size)
+    if fmt == "parquet":
+        return _read_parquet(path, chunk_size)
+    if fmt == "trace":
+        return _read_trace(path, chunk_size)
+    raise ValueError(f"Unknown workload format: {fmt}")
+
+
+def load_table(path, fmt=None, chunk_size=CHUNK_SIZE):
+    with phase("load"):
+        if (fmt or detect_format(path)) == "trace":
+            # Mapped, not read: the table's columns are views into the file
+            return open_trace(path)
+        chunks = list(read_chunks(path, fmt, chunk_size))
+        if not chunks:
+            return ProcessTable([], [], [], [])
+        return ProcessTable(*(np.concatenate(column) for column in zip(*chunks)))
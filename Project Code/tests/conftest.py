@@ -0,0 +1,26 @@
+import os
+import random
+import sys
+
+import pytest
+
+# The scheduler package sits next to this directory rather than on an installed path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# Seeded workload of n jobs with whole-number times: arrivals over 0..span
+# (sorted unless ordered is False), bursts of 1..longest and priorities
+# between the two bounds in priorities. Returns (arrival, burst, priority) lists.
+def random_workload(seed, n, span=40, longest=8, priorities=(0, 4), ordered=True):
+    rng = random.Random(seed)
+    arrival = [rng.randint(0, span) for _ in range(n)]
+    if ordered:
+        arrival.sort()
+    burst = [rng.randint(1, longest) for _ in range(n)]
+    priority = [rng.randint(*priorities) for _ in range(n)]
+    return arrival, burst, priority
+
+
+@pytest.fixture
+def workload():
+    return random_workload
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from scheduler.batch import pack, simulate_batch
+from scheduler.engine import simulate
+from scheduler.policies import available_policies
+
+
+@pytest.mark.parametrize("policy", available_policies())
+def test_matches_engine(workload, policy):
+    workloads = [workload(seed, 5 + seed % 30, ordered=seed % 2 == 0) for seed in range(40)]
+    arrival, burst, priority, lengths = pack(workloads)
+    result = simulate_batch(arrival, burst, priority, policy, lengths)
+    for row, (a, b, p) in enumerate(workloads):
+        n = len(a)
+        full = simulate(a, b, p, policy)
+        assert list(result.finish[row, :n]) == list(full.finish)
+        assert list(result.start[row, :n]) == list(full.start)
+        assert np.isnan(result.finish[row, n:]).all()
+
+
+def test_summary_per_trace(workload):
+    workloads = [workload(seed, 10 + seed) for seed in range(5)] + [([], [], [])]
+    arrival, burst, priority, lengths = pack(workloads)
+    summary = simulate_batch(arrival, burst, priority, "rr", lengths).summary()
+    assert list(summary["count"]) == [10, 11, 12, 13, 14, 0]
+    for row, (a, b, p) in enumerate(workloads[:-1]):
+        full = simulate(a, b, p, "rr")
+        turnaround = [f - x for f, x in zip(full.finish, a)]
+        assert summary["avg_turnaround_time"][row] == pytest.approx(sum(turnaround) / len(a))
+        assert summary["makespan"][row] == max(full.finish)
+    assert summary["makespan"][-1] == 0
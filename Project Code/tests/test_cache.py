@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from scheduler.cache import ResultCache, cached_simulate, result_key
+from scheduler.policies import get_policy
+
+ARRIVAL = [0.0, 1.0, 2.0, 3.0, 9.0, 9.5]
+BURST = [4.0, 2.0, 1.0, 3.0, 2.0, 1.0]
+PRIORITY = [2, 0, 1, 1, 0, 3]
+
+
+def test_views_of_one_buffer_get_different_keys():
+    arrival = np.arange(10, dtype=np.float64)
+    burst = np.ones(10)
+    priority = np.zeros(10, dtype=np.int32)
+    policy = get_policy("fcfs")
+    head = result_key(*(memoryview(column)[:5] for column in (arrival, burst, priority)), policy)
+    tail = result_key(*(memoryview(column)[5:] for column in (arrival, burst, priority)), policy)
+    assert head != tail
+
+
+def test_key_follows_values_not_container():
+    arrival = np.arange(10, dtype=np.float64)
+    priority = np.zeros(10, dtype=np.int32)
+    policy = get_policy("fcfs")
+    view = result_key(memoryview(arrival)[::2], memoryview(arrival)[::2], memoryview(priority)[::2], policy)
+    listed = result_key([0.0, 2.0, 4.0, 6.0, 8.0], [0.0, 2.0, 4.0, 6.0, 8.0], [0] * 5, policy)
+    assert view == listed
+
+
+@pytest.mark.parametrize("options", [{}, {"switch_cost": 0.5, "dispatch_latency": 0.1}, {"cpus": 2, "migration_cost": 1.0}])
+def test_round_trip(tmp_path, options):
+    cache = ResultCache(str(tmp_path))
+    first = cached_simulate(cache, ARRIVAL, BURST, PRIORITY, "rr", **options)
+    assert len(cache.entries()) == 1
+    again = cached_simulate(cache, ARRIVAL, BURST, PRIORITY, "rr", **options)
+    assert again is not first
+    assert type(again) is type(first)
+    for name in ("start", "finish", "order"):
+        assert list(getattr(again, name)) == list(getattr(first, name))
+    assert list(again.segments()) == list(first.segments())
+    assert again.switches == first.switches
+    assert getattr(again, "migrations", None) == getattr(first, "migrations", None)
+
+
+def test_different_runs_do_not_collide(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cached_simulate(cache, ARRIVAL, BURST, PRIORITY, "rr")
+    cached_simulate(cache, ARRIVAL, BURST, PRIORITY, get_policy("rr", quantum=1))
+    cached_simulate(cache, ARRIVAL, BURST, PRIORITY, "rr", switch_cost=1.0)
+    cached_simulate(cache, ARRIVAL, BURST[::-1], PRIORITY, "rr")
+    assert len(cache.entries()) == 4
+
+
+def test_engine_options_are_keyed(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    full = cached_simulate(cache, ARRIVAL, BURST, PRIORITY, "rr")
+    subset = cached_simulate(cache, ARRIVAL, BURST, PRIORITY, "rr", order=[0, 1, 2])
+    assert len(subset.order) == 3 and len(full.order) == 6
+    pinned = cached_simulate(cache, ARRIVAL, BURST, PRIORITY, "rr", cpus=2, affinity=[{0}] * 6)
+    segments = pinned.log.arrays()
+    assert {cpu for cpu, job in zip(segments["cpu"], segments["job"]) if job >= 0} == {0}
+    cached_simulate(cache, ARRIVAL, BURST, PRIORITY, "rr", cpus=2)
+    cached_simulate(cache, ARRIVAL, BURST, PRIORITY, "rr", cpus=2, steal=False)
+    assert len(cache.entries()) == 5
+
+
+def test_order_is_keyed_by_value(tmp_path):
+    policy = get_policy("rr")
+    listed = result_key(ARRIVAL, BURST, PRIORITY, policy, order=[2, 0, 1])
+    assert listed == result_key(ARRIVAL, BURST, PRIORITY, policy, order=np.array([2, 0, 1]))
+    assert listed == result_key(ARRIVAL, BURST, PRIORITY, policy, order=memoryview(np.array([2, 0, 1], dtype=np.int64)))
+    assert result_key(ARRIVAL, BURST, PRIORITY, policy, order=range(6)) == \
+        result_key(ARRIVAL, BURST, PRIORITY, policy, order=list(range(6)))
+    assert result_key(ARRIVAL, BURST, PRIORITY, policy, affinity=[{1, 0}, None]) == \
+        result_key(ARRIVAL, BURST, PRIORITY, policy, affinity=[[0, 1], None])
+
+
+def test_progress_every_shares_entry(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cached_simulate(cache, ARRIVAL, BURST, PRIORITY, "rr", progress_every=1)
+    cached_simulate(cache, ARRIVAL, BURST, PRIORITY, "rr", progress_every=100)
+    assert len(cache.entries()) == 1
+
+
+def test_unkeyable_options_are_refused(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    with pytest.raises(ValueError, match="idle"):
+        cached_simulate(cache, ARRIVAL, BURST, PRIORITY, "rr", idle=lambda cursor, now: False)
+    assert cache.entries() == []
+    # Without a cache the option goes straight to the engine
+    result = cached_simulate(None, ARRIVAL, BURST, PRIORITY, "rr", idle=lambda cursor, now: False)
+    assert len(result.order) == 6
+
+
+def test_trim_keeps_cache_under_max_bytes(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=0)
+    cached_simulate(cache, ARRIVAL, BURST, PRIORITY, "fcfs")
+    assert cache.entries() == []
@@ -0,0 +1,53 @@
+import pytest
+
+from scheduler.cli import main, parse_param, policy_params
+
+
+def test_parse_param():
+    assert parse_param("quantum=4") == (None, "quantum", 4)
+    assert parse_param("mlfq:quanta=8,16") == ("mlfq", "quanta", (8, 16))
+
+
+def test_bare_params_go_to_policies_that_take_them():
+    params = policy_params(["fcfs", "rr"], [(None, "quantum", 4)])
+    assert params == {"fcfs": {}, "rr": {"quantum": 4}}
+
+
+def test_scoped_params_win():
+    params = policy_params(["rr", "mlfq"], [("rr", "quantum", 1), (None, "quantum", 3)])
+    assert params["rr"] == {"quantum": 1}
+
+
+@pytest.mark.parametrize("names, param", [(["fcfs"], (None, "quantum", 4)), (["fcfs"], ("rr", "quantum", 4))])
+def test_unusable_params_are_rejected(names, param):
+    with pytest.raises(ValueError):
+        policy_params(names, [param])
+
+
+def test_run_compares_policies_with_params(tmp_path, capsys):
+    trace = tmp_path / "trace.csv"
+    trace.write_text("pid,priority,arrival,burst\n1,1,0,5\n2,0,1,3\n3,2,2,8\n")
+    assert main(["run", str(trace), "--no-cache", "--policy", "fcfs", "--policy", "rr", "-p", "quantum=4"]) == 0
+    rows = capsys.readouterr().out.splitlines()
+    assert [row.split(",")[0] for row in rows[1:]] == ["fcfs", "rr(quantum=4)"]
+
+
+def test_run_writes_text_gantt(tmp_path):
+    trace = tmp_path / "trace.csv"
+    trace.write_text("pid,priority,arrival,burst\n7,1,0,2\n8,0,4,1\n")
+    gantt = tmp_path / "gantt.txt"
+    assert main(["run", str(trace), "--no-cache", "--policy", "fcfs", "--policy", "rr", "-o", str(tmp_path / "out.csv"),
+                 "--gantt", str(gantt)]) == 0
+    assert gantt.read_text() == ("Gantt Chart (fcfs):\nP7 [0.0 - 2.0]\nIdle [2.0 - 4.0]\nP8 [4.0 - 5.0]\n"
+                                 "Gantt Chart (rr(quantum=2)):\nP7 [0.0 - 2.0]\nIdle [2.0 - 4.0]\nP8 [4.0 - 5.0]\n")
+
+
+@pytest.mark.parametrize("cpus", [1, 2])
+def test_run_draws_gantt_image_headless(tmp_path, cpus):
+    pytest.importorskip("matplotlib")
+    trace = tmp_path / "trace.csv"
+    trace.write_text("pid,priority,arrival,burst\n1,1,0,5\n2,0,1,3\n3,2,2,8\n")
+    image = tmp_path / "gantt.png"
+    assert main(["run", str(trace), "--no-cache", "--policy", "fcfs", "--policy", "srtf", "--cpus", str(cpus),
+                 "-o", str(tmp_path / "out.csv"), "--gantt", str(image)]) == 0
+    assert image.read_bytes().startswith(b"\x89PNG")
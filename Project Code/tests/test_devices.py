@@ -0,0 +1,54 @@
+import pytest
+
+from scheduler.devices import simulate_io
+from scheduler.engine import simulate
+from scheduler.policies import available_policies
+from scheduler.process import Process, Scheduler
+from scheduler.worker import SimulationWorker
+
+
+def processes():
+    return [Process(1, 0, 0, bursts=[2, ("io", 3), 1]), Process(2, 1, 1, bursts=[4]), Process(3, 0, 2, bursts=[1, 5, 2])]
+
+
+@pytest.mark.parametrize("policy", available_policies())
+def test_single_bursts_match_engine(workload, policy):
+    arrival, burst, priority = workload(7, 40, span=30, priorities=(0, 5), ordered=False)
+    io = simulate_io(arrival, [[b] for b in burst], priority, policy)
+    assert list(io.finish) == list(simulate(arrival, burst, priority, policy).finish)
+
+
+def test_worker_rows_match_schedule():
+    scheduler = Scheduler("fcfs")
+    for process in processes():
+        scheduler.add_process(process)
+    rows = []
+    worker = SimulationWorker(scheduler, lambda callback, *args: callback(*args), on_rows=rows.extend).start()
+    worker._thread.join()
+    assert {row[0].pid: row[1] for row in rows} == {p.pid: p.waiting_time for p in scheduler.jobs}
+    assert scheduler.jobs[0].waiting_time == scheduler.jobs[0].turnaround_time - 3 - 3
+
+
+@pytest.mark.parametrize("options", [{"switch_cost": 1}, {"dispatch_latency": 1}, {"cache": object()}, {"cpus": 2}])
+def test_unsupported_options_raise(options):
+    scheduler = Scheduler("fcfs", **options)
+    for process in processes():
+        scheduler.add_process(process)
+    with pytest.raises(ValueError):
+        scheduler.schedule()
+
+
+@pytest.mark.parametrize("io", [False, True])
+def test_schedule_keeps_its_table(io):
+    scheduler = Scheduler("rr")
+    jobs = processes() if io else [Process(p.pid, p.priority, p.arrival_time, p.burst_time) for p in processes()]
+    for process in jobs:
+        scheduler.add_process(process)
+    scheduler.schedule()
+    table = scheduler.table
+    assert table.pid.tolist() == [p.pid for p in jobs]
+    assert table.waiting.tolist() == [p.waiting_time for p in jobs]
+    assert table.turnaround.tolist() == [p.turnaround_time for p in jobs]
+    assert table.response.tolist() == [p.response_time for p in jobs]
+    assert table.result is scheduler.result
+    assert scheduler.summary["avg_waiting_time"] == pytest.approx(scheduler.avg_waiting_time)
@@ -0,0 +1,161 @@
+# Every policy against a unit-step reference: with whole-number arrivals and
+# bursts, the CPU only needs deciding at whole times, so the reference
+# re-picks the job to run at every tick from the policy's rules as written,
+# without the engine's events, cursor or ready-queue structures.
+from collections import deque
+
+import pytest
+
+from scheduler.engine import simulate
+from scheduler.policies import get_policy
+from scheduler.segments import SWITCH
+
+QUANTUM = 2
+QUANTA = (2, 4)
+AGING_RATE = 0.5
+
+
+# Non-preemptive: whenever the CPU is free, the best arrived job by key(i, now) runs to completion
+def run_to_completion(arrival, burst, key):
+    n = len(arrival)
+    start, finish = [None] * n, [None] * n
+    waiting = set(range(n))
+    now = 0
+    while waiting:
+        ready = [i for i in waiting if arrival[i] <= now]
+        if not ready:
+            now += 1
+            continue
+        i = min(ready, key=lambda j: key(j, now))
+        waiting.remove(i)
+        start[i] = now
+        now += burst[i]
+        finish[i] = now
+    return start, finish
+
+
+# Preemptive by key: every tick the best of the arrived, unfinished jobs runs
+def run_by_key(arrival, burst, key):
+    n = len(arrival)
+    left = list(burst)
+    start, finish = [None] * n, [None] * n
+    now = 0
+    while any(left):
+        ready = [i for i in range(n) if left[i] and arrival[i] <= now]
+        if ready:
+            i = min(ready, key=lambda j: key(j, left))
+            if start[i] is None:
+                start[i] = now
+            left[i] -= 1
+            if not left[i]:
+                finish[i] = now + 1
+        now += 1
+    return start, finish
+
+
+# Feedback queues: a job that uses up its level's quantum drops a level, or
+# with demote False goes to the back of the same one (round robin). Arrivals
+# at a tick queue ahead of the job whose slice expires then; a job below the
+# top level loses the CPU when anything arrives at the top one.
+def run_feedback(arrival, burst, quanta, demote=True):
+    n = len(arrival)
+    levels = [deque() for _ in range(len(quanta) + 1)]
+    left = list(burst)
+    start, finish = [None] * n, [None] * n
+    running = level = used = None
+    now = 0
+    while any(left):
+        expired = None
+        if running is not None and not left[running]:
+            running = None
+        elif running is not None and level < len(quanta) and used == quanta[level]:
+            expired = running, min(level + 1, len(quanta)) if demote else level
+            running = None
+        for i in range(n):
+            if arrival[i] == now:
+                levels[0].append(i)
+        if expired is not None:
+            levels[expired[1]].append(expired[0])
+        if running is not None and level > 0 and levels[0]:
+            levels[level].append(running)
+            running = None
+        if running is None:
+            for k, queue in enumerate(levels):
+                if queue:
+                    running, level, used = queue.popleft(), k, 0
+                    break
+        if running is not None:
+            if start[running] is None:
+                start[running] = now
+            left[running] -= 1
+            used += 1
+            if not left[running]:
+                finish[running] = now + 1
+        now += 1
+    return start, finish
+
+
+def reference(policy, arrival, burst, priority):
+    if policy == "fcfs":
+        return run_to_completion(arrival, burst, lambda i, now: (arrival[i], i))
+    if policy == "sjf":
+        return run_to_completion(arrival, burst, lambda i, now: (burst[i], arrival[i], i))
+    if policy == "priority":
+        return run_to_completion(arrival, burst, lambda i, now: (priority[i], arrival[i], i))
+    if policy == "priority-aging":
+        # Effective priority as the policy defines it, at the moment of the pick
+        return run_to_completion(arrival, burst,
+                                 lambda i, now: (priority[i] - AGING_RATE * (now - arrival[i]), arrival[i], i))
+    if policy == "srtf":
+        return run_by_key(arrival, burst, lambda i, left: (left[i], arrival[i], i))
+    if policy == "preemptive-priority":
+        return run_by_key(arrival, burst, lambda i, left: (priority[i], arrival[i], i))
+    if policy == "rr":
+        return run_feedback(arrival, burst, (QUANTUM,), demote=False)
+    if policy == "mlfq":
+        return run_feedback(arrival, burst, QUANTA)
+    raise ValueError(policy)
+
+
+def make_policy(name):
+    params = {"rr": {"quantum": QUANTUM}, "mlfq": {"quanta": QUANTA}, "priority-aging": {"aging_rate": AGING_RATE}}
+    return get_policy(name, **params.get(name, {}))
+
+
+@pytest.mark.parametrize("seed", range(40))
+@pytest.mark.parametrize("policy", ["fcfs", "sjf", "priority", "priority-aging", "srtf", "preemptive-priority", "rr",
+                                    "mlfq"])
+def test_matches_reference(workload, policy, seed):
+    arrival, burst, priority = workload(seed, 12, span=25, longest=7, ordered=False)
+    result = simulate(arrival, burst, priority, make_policy(policy))
+    start, finish = reference(policy, arrival, burst, priority)
+    assert list(result.start) == start
+    assert list(result.finish) == finish
+
+
+@pytest.mark.parametrize("policy", ["fcfs", "rr", "srtf", "cfs"])
+def test_log_accounts_for_every_burst(workload, policy):
+    arrival, burst, priority = workload(3, 30, span=25, longest=7, ordered=False)
+    result = simulate(arrival, burst, priority, policy)
+    ran = [0.0] * len(arrival)
+    for begin, end, job, _ in result.segments():
+        if job >= 0:
+            ran[job] += end - begin
+    assert ran == pytest.approx(burst)
+    assert list(result.segments())[-1][1] == max(result.finish)
+
+
+def overhead(result):
+    return [(begin, end, job) for begin, end, job, kind in result.segments() if kind == SWITCH]
+
+
+def test_switch_cost_only_between_jobs():
+    # The cold first dispatch pays dispatch_latency alone; a later job pays switch_cost on top,
+    # idle time in between or not, and a lone job getting its next slice pays nothing
+    result = simulate([0.0, 1.0, 10.0, 20.0], [1.0, 2.0, 1.0, 1.0], [0, 0, 0, 0], "fcfs",
+                      switch_cost=0.5, dispatch_latency=0.25)
+    assert overhead(result) == [(0.0, 0.25, 0), (1.25, 2.0, 1), (10.0, 10.75, 2), (20.0, 20.75, 3)]
+    assert result.switches == 3
+    alone = simulate([0.0], [2.0], [0], get_policy("rr", quantum=1), switch_cost=0.5)
+    assert overhead(alone) == [] and alone.switches == 0
+    assert list(alone.finish) == [2.0]
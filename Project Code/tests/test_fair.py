@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from scheduler.engine import simulate
+from scheduler.incremental import IncrementalScheduler
+from scheduler.online import OnlineScheduler
+from scheduler.policies import get_policy, nice_weight
+
+
+def test_cpu_shared_by_weight():
+    # Two jobs always runnable: CPU time up to the first finish splits by weight
+    result = simulate([0, 0], [1000, 1000], [0, 5], "cfs")
+    first = min(result.finish)
+    ran = [0.0, 0.0]
+    for begin, end, job, _ in result.segments():
+        if job >= 0 and end <= first:
+            ran[job] += end - begin
+    assert ran[0] / ran[1] == pytest.approx(nice_weight(0) / nice_weight(5), rel=0.05)
+
+
+def test_negative_nice_runs_first():
+    result = simulate([0, 0], [10, 10], [19, -20], "cfs")
+    assert result.finish[1] < result.finish[0]
+
+
+def test_example_insert_matches_full_run():
+    arrival = [7, 10, 16, 16, 3, 14, 0, 9]
+    burst = [5, 2, 1, 2, 1, 3, 1, 1]
+    nice = [1, 2, 1, 0, 3, 3, 3, 1]
+    incremental = IncrementalScheduler("cfs")
+    incremental.load(arrival, burst, nice)
+    incremental.insert(16, 6, 2)
+    full = simulate(arrival + [16], burst + [6], nice + [2], "cfs")
+    assert list(incremental.result.finish) == list(full.finish)
+
+
+@pytest.mark.parametrize("seed", range(150))
+def test_incremental_matches_full_run(workload, seed):
+    rng = random.Random(seed)
+    arrival, burst, nice = workload(seed, rng.randint(1, 10), span=20, longest=6, priorities=(-20, 19))
+    incremental = IncrementalScheduler("cfs")
+    incremental.load(arrival, burst, nice)
+    for _ in range(3):
+        if rng.random() < 0.6:
+            job = (rng.randint(0, 20), rng.randint(1, 6), rng.randint(-20, 19))
+            incremental.insert(*job)
+            for column, value in zip((arrival, burst, nice), job):
+                column.append(value)
+        else:
+            i = rng.choice([j for j, alive in enumerate(incremental.alive) if alive])
+            arrival[i] = rng.randint(0, 20)
+            incremental.modify(i, arrival=arrival[i])
+    full = simulate(arrival, burst, nice, "cfs")
+    assert list(incremental.result.finish) == list(full.finish)
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_online_matches_full_run(workload, seed):
+    arrival, burst, nice = workload(seed, 15, span=20, longest=6, priorities=(-20, 19))
+    online = OnlineScheduler("cfs")
+    finish = {event.pid: event.finish for event in online.run(zip(range(15), nice, arrival, burst))}
+    full = simulate(arrival, burst, nice, "cfs")
+    assert [finish[i] for i in range(15)] == list(full.finish)
+    assert len(online) == 0
+    assert not online.policy.vruntime
+
+
+def test_idle_gap_restarts_vruntime():
+    policy = get_policy("cfs")
+    simulate([0, 100], [5, 5], [0, 0], policy)
+    assert policy.min_vruntime == 0.0
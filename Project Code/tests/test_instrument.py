@@ -0,0 +1,91 @@
+import io
+import json
+
+import pytest
+
+from scheduler import instrument
+from scheduler.engine import simulate
+from scheduler.instrument import Recorder
+from scheduler.multicore import simulate_multicore
+from scheduler.segments import RUN
+from scheduler.table import ProcessTable
+
+
+def test_recorder_collects_phases_and_counters(workload):
+    arrival, burst, priority = workload(2, 50)
+    plain = simulate(arrival, burst, priority, "rr")
+    with Recorder() as recorder:
+        result = simulate(arrival, burst, priority, "rr")
+        ProcessTable(range(50), priority, arrival, burst).schedule("srtf")
+    assert not instrument.observers
+    # The hooks don't change the run
+    assert list(result.finish) == list(plain.finish) and result.switches == plain.switches
+
+    phases = recorder.phases()
+    assert {"sort", "dispatch", "metrics"} <= set(phases)
+    assert phases["dispatch"]["calls"] == 2
+    assert all(0 <= entry["max"] <= entry["total"] for entry in phases.values())
+
+    (name, counts, _, _), _ = recorder.samples
+    assert name == "dispatch"
+    assert counts["arrivals"] == 50
+    assert counts["dispatches"] == counts["segments"] == result.log.count(RUN)
+    assert counts["dispatches"] == 50 + counts["expiries"] + counts["preemptions"]
+    assert counts["heap_pushes"] == counts["arrivals"] + counts["expiries"] + counts["preemptions"]
+    assert counts["context_switches"] == result.switches
+    assert recorder.counters()["dispatch"]["arrivals"] == 100
+
+
+def test_multicore_counters(workload):
+    arrival, burst, priority = workload(4, 60)
+    with Recorder() as recorder:
+        result = simulate_multicore(arrival, burst, priority, "rr", cpus=2, migration_cost=0.5)
+    counts = recorder.counters()["dispatch"]
+    assert counts["arrivals"] == 60
+    assert counts["dispatches"] == result.log.count(RUN)
+    assert counts["migrations"] == result.migrations
+
+
+def test_no_observer_no_phase():
+    assert instrument.phase("load") is instrument.NO_PHASE
+    with Recorder():
+        assert instrument.phase("load") is not instrument.NO_PHASE
+    assert instrument.phase("load") is instrument.NO_PHASE
+
+
+def test_chrome_trace_is_valid_json(workload):
+    arrival, burst, priority = workload(3, 30)
+    with Recorder(memory=True) as recorder:
+        with instrument.phase("load"):
+            simulate(arrival, burst, priority, "fcfs")
+    f = io.StringIO()
+    recorder.write(f, "chrome")
+    trace = json.loads(f.getvalue())
+    events = trace["traceEvents"]
+    spans = [event for event in events if event["ph"] == "X"]
+    assert {event["name"] for event in spans} == {"load", "sort", "dispatch"}
+    assert all(event["ts"] >= 0 and event["dur"] >= 0 for event in spans)
+    # Nested phases sit inside the one around them
+    load = next(event for event in spans if event["name"] == "load")
+    dispatch = next(event for event in spans if event["name"] == "dispatch")
+    assert load["ts"] <= dispatch["ts"]
+    assert dispatch["ts"] + dispatch["dur"] <= load["ts"] + load["dur"] + 1e-3
+    counters = [event for event in events if event.get("cat") == "counters"]
+    assert counters[0]["name"] == "dispatch counters" and counters[0]["args"]["arrivals"] == 30
+    assert any(event["ph"] == "M" and event["name"] == "thread_name" for event in events)
+    assert any(event["name"] == "traced memory" for event in events)
+    assert trace["otherData"]["peak_traced_memory"] > 0
+
+
+def test_json_report(tmp_path, workload):
+    arrival, burst, priority = workload(5, 20)
+    with Recorder() as recorder:
+        simulate(arrival, burst, priority, "sjf")
+    path = tmp_path / "timings.json"
+    recorder.save(str(path))
+    report = json.loads(path.read_text())
+    assert report["counters"]["dispatch"]["arrivals"] == 20
+    assert [span["name"] for span in report["spans"]] == ["sort", "dispatch"]
+    assert "dispatch" in recorder.format_report()
+    with pytest.raises(ValueError):
+        recorder.write(io.StringIO(), "xml")
@@ -0,0 +1,90 @@
+# The multi-core, online and incremental schedulers against a plain full run
+import random
+
+import pytest
+
+from scheduler.engine import simulate
+from scheduler.incremental import IncrementalScheduler
+from scheduler.multicore import simulate_multicore
+from scheduler.online import OnlineScheduler
+from scheduler.policies import available_policies
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("policy", available_policies())
+def test_one_cpu_matches_engine(workload, policy, seed):
+    arrival, burst, priority = workload(seed, 20)
+    full = simulate(arrival, burst, priority, policy)
+    multi = simulate_multicore(arrival, burst, priority, policy, cpus=1)
+    assert list(multi.start) == list(full.start)
+    assert list(multi.finish) == list(full.finish)
+    assert list(multi.order) == list(full.order)
+    assert list(multi.segments()) == list(full.segments())
+    assert multi.switches == full.switches
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("policy", available_policies())
+def test_online_matches_engine(workload, policy, seed):
+    arrival, burst, priority = workload(seed, 20)
+    full = simulate(arrival, burst, priority, policy)
+    online = OnlineScheduler(policy)
+    events = {event.pid: event for event in online.run(zip(range(len(arrival)), priority, arrival, burst))}
+    assert [events[i].start for i in range(len(arrival))] == list(full.start)
+    assert [events[i].finish for i in range(len(arrival))] == list(full.finish)
+    assert len(online) == 0
+
+
+@pytest.mark.parametrize("seed", range(15))
+@pytest.mark.parametrize("policy", available_policies())
+def test_incremental_matches_engine(workload, policy, seed):
+    rng = random.Random(seed)
+    arrival, burst, priority = workload(seed, 12)
+    alive = [True] * len(arrival)
+    incremental = IncrementalScheduler(policy)
+    incremental.load(arrival, burst, priority)
+    for _ in range(4):
+        choice = rng.random()
+        live = [i for i, keep in enumerate(alive) if keep]
+        if choice < 0.4 or not live:
+            job = (rng.randint(0, 40), rng.randint(1, 8), rng.randint(0, 4))
+            incremental.insert(*job)
+            for column, value in zip((arrival, burst, priority), job):
+                column.append(value)
+            alive.append(True)
+        elif choice < 0.7:
+            i = rng.choice(live)
+            incremental.delete(i)
+            alive[i] = False
+        else:
+            i = rng.choice(live)
+            arrival[i], burst[i] = rng.randint(0, 40), rng.randint(1, 8)
+            incremental.modify(i, arrival=arrival[i], burst=burst[i])
+    live = [i for i, keep in enumerate(alive) if keep]
+    full = simulate([arrival[i] for i in live], [burst[i] for i in live], [priority[i] for i in live], policy)
+    result = incremental.result
+    assert [result.finish[i] for i in live] == list(full.finish)
+    assert [result.start[i] for i in live] == list(full.start)
+
+
+@pytest.mark.parametrize("policy", available_policies())
+def test_incremental_without_idle_gaps(workload, policy):
+    # Everything arrives while the CPU is busy: one busy period, so every edit replays the whole trace
+    arrival, burst, priority = workload(5, 30, span=20)
+    arrival[0] = 0
+    incremental = IncrementalScheduler(policy)
+    incremental.load(arrival, burst, priority)
+    assert len(incremental.period_job) == 1
+    incremental.insert(10, 3, 1)
+    incremental.modify(4, arrival=15, burst=2)
+    incremental.delete(7)
+    arrival += [10]
+    burst += [3]
+    priority += [1]
+    arrival[4], burst[4] = 15, 2
+    live = [i for i in range(len(arrival)) if i != 7]
+    full = simulate([arrival[i] for i in live], [burst[i] for i in live], [priority[i] for i in live], policy)
+    result = incremental.result
+    assert [result.finish[i] for i in live] == list(full.finish)
+    assert [result.start[i] for i in live] == list(full.start)
+    assert len(incremental.period_job) == 1
@@ -0,0 +1,72 @@
+import pytest
+
+from scheduler.multicore import simulate_multicore
+from scheduler.policies import available_policies
+from scheduler.segments import IDLE
+
+
+def busy_segments(result, cpu):
+    return sorted((begin, end, job) for begin, end, job, kind in result.segments(cpu) if kind != IDLE)
+
+
+@pytest.mark.parametrize("cpus", [2, 3])
+@pytest.mark.parametrize("policy", available_policies())
+def test_work_conserving(workload, policy, cpus):
+    # Between any two events, every CPU is busy while enough jobs are in flight
+    for seed in range(40):
+        arrival, burst, priority = workload(seed, 30)
+        result = simulate_multicore(arrival, burst, priority, policy, cpus=cpus)
+        segments = [busy_segments(result, cpu) for cpu in range(cpus)]
+        times = sorted({t for cpu in segments for begin, end, _ in cpu for t in (begin, end)} | set(arrival))
+        for t0, t1 in zip(times, times[1:]):
+            middle = (t0 + t1) / 2
+            busy = sum(any(begin <= middle < end for begin, end, _ in cpu) for cpu in segments)
+            in_flight = sum(a <= middle < f for a, f in zip(arrival, result.finish))
+            assert busy == min(cpus, in_flight), (seed, t0, t1)
+
+
+@pytest.mark.parametrize("policy", available_policies())
+def test_segments_do_not_overlap(workload, policy):
+    arrival, burst, priority = workload(1, 60)
+    result = simulate_multicore(arrival, burst, priority, policy, cpus=4, migration_cost=0.5, switch_cost=0.25)
+    for cpu in range(4):
+        segments = busy_segments(result, cpu)
+        assert all(end <= following[0] for (_, end, _), following in zip(segments, segments[1:]))
+        assert sum(end - begin for begin, end, _ in segments) == pytest.approx(result.busy[cpu])
+    ran = [0.0] * len(arrival)
+    for begin, end, job, kind in result.segments():
+        if kind != IDLE and job >= 0:
+            ran[job] += end - begin
+    assert sum(ran) == pytest.approx(sum(burst) + result.overhead)
+
+
+@pytest.mark.parametrize("policy", ["fcfs", "rr", "srtf", "cfs"])
+def test_affinity_is_respected(workload, policy):
+    arrival, burst, priority = workload(2, 40)
+    affinity = [None if i % 3 == 0 else ((0,) if i % 3 == 1 else (1, 2)) for i in range(len(arrival))]
+    result = simulate_multicore(arrival, burst, priority, policy, cpus=3, affinity=affinity)
+    for cpu in range(3):
+        for _, _, job in busy_segments(result, cpu):
+            assert affinity[job] is None or cpu in affinity[job]
+    assert all(finish > 0 for finish in result.finish)
+
+
+@pytest.mark.parametrize("policy", ["fcfs", "rr", "priority"])
+def test_migration_cost_is_charged_per_migration(workload, policy):
+    arrival, burst, priority = workload(4, 40, span=10)
+    free = simulate_multicore(arrival, burst, priority, policy, cpus=3)
+    costly = simulate_multicore(arrival, burst, priority, policy, cpus=3, migration_cost=0.5)
+    # Nothing here preempts, so every migration is paid in full
+    assert costly.overhead == pytest.approx(0.5 * costly.migrations)
+    assert free.overhead == 0
+    assert sum(costly.busy) == pytest.approx(sum(burst) + costly.overhead)
+    if policy == "rr":
+        assert costly.migrations > 0
+
+
+def test_first_dispatch_on_each_cpu_is_cold():
+    # Two jobs start cold on two CPUs; the third takes over CPU 0 from job 0 and pays the switch
+    result = simulate_multicore([0.0, 0.0, 2.0], [1.0, 3.0, 1.0], [0, 0, 0], "fcfs", cpus=2, switch_cost=0.5)
+    assert result.switches == 1
+    assert list(result.start) == [0.0, 0.0, 2.0]
+    assert list(result.finish) == [1.0, 3.0, 3.5]
@@ -0,0 +1,112 @@
+import math
+
+import pytest
+
+from scheduler.realtime import Task, hyperperiod, load_tasks, simulate_realtime, utilization_checks
+
+# U = 0.5 + 0.5 = 1: EDF fits it exactly, rate monotonic lets the second task miss
+FULL = [Task(2, 1), Task(5, 2.5)]
+# U = 0.25 + 0.4 + 0.2 = 0.85, under the hyperbolic bound but over Liu & Layland
+HARMONIC = [Task(4, 1), Task(5, 2), Task(10, 2)]
+# U = 0.5 + 0.667 > 1: nothing can schedule it
+OVERLOADED = [Task(2, 1), Task(3, 2)]
+
+
+def write(tmp_path, text):
+    path = tmp_path / "tasks.csv"
+    path.write_text(text)
+    return str(path)
+
+
+@pytest.mark.parametrize("dispatcher", ["edf", "rm"])
+def test_schedulable_set_meets_every_deadline(dispatcher):
+    result = simulate_realtime(HARMONIC, dispatcher)
+    assert result.horizon == hyperperiod(HARMONIC) == 20
+    assert result.released == result.completed == [5, 4, 2]
+    assert result.missed == result.pending == [0, 0, 0]
+    summary = result.summary()
+    assert summary["max_lateness"] <= 0
+    assert summary["miss_ratio"] == 0
+    assert summary["cpu_utilization"] == pytest.approx(0.85)
+
+
+def test_schedulable_set_checks():
+    checks = utilization_checks(HARMONIC)
+    assert checks["tasks"] == 3
+    assert checks["utilization"] == pytest.approx(0.85)
+    assert checks["liu_layland_bound"] == pytest.approx(3 * (2 ** (1 / 3) - 1))
+    assert checks["liu_layland_ok"] is False
+    assert checks["edf_schedulable"] is True
+    assert checks["rm_schedulable"] is True
+
+
+def test_full_utilization_splits_edf_and_rm():
+    checks = utilization_checks(FULL)
+    assert checks["edf_schedulable"] is True
+    assert checks["rm_schedulable"] is False
+    assert checks["hyperbolic_ok"] is False
+    edf = simulate_realtime(FULL, "edf")
+    assert sum(edf.missed) == 0 and edf.utilization == pytest.approx(1.0)
+    rm = simulate_realtime(FULL, "rm")
+    # Only the long task misses: its first job gets 1-2 and 3-4 around the
+    # short task, then finishes at 5.5 against a deadline of 5
+    assert rm.missed[0] == 0 and rm.missed[1] > 0
+    assert rm.max_lateness[1] == pytest.approx(0.5)
+
+
+@pytest.mark.parametrize("dispatcher", ["edf", "rm"])
+def test_overloaded_set_misses(dispatcher):
+    checks = utilization_checks(OVERLOADED)
+    assert checks["utilization"] > 1
+    assert checks["edf_schedulable"] is False
+    assert checks["liu_layland_ok"] is False
+    assert checks["rm_schedulable"] is False
+    result = simulate_realtime(OVERLOADED, dispatcher, horizon=60)
+    summary = result.summary()
+    assert summary["missed"] == sum(result.missed) > 0
+    assert summary["max_lateness"] > 0
+    assert 0 < summary["miss_ratio"] <= 1
+    assert summary["cpu_utilization"] == pytest.approx(1.0)
+    assert summary["utilization"] == checks["utilization"]
+
+
+def test_sporadic_release_gaps():
+    task = Task(3, 1, max_delay=2, phase=1, seed=7)
+    releases = task.releases()
+    times = [next(releases) for _ in range(200)]
+    assert times[0] == 1
+    gaps = [b - a for a, b in zip(times, times[1:])]
+    assert all(3 <= gap <= 5 for gap in gaps)
+    assert len(set(gaps)) > 1
+    # Same seed, same releases
+    again = task.releases()
+    assert [next(again) for _ in range(200)] == times
+
+
+def test_sporadic_set_needs_horizon():
+    tasks = [Task(4, 1), Task(5, 1, max_delay=1)]
+    with pytest.raises(ValueError, match="explicit horizon"):
+        simulate_realtime(tasks)
+    result = simulate_realtime(tasks, horizon=100)
+    # Sporadic releases never come faster than the period, so a set under U = 1 stays clean
+    assert result.missed == [0, 0]
+    sporadic = result.task_summaries()[1]
+    assert sporadic["released"] <= math.ceil(100 / 5)
+
+
+def test_load_tasks(tmp_path):
+    tasks = load_tasks(write(tmp_path, "name,period,cost,deadline\na,4,1,\nb,5,2,4\n"))
+    assert [(t.name, t.period, t.cost, t.deadline) for t in tasks] == [("a", 4, 1, 4), ("b", 5, 2, 4)]
+
+
+@pytest.mark.parametrize("text, message", [
+    ("period,cost\n4,1\n,2\n", "Line 3: missing period column."),
+    ("period,cost\n4, \n", "Line 2: missing cost column."),
+    ("cost\n1\n", "Line 2: missing period column."),
+    ("period,cost\n4,x\n", "Line 2: cost value 'x' is not a valid number."),
+    ("period,cost\n4,-1\n", "Line 2: Period and cost must be positive."),
+])
+def test_load_tasks_errors(tmp_path, text, message):
+    with pytest.raises(ValueError) as error:
+        load_tasks(write(tmp_path, text))
+    assert str(error.value) == message
@@ -0,0 +1,36 @@
+import math
+
+import pytest
+
+from scheduler.segments import IDLE, RUN, SWITCH, SegmentLog, new_columns
+
+
+def make_log(rows):
+    columns = new_columns()
+    for row in rows:
+        for column, value in zip(columns, row):
+            column.append(value)
+    return SegmentLog(*columns)
+
+
+def test_count_and_total_by_kind():
+    log = make_log([(0.0, 0.5, 0, 0, SWITCH), (0.5, 3.0, 0, 0, RUN), (3.0, 4.0, -1, 0, IDLE),
+                    (4.0, 4.25, 1, 1, SWITCH), (4.25, 6.0, 1, 1, RUN), (1.0, 2.0, 2, 1, RUN)])
+    assert (log.count(RUN), log.count(IDLE), log.count(SWITCH)) == (3, 1, 2)
+    assert log.total(RUN) == pytest.approx(2.5 + 1.75 + 1.0)
+    assert log.total(IDLE) == 1.0
+    assert log.total(SWITCH) == 0.75
+
+
+def test_empty_log():
+    log = SegmentLog()
+    assert log.count() == 0
+    assert log.total() == 0.0
+
+
+def test_total_matches_exact_sum_late_in_a_long_run(workload):
+    arrival, burst, _ = workload(3, 2000)
+    start = [1e9 + a for a in arrival]
+    log = SegmentLog.from_runs(start, [s + b for s, b in zip(start, burst)], range(len(start)))
+    assert log.count(RUN) == 2000
+    assert log.total(RUN) == pytest.approx(math.fsum(burst), rel=1e-12)
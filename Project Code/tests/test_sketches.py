@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from scheduler.sketches import QuantileSketch
+
+QUANTILES = (0, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99, 1)
+
+
+def samples(seed, n=5000):
+    rng = np.random.default_rng(seed)
+    values = rng.lognormal(1.0, 1.5, n)
+    # Plenty of exact zeros, as waiting times have
+    values[rng.random(n) < 0.2] = 0.0
+    return values
+
+
+def assert_close(sketch, values, accuracy):
+    for q in QUANTILES:
+        expected = np.percentile(values, q * 100, method="lower")
+        assert abs(sketch.quantile(q) - expected) <= accuracy * abs(expected) + 1e-12, q
+
+
+@pytest.mark.parametrize("accuracy", [0.01, 0.05])
+def test_quantiles_within_relative_accuracy(accuracy):
+    values = samples(1)
+    sketch = QuantileSketch.from_values(values, accuracy)
+    assert_close(sketch, values, accuracy)
+    assert sketch.count == len(values)
+    assert sketch.mean == pytest.approx(values.mean())
+    assert sketch.stddev == pytest.approx(values.std())
+    assert (sketch.min, sketch.max) == (values.min(), values.max())
+
+
+def test_negative_values_keep_their_accuracy():
+    rng = np.random.default_rng(2)
+    values = np.concatenate([-samples(3, 2000), samples(4, 3000), np.zeros(100)])
+    rng.shuffle(values)
+    sketch = QuantileSketch.from_values(values, 0.01)
+    assert sketch.negative_bins and sketch.bins
+    assert_close(sketch, values, 0.01)
+    # The low quantiles are negative, not clamped to zero
+    assert sketch.quantile(0.1) < 0
+    single = QuantileSketch(0.01)
+    for value in values.tolist():
+        single.add(value)
+    assert (single.bins, single.negative_bins, single.zero_count) == \
+        (sketch.bins, sketch.negative_bins, sketch.zero_count)
+
+
+def test_all_negative():
+    values = -samples(5)
+    sketch = QuantileSketch.from_values(values, 0.02)
+    assert_close(sketch, values, 0.02)
+    assert sketch.quantile(1) <= 0
+
+
+def test_merge_matches_one_sketch():
+    values = np.concatenate([samples(6), -samples(7, 500)])
+    whole = QuantileSketch.from_values(values)
+    parts = [QuantileSketch.from_values(part) for part in np.array_split(values, 4)]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+    assert (merged.bins, merged.negative_bins, merged.zero_count, merged.count) == \
+        (whole.bins, whole.negative_bins, whole.zero_count, whole.count)
+    assert merged.mean == pytest.approx(whole.mean)
+    assert merged.stddev == pytest.approx(whole.stddev)
+    for q in QUANTILES:
+        assert merged.quantile(q) == whole.quantile(q)
+
+
+def test_merge_needs_same_accuracy():
+    with pytest.raises(ValueError):
+        QuantileSketch(0.01).merge(QuantileSketch.from_values([1.0], 0.02))
+
+
+@pytest.mark.parametrize("groups_of", [
+    lambda rng, n: rng.integers(0, 5, n),
+    # Negative group ids take the per-group fallback
+    lambda rng, n: rng.integers(-2, 3, n),
+])
+def test_grouped_matches_per_group_sketches(groups_of):
+    rng = np.random.default_rng(8)
+    values = np.concatenate([samples(9, 3000), -samples(10, 1000)])
+    groups = groups_of(rng, len(values))
+    sketches = QuantileSketch.grouped(values, groups)
+    assert sorted(sketches) == sorted(np.unique(groups).tolist())
+    for group, sketch in sketches.items():
+        chosen = values[groups == group]
+        alone = QuantileSketch.from_values(chosen)
+        assert (sketch.bins, sketch.negative_bins, sketch.zero_count, sketch.count) == \
+            (alone.bins, alone.negative_bins, alone.zero_count, alone.count)
+        assert sketch.mean == pytest.approx(alone.mean)
+        assert_close(sketch, chosen, 0.01)
+
+
+def test_empty():
+    sketch = QuantileSketch()
+    assert np.isnan(sketch.quantile(0.5)) and np.isnan(sketch.mean)
+    assert QuantileSketch.grouped([], []) == {}
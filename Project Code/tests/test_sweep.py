@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from scheduler.sweep import SharedTable, _run_task, run_sweep
+from scheduler.table import ProcessTable
+
+
+def clustered_table(workload):
+    # Two bursts of work with a long idle gap between them, split at the gap by two shards
+    arrival, burst, priority = workload(5, 40, span=30)
+    arrival = arrival[:20] + [a + 1000 for a in arrival[20:]]
+    return ProcessTable(range(1, 41), priority, arrival, burst)
+
+
+def test_two_worker_sweep_matches_unsharded(workload):
+    table = clustered_table(workload)
+    rows = run_sweep(table, ["fcfs", "rr"], shards=2, workers=2, merge=True)
+    assert [row["policy"] for row in rows] == ["fcfs", "rr(quantum=2)"]
+    for row in rows:
+        whole = clustered_table(workload)
+        expected = whole.schedule(row["policy"].partition("(")[0])
+        assert row["shards"] == 2
+        assert row["count"] == expected["count"] == 40
+        for name in ("busy_time", "makespan", "max_waiting_time", "avg_waiting_time", "avg_turnaround_time"):
+            assert row[name] == pytest.approx(expected[name]), name
+        # Elapsed spans both shards, from the first dispatch to the last completion
+        assert row["elapsed"] == pytest.approx(expected["makespan"] - min(table.arrival))
+        assert row["throughput"] == pytest.approx(40 / row["elapsed"])
+        # The second shard starts on a cold CPU, so it saves the one switch across the gap
+        assert row["context_switches"] == expected["context_switches"] - 1
+
+
+def test_per_shard_rows(workload):
+    table = clustered_table(workload)
+    rows = run_sweep(table, ["fcfs"], shards=2, workers=1)
+    assert [(row["shard"], row["count"]) for row in rows] == [(0, 20), (1, 20)]
+
+
+def test_failed_task_still_closes_the_block(workload):
+    table = clustered_table(workload)
+    with SharedTable(table) as shared:
+        task = (shared.name, shared.n, "no-such-policy", {}, 1, {}, 0, 0, len(table))
+        with pytest.raises(ValueError, match="no-such-policy"):
+            _run_task(task)
+        row, sketches = _run_task((shared.name, shared.n, "fcfs", {}, 1, {}, 0, 0, len(table)))
+    assert row["count"] == 40
+    assert np.isclose(sketches["waiting_time"].mean, row["avg_waiting_time"])
@@ -0,0 +1,81 @@
+import struct
+
+import numpy as np
+import pytest
+
+from scheduler.table import ProcessTable
+from scheduler.trace import HEADER, MAGIC, RECORD, VERSION, TraceWriter, convert, open_trace, read_header, write_trace
+from scheduler.workload import load_table
+
+CSV = "pid,priority,arrival,burst\n" + "".join(f"{i},{i % 3},{i * 0.5},{1 + i % 4}\n" for i in range(1, 11))
+
+
+def table_of(rows):
+    # (pid, priority, arrival, burst) rows
+    return ProcessTable(*(np.array(column) for column in zip(*rows))) if rows else ProcessTable([], [], [], [])
+
+
+def header_of(path):
+    with open(path, "rb") as f:
+        return HEADER.unpack(f.read(HEADER.size))
+
+
+def test_csv_round_trip(tmp_path):
+    source = tmp_path / "work.csv"
+    source.write_text(CSV)
+    path = tmp_path / "work.trace"
+    # Several chunks, the last one short
+    assert convert(str(source), str(path), chunk_size=4) == 10
+    assert header_of(path) == (MAGIC, VERSION, HEADER.size, RECORD.itemsize, 10)
+    assert path.stat().st_size == HEADER.size + 10 * RECORD.itemsize
+
+    table = open_trace(str(path))
+    assert table.pid.tolist() == list(range(1, 11))
+    assert table.priority.tolist() == [i % 3 for i in range(1, 11)]
+    assert table.arrival.tolist() == [i * 0.5 for i in range(1, 11)]
+    assert table.burst.tolist() == [1 + i % 4 for i in range(1, 11)]
+    # The columns are read-only views of the mapped file, not copies
+    assert not table.arrival.flags.writeable
+    assert load_table(str(path)).burst.tolist() == table.burst.tolist()
+    assert table.schedule("fcfs")["count"] == 10
+
+
+def test_count_is_fixed_up_on_close(tmp_path):
+    path = tmp_path / "grow.trace"
+    writer = TraceWriter(str(path))
+    writer.write([1, 2], [0, 1], [0.0, 1.0], [2.0, 3.0])
+    writer.write([3], [0], [2.0], [1.0])
+    writer.f.flush()
+    # Until close the header still says no records
+    assert header_of(path)[4] == 0
+    writer.close()
+    writer.close()
+    assert header_of(path)[4] == 3
+    assert open_trace(str(path)).pid.tolist() == [1, 2, 3]
+
+
+def test_empty_trace(tmp_path):
+    path = tmp_path / "empty.trace"
+    write_trace(str(path), table_of([]))
+    assert len(open_trace(str(path))) == 0
+
+
+@pytest.mark.parametrize("header, message", [
+    (HEADER.pack(b"NOTATRCE", VERSION, HEADER.size, RECORD.itemsize, 0), "bad magic number"),
+    (HEADER.pack(MAGIC, VERSION + 1, HEADER.size, RECORD.itemsize, 0), f"Unsupported trace version: {VERSION + 1}"),
+    (HEADER.pack(MAGIC, VERSION, HEADER.size, 24, 0), "Unsupported trace record size: 24"),
+    (MAGIC + struct.pack("<H", VERSION), "file is too short"),
+    (HEADER.pack(MAGIC, VERSION, HEADER.size, RECORD.itemsize, 5), "Truncated trace"),
+])
+def test_bad_headers(tmp_path, header, message):
+    path = tmp_path / "bad.trace"
+    path.write_bytes(header)
+    with pytest.raises(ValueError, match=message):
+        open_trace(str(path))
+
+
+def test_read_header_reports_layout(tmp_path):
+    path = tmp_path / "work.trace"
+    write_trace(str(path), table_of([(1, 0, 0.0, 1.0), (2, 1, 0.5, 2.0)]))
+    with open(path, "rb") as f:
+        assert read_header(f) == (HEADER.size, 2)
@@ -0,0 +1,28 @@
+import pytest
+
+from scheduler.workload import load_table
+
+
+def test_blank_lines_are_skipped(tmp_path):
+    path = tmp_path / "trace.csv"
+    path.write_text("pid,priority,arrival,burst\n1,1,0,5\n\n2,0,1,3\n\n")
+    table = load_table(str(path))
+    assert list(table.burst) == [5.0, 3.0]
+
+
+@pytest.mark.parametrize("text, message", [
+    ("arrival,burst\n0,5\n1\n", "Line 3: missing burst column."),
+    ("arrival,burst\n0,5\nx,3\n", "Line 3: arrival value 'x' is not a valid number."),
+])
+def test_bad_csv_rows_name_line_and_column(tmp_path, text, message):
+    path = tmp_path / "trace.csv"
+    path.write_text(text)
+    with pytest.raises(ValueError, match=message):
+        load_table(str(path))
+
+
+def test_bad_jsonl_record_names_line(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    path.write_text('{"arrival": 0, "burst": 2}\n\n{"arrival": 1}\n')
+    with pytest.raises(ValueError, match="Line 3: missing burst column."):
+        load_table(str(path))